@@ -1,6 +1,10 @@
-from flask import Blueprint, render_template, session, redirect, url_for, flash, request
-from models import Post, Comment, User, Category, db
+from flask import Blueprint, render_template, session, redirect, url_for, flash, request, jsonify, abort, current_app
+from models import User, Category, DeleteJob, db
 from werkzeug.security import generate_password_hash
+import admin_stats
+import category_cache
+import deletion
+import profiling
 from functools import wraps
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -29,33 +33,56 @@ def ip_restricted(allowed_prefixes):
     return decorator
 
 # 관리자 대시보드
+# 집계(게시판별 / 일별)만 바로 그리고, 글 / 댓글 / 회원 목록은 화면에서 섹션별로 나눠 불러옴
 @admin_bp.route('/')
 @admin_required
 @ip_restricted(['127.', '192.168.'])
 def admin_dashboard():
-    categories = Category.query.order_by(Category.name).all()
+    categories = category_cache.all_categories()
     selected_category = request.args.get('category', '전체')
 
-    if selected_category == '전체':
-        posts = Post.query.order_by(Post.id.desc()).all()
-    else:
-        posts = Post.query.filter_by(category=selected_category).order_by(Post.id.desc()).all()
-
-    post_ids = [p.id for p in posts]
-    comments = Comment.query.filter(Comment.post_id.in_(post_ids)).order_by(Comment.id.desc()).all()
-
-    # ✅ 여기가 핵심!
-    pending_users = User.query.filter_by(is_active=False).order_by(User.created_at.desc()).all()
-
     return render_template(
         'admin_dashboard.html',
-        posts=posts,
-        comments=comments,
         categories=categories,
         selected_category=selected_category,
-        pending_users=pending_users  # ✅ 추가!
+        section_category='' if selected_category == '전체' else selected_category,
+        summary=admin_stats.category_summary(),
+        activity=admin_stats.daily_activity(),
+        activity_days=admin_stats.ACTIVITY_DAYS,
+        search_query=request.args.get('search', ''),
+        jobs=deletion.recent_jobs(),
     )
 
+# 대시보드 섹션 목록 한 페이지 (JSON: 표 행 HTML + 다음 페이지 주소)
+ADMIN_SECTIONS = ('posts', 'comments', 'pending', 'users')
+
+@admin_bp.route('/section/<name>')
+@admin_required
+@ip_restricted(['127.', '192.168.'])
+def dashboard_section(name):
+    if name not in ADMIN_SECTIONS:
+        abort(404)
+    category = request.args.get('category') or None
+    search = request.args.get('search') or None
+    before = request.args.get('before')
+    limit = admin_stats.clamp_limit(request.args.get('limit'))
+
+    if name == 'posts':
+        page = admin_stats.post_page(category, before, limit)
+    elif name == 'comments':
+        page = admin_stats.comment_page(category, before, limit)
+    else:
+        page = admin_stats.user_page(pending=(name == 'pending'), search=search, before=before, limit=limit)
+
+    next_url = None
+    if page.next_before is not None:
+        next_url = url_for('admin.dashboard_section', name=name, category=category, search=search,
+                           before=page.next_before, limit=limit)
+    return jsonify({
+        "html": render_template('admin_section_rows.html', section=name, rows=page.items),
+        "next": next_url,
+    })
+
 # 비밀번호 변경
 @admin_bp.route('/change_password', methods=['GET', 'POST'])
 @admin_required
@@ -125,14 +152,53 @@ def delete_category():
         flash('해당 게시판이 존재하지 않습니다.')
         return redirect(url_for('admin.admin_dashboard'))
 
-    # 이 게시판 이름과 일치하는 글 삭제
-    Post.query.filter_by(category=category.name).delete()
-
+    # 게시판은 바로 지우고, 글(댓글 / 이미지 참조 / 색인 포함)은 백그라운드에서 청크 단위로 삭제
+    name = category.name
     db.session.delete(category)
     db.session.commit()
+    job = deletion.start_category_job(name)
 
-    flash(f"'{category.name}' 게시판이 삭제되었습니다.")
-    return redirect(url_for('admin.admin_dashboard'))
+    flash(f"'{name}' 게시판이 삭제되었습니다. 글 {job.total}개는 백그라운드에서 삭제 중입니다.")
+    return redirect(url_for('admin.admin_dashboard', _anchor='jobs'))
+
+# 삭제 작업 진행 상황 (대시보드에서 주기적으로 확인)
+@admin_bp.route('/jobs/<int:job_id>')
+@admin_required
+@ip_restricted(['127.', '192.168.'])
+def job_status(job_id):
+    job = DeleteJob.query.get_or_404(job_id)
+    return jsonify({
+        "id": job.id,
+        "category": job.category,
+        "status": job.status,
+        "done": job.done,
+        "total": job.total,
+        "percent": job.percent,
+        "error": job.error,
+    })
+
+# ⏱ 엔드포인트별 요청 통계 + 최근 느린 요청 (N+1 등 회귀 확인용)
+@admin_bp.route('/profile')
+@admin_required
+@ip_restricted(['127.', '192.168.'])
+def request_profile():
+    sort = request.args.get('sort', 'total')
+    return render_template(
+        'admin_profile.html',
+        stats=profiling.endpoint_stats(sort),
+        sort=sort,
+        sort_columns=profiling.SORT_COLUMNS,
+        slow_requests=profiling.recent_slow_requests(),
+        slow_ms=current_app.config.get('PROFILE_SLOW_MS'),
+    )
+
+@admin_bp.route('/profile/reset', methods=['POST'])
+@admin_required
+@ip_restricted(['127.', '192.168.'])
+def reset_request_profile():
+    profiling.profiler.reset()
+    flash('요청 통계를 초기화했습니다.')
+    return redirect(url_for('admin.request_profile'))
 
 @admin_bp.route('/edit_category', methods=['POST'])
 @admin_required
@@ -151,13 +217,12 @@ def edit_category():
 
     return redirect(url_for('admin.admin_dashboard'))
 
-# 승인 대기 중인 사용자 리스트
+# 승인 대기 중인 사용자 리스트 (대시보드의 승인 대기 섹션)
 @admin_bp.route('/users/pending')
 @admin_required
 @ip_restricted(['127.', '192.168.'])
 def pending_users():
-    users = User.query.filter_by(is_active=False).all()
-    return render_template('admin_pending_users.html', users=users)
+    return redirect(url_for('admin.admin_dashboard', _anchor='pending'))
 
 # 사용자 승인
 @admin_bp.route('/users/approve/<int:user_id>', methods=['POST'])
@@ -168,7 +233,7 @@ def approve_user(user_id):
     user.is_active = True
     db.session.commit()
     flash(f"사용자 {user.username} 님이 승인되었습니다.")
-    return redirect(url_for('admin.pending_users'))
+    return redirect(url_for('admin.admin_dashboard', _anchor='pending'))
 
 # 사용자 삭제 (승인 거절)
 @admin_bp.route('/users/delete/<int:user_id>', methods=['POST'])
@@ -179,5 +244,5 @@ def delete_user(user_id):
     db.session.delete(user)
     db.session.commit()
     flash(f"사용자 {user.username} 님이 삭제되었습니다.")
-    return redirect(url_for('admin.pending_users'))
+    return redirect(url_for('admin.admin_dashboard', _anchor='users'))
 
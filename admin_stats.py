@@ -0,0 +1,110 @@
+# 관리자 화면용 집계 / 페이지 조회
+#
+# 관리자 화면이 글 / 댓글 / 회원을 전부 .all() 로 읽지 않도록
+# - 요약은 GROUP BY 집계 (게시판별 글·댓글 수, 최근 며칠간 일별 글·댓글 수)
+# - 목록은 id 기준 키셋 페이지 (?before=<id>) 로 한 번에 최대 MAX_LIMIT 행까지만
+# - 목록 화면에 필요한 컬럼만 읽음 (글 본문 / 댓글 전체 내용은 읽지 않음)
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select
+
+from models import db, Post, Comment, User
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200          # 한 페이지 최대 행 수 (요청 값이 더 커도 여기서 자름)
+ACTIVITY_DAYS = 14
+COMMENT_PREVIEW = 80     # 댓글 목록에 보여줄 앞부분 글자 수
+
+
+class RowPage:
+    """한 페이지 분량의 행 + 다음 페이지 커서 (마지막 페이지면 None)"""
+
+    def __init__(self, items, next_before):
+        self.items = items
+        self.next_before = next_before
+
+
+def clamp_limit(value, default=DEFAULT_LIMIT):
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _parse_before(value):
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _page(stmt, id_column, before, limit):
+    """id 내림차순 키셋 페이지. limit + 1 개를 읽어 다음 페이지 유무 판단"""
+    before = _parse_before(before)
+    if before is not None:
+        stmt = stmt.where(id_column < before)
+    rows = db.session.execute(stmt.order_by(id_column.desc()).limit(limit + 1)).all()
+    items = rows[:limit]
+    return RowPage(items, items[-1].id if len(rows) > limit else None)
+
+
+def category_summary():
+    """게시판별 글 수 / 댓글 수 / 마지막 글 작성일 (post.comment_count 합으로 댓글 테이블은 안 읽음)"""
+    return db.session.execute(
+        select(
+            Post.category,
+            func.count().label("posts"),
+            func.coalesce(func.sum(Post.comment_count), 0).label("comments"),
+            func.max(Post.date).label("last_date"),
+        )
+        .group_by(Post.category)
+        .order_by(func.count().desc())
+    ).all()
+
+
+def daily_activity(days=ACTIVITY_DAYS):
+    """최근 days 일 동안 날짜별 (날짜, 글 수, 댓글 수), 최신 날짜부터"""
+    since = datetime.combine(datetime.now().date() - timedelta(days=days - 1), datetime.min.time())
+    post_day = func.date(Post.date)
+    comment_day = func.date(Comment.created_at)
+    posts = dict(db.session.execute(
+        select(post_day, func.count()).where(Post.date >= since).group_by(post_day)
+    ).all())
+    comments = dict(db.session.execute(
+        select(comment_day, func.count()).where(Comment.created_at >= since).group_by(comment_day)
+    ).all())
+    return [
+        (day, posts.get(day, 0), comments.get(day, 0))
+        for day in sorted(set(posts) | set(comments), reverse=True)
+    ]
+
+
+def post_page(category=None, before=None, limit=DEFAULT_LIMIT):
+    stmt = select(
+        Post.id, Post.category, Post.title, Post.author, Post.date, Post.read_count, Post.comment_count,
+    )
+    if category:
+        stmt = stmt.where(Post.category == category)
+    return _page(stmt, Post.id, before, limit)
+
+
+def comment_page(category=None, before=None, limit=DEFAULT_LIMIT):
+    stmt = select(
+        Comment.id, Comment.post_id, Comment.author, Comment.created_at,
+        func.substr(Comment.content, 1, COMMENT_PREVIEW).label("preview"),
+        (func.length(Comment.content) > COMMENT_PREVIEW).label("truncated"),
+    )
+    if category:
+        stmt = stmt.join(Post, Post.id == Comment.post_id).where(Post.category == category)
+    return _page(stmt, Comment.id, before, limit)
+
+
+def user_page(pending=False, search=None, before=None, limit=DEFAULT_LIMIT):
+    stmt = select(User.id, User.username, User.email, User.is_admin, User.is_active)
+    if pending:
+        stmt = stmt.where(or_(User.is_active.is_(False), User.is_active.is_(None)))  # NULL 도 승인 전 (로그인 불가)
+    if search:
+        stmt = stmt.where(or_(User.username.contains(search), User.email.contains(search)))
+    return _page(stmt, User.id, before, limit)
@@ -1,25 +1,41 @@
-from flask import Flask, redirect, url_for, render_template
+from flask import Flask, redirect, url_for, render_template, request, jsonify, flash
 from models import db, Post, Comment
 from routes import post_bp
 from auth import auth_bp
 from admin import admin_bp
 from flask_migrate import Migrate
-from models import Category
+import category_cache
+import db_config
+import view_counter
+import http_cache
+import metrics
+import profiling
+import static_assets
 from flask_wtf import CSRFProtect
 from logging import FileHandler, Formatter
+from thumbnails import variant_url
+from post_html import render_content
+from dates import format_datetime
 
 import os
 import re
 import logging
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///board.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['MAX_CONTENT_LENGTH'] = 20 * 1024 * 1024  # 📦 요청(업로드) 최대 20MB
+app.config['VIEW_COUNT_DEDUP_SECONDS'] = 30 * 60  # 👀 같은 세션에서 30분 안에 다시 본 글은 조회수 제외
 app.secret_key = 'my_secret_key'
 csrf = CSRFProtect(app)
 
+db_config.init_app(app)  # 🗄 instance/board.db + WAL / busy_timeout 등 (환경 변수로 조정)
 db.init_app(app)
 migrate = Migrate(app, db)
+view_counter.init_app(app)  # 👀 조회수 버퍼 (주기적으로 일괄 반영, 종료 시 마무리)
+app.after_request(http_cache.add_etag_headers)  # 🏷 목록 / 상세 ETag
+static_assets.init_app(app)  # 📦 정적 파일 지문 URL + immutable 캐시, /music 배경음악 (Range 지원)
+metrics.init_app(app)  # 📈 /metrics (Prometheus, gunicorn 워커 전체 합계)
+profiling.init_app(app)  # ⏱ 요청별 처리 / SQL / 렌더링 시간 → slow.log + 엔드포인트별 집계 (/admin/profile)
 
 # ✅ Jinja 템플릿 필터 등록
 @app.template_filter("regex_search")
@@ -27,10 +43,15 @@ def regex_search(value, pattern, group=0):
     match = re.search(pattern, value)
     return match.group(group) if match else ""
 
+# 🖼 이미지 변환본 (썸네일 / 중간 크기) URL
+app.add_template_global(variant_url)
+app.add_template_filter(render_content)  # rendered_content 가 아직 없는 글용
+app.add_template_filter(format_datetime)  # 🕒 작성일 (DateTime → 'YYYY-MM-DD HH:MM')
+
 # ✅ 라우트: 홈으로 접근 시 자유게시판으로 이동
 @app.route("/")
 def home():
-    all_categories = Category.query.order_by(Category.name).all()
+    all_categories = category_cache.all_categories()  # 🗂 프로세스 캐시 (게시판이 바뀔 때만 다시 읽음)
     default_names = ['자유게시판', '이야기게시판', '사진게시판', '습작게시판', '쭈야랑게시판']
 
     # 갤러리 게시판 카테고리 목록
@@ -50,6 +71,15 @@ def home():
                            custom_categories=custom_categories, 
                            gallery_categories=gallery_categories_obj)
 
+# 📦 업로드 용량 초과 (MAX_CONTENT_LENGTH)
+@app.errorhandler(413)
+def request_too_large(e):
+    message = f"파일이 너무 큽니다. (최대 {app.config['MAX_CONTENT_LENGTH'] / (1024 * 1024):g}MB)"
+    if request.endpoint == "post.upload_image":
+        return jsonify({"error": {"message": message}}), 413
+    flash(message, "error")
+    return redirect(request.referrer or url_for("home"))
+
 # 블루프린트 등록
 app.register_blueprint(admin_bp)
 app.register_blueprint(post_bp)
@@ -0,0 +1,178 @@
+# 게시판 월별 보기 (post_archive_month 요약 테이블)
+#
+# - 게시판 / 연 / 월마다 글 수와 그 달의 첫 / 마지막 글 id 를 저장
+# - 글이 추가 / 삭제되거나 게시판 / 작성일이 바뀌면 해당 달만 다시 집계
+#   (post(category, date) 인덱스 범위 한 번. 전체 재집계 없음)
+# - 달을 열면 first_id ~ last_id 범위만 id 순으로 읽음 (OFFSET 스캔 없음)
+#
+# 요약 테이블 전체 다시 만들기: python archive.py --rebuild
+
+import argparse
+from datetime import datetime
+
+from sqlalchemy import Integer, cast, delete, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, defer
+
+from models import db, Post, PostArchiveMonth
+
+CHUNK_SIZE = 500
+PER_PAGE = 30
+_SESSION_KEY = "archive_months"
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def month_key(category, date):
+    if not category or date is None:
+        return None
+    return category, date.year, date.month
+
+
+def month_range(year, month):
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def months_for_posts(conn, post_ids):
+    """글들이 속한 (게시판, 연, 월) 집합"""
+    keys = set()
+    ids = sorted({i for i in post_ids if i is not None})
+    for chunk in _chunks(ids, CHUNK_SIZE):
+        for category, date in conn.execute(select(Post.category, Post.date).where(Post.id.in_(chunk))):
+            keys.add(month_key(category, date))
+    keys.discard(None)
+    return keys
+
+
+def refresh_months(conn, keys):
+    """주어진 달만 다시 집계 (글이 없어진 달은 행 삭제)"""
+    for category, year, month in sorted(keys):
+        start, end = month_range(year, month)
+        count, first_id, last_id = conn.execute(
+            select(func.count(), func.min(Post.id), func.max(Post.id))
+            .where(Post.category == category, Post.date >= start, Post.date < end)
+        ).one()
+        if count:
+            stmt = insert(PostArchiveMonth).values(
+                category=category, year=year, month=month, post_count=count, first_id=first_id, last_id=last_id,
+            )
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=["category", "year", "month"],
+                set_={"post_count": count, "first_id": first_id, "last_id": last_id},
+            ))
+        else:
+            conn.execute(delete(PostArchiveMonth).where(
+                PostArchiveMonth.category == category,
+                PostArchiveMonth.year == year,
+                PostArchiveMonth.month == month,
+            ))
+
+
+def rebuild():
+    """요약 테이블 전체 다시 집계. 만든 행 수 반환"""
+    conn = db.session.connection()
+    year = cast(func.strftime("%Y", Post.date), Integer)
+    month = cast(func.strftime("%m", Post.date), Integer)
+    rows = conn.execute(
+        select(Post.category, year, month, func.count(), func.min(Post.id), func.max(Post.id))
+        .where(Post.date.is_not(None))
+        .group_by(Post.category, year, month)
+    ).all()
+    conn.execute(delete(PostArchiveMonth))
+    if rows:
+        conn.execute(insert(PostArchiveMonth), [
+            {"category": r[0], "year": r[1], "month": r[2], "post_count": r[3], "first_id": r[4], "last_id": r[5]}
+            for r in rows
+        ])
+    db.session.commit()
+    return len(rows)
+
+
+# 🗓 화면용 조회
+def months(category):
+    """[(연도, 그 해 글 수, [PostArchiveMonth ...]), ...] 최근 연도 / 월부터"""
+    rows = db.session.execute(
+        select(PostArchiveMonth)
+        .where(PostArchiveMonth.category == category)
+        .order_by(PostArchiveMonth.year.desc(), PostArchiveMonth.month.desc())
+    ).scalars().all()
+    years = []
+    for row in rows:
+        if not years or years[-1][0] != row.year:
+            years.append((row.year, 0, []))
+        year, total, items = years[-1]
+        items.append(row)
+        years[-1] = (year, total + row.post_count, items)
+    return years
+
+
+def get_month(category, year, month):
+    return db.session.get(PostArchiveMonth, (category, year, month))
+
+
+def month_posts(entry, cursor=None, per_page=PER_PAGE):
+    """그 달 글 한 페이지 (id 내림차순) + 다음 페이지 커서"""
+    start, end = month_range(entry.year, entry.month)
+    upper = min(cursor - 1, entry.last_id) if cursor else entry.last_id
+    rows = (
+        Post.query.options(defer(Post.content, raiseload=True), defer(Post.rendered_content, raiseload=True))
+        .filter(
+            Post.category == entry.category,
+            Post.id.between(entry.first_id, upper),
+            Post.date >= start,
+            Post.date < end,
+        )
+        .order_by(Post.id.desc())
+        .limit(per_page + 1)
+        .all()
+    )
+    items = rows[:per_page]
+    return items, (items[-1].id if len(rows) > per_page else None)
+
+
+# ✅ 글 추가 / 삭제 / 게시판·작성일 변경 시 해당 달 다시 집계
+#    (executemany 로 저장하는 임포터, SQL 로 지우는 deletion.py 는 refresh_months 직접 호출)
+def _post_keys(obj):
+    state = inspect(obj)
+    categories = {obj.category, *state.attrs.category.history.deleted}
+    dates = {obj.date, *state.attrs.date.history.deleted}
+    return {month_key(c, d) for c in categories for d in dates}
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_archive_months(session, flush_context, instances):
+    # 삭제되는 글은 flush 뒤에는 속성을 읽을 수 없으므로 flush 전에 모아 둠
+    keys = session.info.setdefault(_SESSION_KEY, set())
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Post):
+            keys |= _post_keys(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            state = inspect(obj)
+            if state.attrs.category.history.has_changes() or state.attrs.date.history.has_changes():
+                keys |= _post_keys(obj)
+    keys.discard(None)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_archive_months(session, flush_context):
+    keys = session.info.pop(_SESSION_KEY, None)
+    if keys:
+        refresh_months(session.connection(), keys)
+
+
+if __name__ == "__main__":
+    from app import app
+
+    parser = argparse.ArgumentParser(description="게시판 월별 요약 테이블")
+    parser.add_argument("--rebuild", action="store_true", help="요약 테이블 전체 다시 집계")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.rebuild:
+            print(f"✅ 월별 요약 {rebuild()}개 집계 완료")
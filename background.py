@@ -0,0 +1,52 @@
+# 워커 프로세스마다 하나씩 도는 주기 작업 스레드
+#
+# 조회수 버퍼(view_counter), 요청 통계(profiling), SQLite 정리(db_config)가 같이 쓴다.
+# - gunicorn 은 fork 후 워커를 띄우므로 스레드는 처음 필요할 때 프로세스마다 시작 (pid 로 확인)
+# - interval 초마다 func 실행. wake() 로 기다리지 않고 바로 실행시킬 수 있음
+# - 실패는 로그만 남기고 다음 주기에 다시 시도
+# - flush_at_exit=True 면 정상 종료 시(atexit) 한 번 더 실행
+
+import atexit
+import os
+import threading
+
+
+class PeriodicFlusher:
+    def __init__(self, func, name, error_message, flush_at_exit=True):
+        self.func = func
+        self.name = name
+        self.error_message = error_message
+        self.flush_at_exit = flush_at_exit
+        self.app = None
+        self.interval = 0
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def init_app(self, app, interval):
+        """interval 이 0 이하면 스레드를 띄우지 않음 (func 는 직접 불러야 함)"""
+        self.app = app
+        self.interval = interval
+        if self.flush_at_exit:
+            atexit.register(self.func)
+
+    def ensure_started(self):
+        if self.app is None or not self.interval or self.interval <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name=self.name, daemon=True).start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.func()
+            except Exception:
+                self.app.logger.exception(self.error_message)
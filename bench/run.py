@@ -0,0 +1,451 @@
+# 라우트별 부하 테스트
+#
+# bench/seed.py 로 만든 벤치 DB 에 요청을 보내 엔드포인트마다 지연 시간 p50 / p95 / p99 와
+# 초당 처리량을 재고 JSON 으로 저장한다. 실행끼리 --compare 로 비교.
+#
+# - client 모드: Flask 테스트 클라이언트 (네트워크 없이 앱 코드만)
+# - http 모드: gunicorn 을 --workers 개로 띄워 실제 HTTP 로 (--url 을 주면 이미 떠 있는 서버 사용)
+#
+# 로그인 / CSRF: 벤치 관리자 계정의 세션 쿠키와 CSRF 토큰을 앱 비밀키로 직접 만들어 씀
+# (로그인 폼을 거치지 않으므로 로그인 시도 제한과 무관)
+#
+# 글쓰기 / 댓글은 DB 에 실제로 저장되므로, 엄밀히 비교하려면 실행마다 seed.py 로 다시 만들 것.
+#
+# 예) python bench/run.py --mode client --requests 300
+#     python bench/run.py --mode http --workers 4 --concurrency 8 --compare bench/results/이전.json
+#     python bench/run.py --only detail,index_deep
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from urllib.parse import quote, urlencode, urlsplit
+
+from seed import BENCH_USER, DEFAULT_DB, ROOT, WORDS, _db_uri
+
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")
+PER_PAGE = 12  # routes.index 의 per_page
+LOCAL_ADDR = "127.0.0.1"  # 관리자 화면 IP 제한 통과용
+
+
+# 🎯 시나리오: 이름 → (요청 만들기, 정상 응답 코드)
+def _text_category(ctx, rng):
+    return rng.choice(ctx["text_categories"])
+
+
+def _home(ctx, rng):
+    return "GET", "/", None
+
+
+def _index(ctx, rng):
+    return "GET", f"/post/{quote(_text_category(ctx, rng))}", None
+
+
+def _index_deep(ctx, rng):
+    category = _text_category(ctx, rng)
+    pages = ctx["pages"][category]
+    return "GET", f"/post/{quote(category)}/page/{rng.randint(max(pages // 2, 1), pages)}", None
+
+
+def _gallery(ctx, rng):
+    category = rng.choice(ctx["gallery_categories"])
+    return "GET", f"/post/{quote(category)}/page/{rng.randint(1, min(ctx['pages'][category], 20))}", None
+
+
+def _search(ctx, rng):
+    q = " ".join(rng.sample(WORDS, rng.choice((1, 1, 2))))
+    return "GET", f"/post/{quote(_text_category(ctx, rng))}?{urlencode({'q': q})}", None
+
+
+def _archive_month(ctx, rng):
+    category, year, month = rng.choice(ctx["months"])
+    return "GET", f"/post/{quote(category)}/archive/{year}/{month}", None
+
+
+def _detail(ctx, rng):
+    return "GET", f"/post/{rng.randint(1, ctx['max_post_id'])}", None
+
+
+def _write(ctx, rng):
+    category = _text_category(ctx, rng)
+    form = {
+        "title": " ".join(rng.sample(WORDS, 4)),
+        "author": BENCH_USER,
+        "content": "<p>" + " ".join(rng.choice(WORDS) for _ in range(40)) + "</p>",
+    }
+    return "POST", f"/post/write?{urlencode({'category': category})}", form
+
+
+def _comment(ctx, rng):
+    form = {"author": BENCH_USER, "content": " ".join(rng.choice(WORDS) for _ in range(12))}
+    return "POST", f"/post/{rng.randint(1, ctx['max_post_id'])}", form
+
+
+def _admin(ctx, rng):
+    return "GET", "/admin/", None
+
+
+def _admin_posts(ctx, rng):
+    return "GET", "/admin/section/posts", None
+
+
+SCENARIOS = {
+    "home": (_home, {200}),
+    "index": (_index, {200}),
+    "index_deep": (_index_deep, {200}),
+    "gallery": (_gallery, {200}),
+    "search": (_search, {200}),
+    "archive_month": (_archive_month, {200}),
+    "detail": (_detail, {200}),
+    "write": (_write, {302}),
+    "comment": (_comment, {302}),
+    "admin": (_admin, {200}),
+    "admin_posts": (_admin_posts, {200}),
+}
+
+
+# 🔌 클라이언트
+class FlaskClient:
+    """테스트 클라이언트 (스레드마다 하나)"""
+
+    def __init__(self, app, cookie, token):
+        self.client = app.test_client()
+        self.client.set_cookie(app.config["SESSION_COOKIE_NAME"], cookie)
+        self.token = token
+
+    def request(self, method, path, form=None):
+        if form is not None:
+            form = dict(form, csrf_token=self.token)
+        response = self.client.open(path, method=method, data=form, environ_base={"REMOTE_ADDR": LOCAL_ADDR})
+        body = response.get_data()
+        response.close()
+        return response.status_code, len(body)
+
+    def close(self):
+        pass
+
+
+class HttpClient:
+    """keep-alive 연결 하나 + 세션 쿠키 (리디렉션은 따라가지 않음)"""
+
+    def __init__(self, base_url, cookie_name, cookie, token):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.cookie_name = cookie_name
+        self.cookie = cookie
+        self.token = token
+        self.conn = None
+
+    def request(self, method, path, form=None):
+        headers = {"Cookie": f"{self.cookie_name}={self.cookie}"}
+        body = None
+        if form is not None:
+            body = urlencode(dict(form, csrf_token=self.token))
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        for attempt in (1, 2):  # 서버가 keep-alive 연결을 닫았으면 한 번 다시 연결
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                self.close()
+                if attempt == 2:
+                    raise
+        self._update_cookie(response.getheader("Set-Cookie"))
+        return response.status, len(data)
+
+    def _update_cookie(self, header):
+        # 플래시 메시지 / 본 글 목록 등으로 바뀐 세션 쿠키를 다음 요청에 그대로 사용
+        prefix = f"{self.cookie_name}="
+        for part in (header or "").split(","):
+            part = part.strip()
+            if part.startswith(prefix):
+                value = part[len(prefix):].split(";", 1)[0]
+                if value:
+                    self.cookie = value
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+# 🔑 벤치 관리자 세션 쿠키 + CSRF 토큰
+def bench_session(app):
+    from flask import session
+    from flask_wtf.csrf import generate_csrf
+    from models import User
+
+    with app.app_context():
+        user = User.query.filter_by(username=BENCH_USER).first()
+        if user is None:
+            sys.exit(f"❌ 벤치 계정({BENCH_USER})이 없습니다. 먼저 python bench/seed.py 실행")
+        with app.test_request_context():
+            token = generate_csrf()  # 세션에 원본 토큰 저장 + 폼에 넣을 서명된 토큰
+            data = dict(session)
+        data.update(user_id=user.id, username=user.username, is_admin=True)
+        return app.session_interface.get_signing_serializer(app).dumps(data), token
+
+
+def bench_context(app):
+    """시나리오가 고를 글 id / 게시판 / 페이지 / 달 범위"""
+    from sqlalchemy import func, select
+    from models import db, Category, Comment, Post, PostArchiveMonth, User
+
+    with app.app_context():
+        counts = dict(db.session.execute(select(Post.category, func.count()).group_by(Post.category)).all())
+        types = dict(db.session.execute(select(Category.name, Category.type)).all())
+        ctx = {
+            "max_post_id": db.session.execute(select(func.max(Post.id))).scalar() or 0,
+            "pages": {name: max((counts.get(name, 0) + PER_PAGE - 1) // PER_PAGE, 1) for name in types},
+            "text_categories": [n for n, t in types.items() if t != "photo" and counts.get(n)],
+            "gallery_categories": [n for n, t in types.items() if t == "photo" and counts.get(n)],
+            "months": [tuple(row) for row in db.session.execute(
+                select(PostArchiveMonth.category, PostArchiveMonth.year, PostArchiveMonth.month)
+            ).all()],
+            "data": {
+                "posts": sum(counts.values()),
+                "comments": db.session.execute(select(func.count()).select_from(Comment)).scalar(),
+                "users": db.session.execute(select(func.count()).select_from(User)).scalar(),
+            },
+        }
+    if not ctx["max_post_id"] or not ctx["text_categories"]:
+        sys.exit("❌ 벤치 DB 에 글이 없습니다. 먼저 python bench/seed.py 실행")
+    return ctx
+
+
+# 🚀 gunicorn 띄우기
+def _free_port():
+    import socket
+    with socket.socket() as s:
+        s.bind((LOCAL_ADDR, 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(db_path, workers, threads):
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=_db_uri(db_path))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app", "--bind", f"{LOCAL_ADDR}:{port}",
+         "--workers", str(workers), "--threads", str(threads), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+    )
+    url = f"http://{LOCAL_ADDR}:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit("❌ gunicorn 이 시작하지 못했습니다.")
+        try:
+            conn = http.client.HTTPConnection(LOCAL_ADDR, port, timeout=2)
+            conn.request("GET", "/auth/login")
+            conn.getresponse().read()
+            conn.close()
+            return proc, url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    sys.exit("❌ gunicorn 응답 대기 시간 초과")
+
+
+# 📊 측정
+def percentile(sorted_values, p):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    rank = max(int(-(-p * len(sorted_values) // 100)), 1)  # ceil(p/100 * n)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, statuses, errors, elapsed):
+    ordered = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status": dict(sorted(statuses.items())),
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else None,
+        "max_ms": ms(ordered[-1]) if ordered else None,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def run_scenario(name, clients, ctx, requests, warmup, seed):
+    """warmup 만큼 버리고 requests 개를 클라이언트(스레드) 수만큼 나눠 보냄"""
+    make_request, expected = SCENARIOS[name]
+    latencies, statuses, errors = [], {}, 0
+    lock = threading.Lock()
+
+    def worker(index, client, count, record):
+        nonlocal errors
+        rng = random.Random(f"{seed}:{name}:{index}:{record}")
+        for _ in range(count):
+            method, path, form = make_request(ctx, rng)
+            started = time.perf_counter()
+            try:
+                status, _ = client.request(method, path, form)
+            except Exception:
+                status = "error"
+            elapsed = time.perf_counter() - started
+            if record:
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[str(status)] = statuses.get(str(status), 0) + 1
+                    if status not in expected:
+                        errors += 1
+
+    def run(total, record):
+        share = [total // len(clients) + (i < total % len(clients)) for i in range(len(clients))]
+        threads = [
+            threading.Thread(target=worker, args=(i, client, count, record))
+            for i, (client, count) in enumerate(zip(clients, share)) if count
+        ]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - started
+
+    run(warmup, False)
+    elapsed = run(requests, True)
+    return summarize(latencies, statuses, errors, elapsed)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["endpoints"]
+    print(f"\n📈 {baseline_path} 대비")
+    print(f"{'엔드포인트':<16}{'p50 ms':>26}{'p95 ms':>26}{'req/s':>26}")
+
+    def cell(old, new):
+        if old is None or new is None:
+            return f"{'-':>26}"
+        change = f"{(new - old) / old * 100:+.0f}%" if old else ""
+        return f"{f'{old:g} → {new:g} {change}':>26}"
+
+    for name, now in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        print(f"{name:<16}"
+              f"{cell(before['p50_ms'], now['p50_ms'])}"
+              f"{cell(before['p95_ms'], now['p95_ms'])}"
+              f"{cell(before['throughput_rps'], now['throughput_rps'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="라우트별 부하 테스트 (p50/p95/p99, 처리량 → JSON)")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"seed.py 로 만든 SQLite 파일 (기본 {DEFAULT_DB})")
+    parser.add_argument("--mode", choices=("client", "http"), default="client")
+    parser.add_argument("--url", help="http 모드: 이미 떠 있는 서버 주소 (없으면 gunicorn 을 직접 띄움)")
+    parser.add_argument("--workers", type=int, default=4, help="http 모드: gunicorn 워커 프로세스 수")
+    parser.add_argument("--threads", type=int, default=2, help="http 모드: 워커당 스레드 수")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시 클라이언트 수 (client 1, http 8)")
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트마다 측정할 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="엔드포인트마다 버리는 요청 수")
+    parser.add_argument("--only", help="쉼표로 구분한 시나리오만 실행")
+    parser.add_argument("--skip", help="쉼표로 구분한 시나리오 제외 (예: write,comment)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본 bench/results/<시각>-<모드>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="이전 결과와 p50 / p95 / 처리량 비교")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(SCENARIOS)
+    skipped = {n.strip() for n in args.skip.split(",")} if args.skip else set()
+    unknown = [n for n in names + sorted(skipped) if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)} (가능: {', '.join(SCENARIOS)})")
+    names = [n for n in names if n not in skipped]
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} 가 없습니다. 먼저 python bench/seed.py 실행")
+    concurrency = args.concurrency or (1 if args.mode == "client" else 8)
+
+    os.environ["DATABASE_URL"] = _db_uri(args.db)  # app 을 불러오기 전에 지정
+    os.chdir(ROOT)
+    from app import app
+
+    ctx = bench_context(app)
+    cookie, token = bench_session(app)
+    server = None
+    if args.mode == "http":
+        url = args.url
+        if url is None:
+            server, url = start_gunicorn(args.db, args.workers, args.threads)
+        clients = [HttpClient(url, app.config["SESSION_COOKIE_NAME"], cookie, token) for _ in range(concurrency)]
+    else:
+        clients = [FlaskClient(app, cookie, token) for _ in range(concurrency)]
+
+    print(f"🏁 {args.mode} 모드 / 동시 {concurrency} / 글 {ctx['data']['posts']}개 "
+          f"댓글 {ctx['data']['comments']}개")
+    results = {}
+    try:
+        for name in names:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):  # 라우트의 디버깅 print 숨김
+                results[name] = run_scenario(name, clients, ctx, args.requests, args.warmup, args.seed)
+            r = results[name]
+            print(f"  {name:<14} p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  p99 {r['p99_ms']:>8} ms  "
+                  f"{r['throughput_rps']:>8} req/s  오류 {r['errors']}")
+    finally:
+        for client in clients:
+            client.close()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "http" and not args.url else None,
+            "threads": args.threads if args.mode == "http" and not args.url else None,
+            "url": args.url,
+            "concurrency": concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "db": os.path.abspath(args.db),
+            "data": ctx["data"],
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "endpoints": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{args.mode}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
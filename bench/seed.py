@@ -0,0 +1,212 @@
+# 벤치마크용 합성 데이터 생성
+#
+# 운영 DB 와 따로 instance/bench.db 를 새로 만들어 게시판 / 회원 / 글 / 댓글을 채운다.
+# - 같은 --seed 면 같은 데이터 (실행끼리 결과를 비교할 수 있게)
+# - 글은 --years 년에 걸쳐 id 순으로 작성일이 늘어나고, 댓글 수는 한쪽으로 몰리게 (인기 글 소수)
+# - 갤러리 게시판 글은 static/uploads/bench/ 의 합성 이미지를 본문에 넣음 (변환본도 생성)
+# - 라우트가 아니라 executemany 로 넣으므로, 임포터처럼 목록 요약 / 본문 HTML / 검색 색인 /
+#   이미지 참조 / 월별 요약을 직접 채운다
+#
+# 예) python bench/seed.py --posts 100000 --comments 1000000
+#     python bench/seed.py --posts 2000 --comments 10000 --db instance/bench-small.db
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_DB = os.path.join(ROOT, "instance", "bench.db")
+IMAGE_DIR = "uploads/bench"  # static 기준
+BENCH_USER = "bench"
+BENCH_PASSWORD = "bench-password"
+
+# (이름, 타입, 글 비율)
+CATEGORIES = (
+    ("자유게시판", "text", 0.35),
+    ("이야기게시판", "text", 0.2),
+    ("사진게시판", "photo", 0.25),
+    ("습작게시판", "photo", 0.1),
+    ("쭈야랑게시판", "photo", 0.1),
+)
+
+WORDS = (
+    "바다", "산", "여행", "이야기", "오늘", "사진", "하늘", "노을", "커피", "고양이", "강아지", "비",
+    "눈", "봄", "여름", "가을", "겨울", "친구", "가족", "음악", "영화", "책", "산책", "주말", "점심",
+    "저녁", "기차", "버스", "골목", "시장", "공원", "꽃", "나무", "바람", "별", "달", "아침", "수박",
+    "photo", "travel", "coffee", "hello", "world", "sunset", "camera", "film",
+)
+AUTHORS = ("철수", "영희", "민수", "지영", "현우", "수진", "동훈", "은비", "관리자", "손님")
+
+CHUNK_SIZE = 1000
+
+
+def _db_uri(path):
+    return "sqlite:///" + os.path.abspath(path)
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _content(rng, images):
+    paragraphs = [f"<p>{_sentence(rng, rng.randint(8, 40))}</p>" for _ in range(rng.randint(1, 6))]
+    for src in images:
+        paragraphs.insert(rng.randint(0, len(paragraphs)), f'<p><img src="{src}" alt="사진"></p>')
+    if rng.random() < 0.2:
+        paragraphs.append(f'<p><b>{_sentence(rng, 3)}</b> &amp; <a href="https://example.com/">링크</a></p>')
+    return "\n".join(paragraphs)
+
+
+def make_images(count, rng):
+    """합성 JPEG 이미지 count 개 + 썸네일 / 중간 크기 변환본. /static/... URL 목록 반환"""
+    import thumbnails
+    if thumbnails.Image is None or count <= 0:
+        return []
+    from PIL import Image, ImageDraw
+
+    out_dir = os.path.join(thumbnails.STATIC_ROOT, IMAGE_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    urls = []
+    for i in range(count):
+        rel = f"{IMAGE_DIR}/bench_{i:04d}.jpg"
+        path = os.path.join(thumbnails.STATIC_ROOT, rel)
+        if not os.path.exists(path):
+            size = rng.choice(((1600, 1200), (1200, 1600), (2000, 1125)))
+            im = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+            draw = ImageDraw.Draw(im)
+            for _ in range(12):
+                x, y = rng.randrange(size[0]), rng.randrange(size[1])
+                draw.ellipse((x, y, x + 300, y + 300), fill=tuple(rng.randrange(256) for _ in range(3)))
+            im.save(path, "JPEG", quality=85)
+        thumbnails.generate_variants(rel)
+        urls.append(f"/static/{rel}")
+    return urls
+
+
+def _comment_counts(rng, posts, comments):
+    """글마다 댓글 수 (합 = comments). 파레토 가중치로 일부 글에 몰리게"""
+    if posts <= 0 or comments <= 0:
+        return [0] * max(posts, 0)
+    weights = [rng.paretovariate(1.2) for _ in range(posts)]
+    total = sum(weights)
+    counts = [int(w / total * comments) for w in weights]
+    for i in rng.choices(range(posts), weights=weights, k=comments - sum(counts)):
+        counts[i] += 1
+    return counts
+
+
+def seed(args):
+    from sqlalchemy import insert
+    from werkzeug.security import generate_password_hash
+
+    from app import app
+    import archive
+    import image_refs
+    import search
+    from html_utils import list_meta
+    from models import db, Category, Comment, Post, User
+    from post_html import render_content
+
+    rng = random.Random(args.seed)
+    started = time.monotonic()
+    images = make_images(args.images, rng)
+    print(f"🖼 이미지 {len(images)}개 준비")
+
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(search.CREATE_TABLE_SQL)  # 운영 DB 는 마이그레이션이 만듦
+        db.session.add_all(Category(name=name, type=kind) for name, kind, _ in CATEGORIES)
+        password_hash = generate_password_hash(BENCH_PASSWORD)  # 해시 계산이 느리므로 한 번만
+        db.session.add(User(username=BENCH_USER, email="bench@example.com", password_hash=password_hash,
+                            is_admin=True, is_active=True))
+        db.session.execute(insert(User), [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": password_hash,
+             "is_admin": False, "is_active": i % 10 != 0}  # 10% 는 승인 대기
+            for i in range(args.users)
+        ])
+        db.session.commit()
+
+        names = [name for name, _, _ in CATEGORIES]
+        weights = [weight for _, _, weight in CATEGORIES]
+        gallery = {name for name, kind, _ in CATEGORIES if kind == "photo"}
+        comment_counts = _comment_counts(rng, args.posts, args.comments)
+        start = datetime(2026, 1, 1) - timedelta(days=365 * args.years)
+        step = timedelta(days=365 * args.years) / max(args.posts, 1)
+
+        for offset in range(0, args.posts, CHUNK_SIZE):
+            post_rows, counts = [], comment_counts[offset:offset + CHUNK_SIZE]
+            for i in range(offset, offset + len(counts)):
+                category = rng.choices(names, weights)[0]
+                pictures = rng.sample(images, min(len(images), rng.randint(1, 3))) if category in gallery else []
+                content = _content(rng, pictures)
+                date = start + step * i + timedelta(seconds=rng.randrange(3600))
+                post_rows.append(dict(
+                    list_meta(content),
+                    title=_sentence(rng, rng.randint(2, 7)),
+                    author=rng.choice(AUTHORS),
+                    content=content,
+                    rendered_content=render_content(content),
+                    date=date,
+                    updated_at=date,
+                    read_count=rng.randrange(500),
+                    category=category,
+                    comment_count=counts[i - offset],
+                ))
+            post_ids = db.session.execute(
+                insert(Post).returning(Post.id, Post.date, sort_by_parameter_order=True), post_rows
+            ).all()
+            comment_rows = [
+                {
+                    "author": rng.choice(AUTHORS),
+                    "content": _sentence(rng, rng.randint(3, 20)),
+                    "created_at": date + timedelta(minutes=rng.randrange(1, 60 * 24 * 30)),
+                    "post_id": post_id,
+                }
+                for (post_id, date), count in zip(post_ids, counts)
+                for _ in range(count)
+            ]
+            if comment_rows:
+                db.session.execute(insert(Comment), comment_rows)
+            ids = [post_id for post_id, _ in post_ids]
+            search.reindex_posts(db.session.connection(), ids)
+            image_refs.sync_posts(db.session.connection(), ids)
+            db.session.commit()
+            print(f"📝 {offset + len(counts)}/{args.posts} 글")
+
+        archive.rebuild()
+        db.session.execute(db.text("ANALYZE"))
+        db.session.commit()
+
+    print(f"✅ {args.db}: 글 {args.posts}개 / 댓글 {args.comments}개 / 회원 {args.users + 1}명 "
+          f"({time.monotonic() - started:.1f}초)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터 생성 (기존 벤치 DB 는 지우고 새로 만듦)")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite 파일 (기본 {DEFAULT_DB})")
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--images", type=int, default=40, help="갤러리 글에 돌려 쓸 합성 이미지 수")
+    parser.add_argument("--years", type=int, default=10, help="작성일이 퍼져 있는 기간")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if os.path.abspath(args.db) == os.path.join(ROOT, "instance", "board.db"):
+        parser.error("운영 DB(instance/board.db) 에는 생성할 수 없습니다.")
+    for suffix in ("", "-wal", "-shm"):  # 검색 색인(가상 테이블)까지 깨끗하게 새로 시작
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    os.environ["DATABASE_URL"] = _db_uri(args.db)  # app 을 불러오기 전에 지정
+    seed(args)
+
+
+if __name__ == "__main__":
+    main()
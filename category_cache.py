@@ -0,0 +1,94 @@
+# 게시판(카테고리) 목록 프로세스 캐시
+#
+# 게시판 목록은 거의 바뀌지 않는데 홈 / 목록 / 상세 / 글쓰기 / 수정마다 매번 조회하고 있었다.
+# - 워커 프로세스마다 전체 목록을 한 번 읽어 두고 재사용
+# - 게시판이 추가/수정/삭제되면 (flush 훅) DB 의 cache_version 행 번호를 올림
+# - 요청마다 그 번호 하나만 확인해서 바뀌었으면 다시 읽음 → gunicorn 워커 전체가 재시작 없이 반영
+
+import threading
+
+from flask import g, has_request_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+import metrics
+from models import db, Category, CacheVersion
+
+VERSION_NAME = "category"
+
+_lock = threading.Lock()
+_cache = {"version": None, "by_name": {}, "ordered": []}
+
+
+class CategoryInfo:
+    """세션과 무관하게 공유할 수 있는 게시판 정보 (Category 와 같은 속성)"""
+
+    __slots__ = ("id", "name", "type", "description")
+
+    def __init__(self, id, name, type, description):
+        self.id = id
+        self.name = name
+        self.type = type or "text"
+        self.description = description
+
+    @property
+    def is_gallery(self):
+        return self.type == "photo"
+
+    def __repr__(self):
+        return f"<CategoryInfo {self.name}>"
+
+
+def _registry():
+    # 한 요청 안에서는 버전 확인도 한 번만
+    if has_request_context() and g.get("_category_cache_checked"):
+        return _cache
+    version = CacheVersion.current([VERSION_NAME])[VERSION_NAME]
+    metrics.cache_result("category", version == _cache["version"])
+    if version != _cache["version"]:
+        with _lock:
+            if version != _cache["version"]:
+                # 버전을 먼저 읽고 목록을 읽으므로, 그 사이 바뀌어도 다음 확인 때 다시 읽힘
+                rows = db.session.execute(select(Category).order_by(Category.name)).scalars().all()
+                ordered = [CategoryInfo(c.id, c.name, c.type, c.description) for c in rows]
+                _cache.update(version=version, by_name={c.name: c for c in ordered}, ordered=ordered)
+    if has_request_context():
+        g._category_cache_checked = True
+    return _cache
+
+
+def version():
+    """현재 게시판 구성 버전 번호 (ETag 키 등에 사용)"""
+    return _registry()["version"]
+
+
+def all_categories():
+    """이름순 게시판 목록"""
+    return list(_registry()["ordered"])
+
+
+def categories_by_name():
+    return dict(_registry()["by_name"])
+
+
+def get_category(name):
+    return _registry()["by_name"].get(name)
+
+
+def category_type(name, default="text"):
+    category = get_category(name)
+    return category.type if category else default
+
+
+def is_gallery(name):
+    category = get_category(name)
+    return category.is_gallery if category else False
+
+
+# ✅ 게시판이 바뀌면 같은 트랜잭션에서 버전 번호 올림 (관리자 화면, insert_categories.py 공통)
+@event.listens_for(Session, "after_flush")
+def _bump_category_version(session, flush_context):
+    if any(isinstance(obj, Category) for obj in session.new | session.dirty | session.deleted):
+        CacheVersion.bump(session.connection(), [VERSION_NAME])
+        if has_request_context():
+            g.pop("_category_cache_checked", None)
@@ -0,0 +1,182 @@
+# 제로보드 첨부 이미지 수집기 (내용 해시 기준 중복 제거)
+#
+# copy_all_images.py 를 대신한다. 파일 이름이 아니라 내용(SHA-256)으로 저장하므로
+# - 이름만 같은 다른 사진이 조용히 버려지지 않고
+# - 이름만 다른 같은 사진이 두 번 복사되지 않는다.
+# 저장 위치: <대상 폴더>/<해시 앞 2글자>/<해시><확장자> (같은 디스크면 하드링크)
+# 원래 이름 → 저장 경로는 <대상 폴더>/manifest.json 에 기록되고, 임포터가
+# `--manifest` 로 이 파일을 읽어 <img src> 를 바꾼다.
+#
+# 사용 예:
+#   python collect_images.py D:\myboard\parsing\bbs
+#   python collect_images.py ./bbs --target static/restore_images1 --workers 8
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DEFAULT_TARGET = os.path.join(STATIC_ROOT, "restore_images1")
+MANIFEST_NAME = "manifest.json"
+
+# ✅ 복사 대상 확장자들
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _static_url(path):
+    rel = os.path.relpath(path, STATIC_ROOT).replace(os.sep, "/")
+    return "/static/" + rel
+
+
+class ImageManifest:
+    """원래 파일 경로/이름 → 저장된 URL"""
+
+    def __init__(self, files=None):
+        # 원본 상대 경로 → {"url", "sha256", "size", "mtime"}
+        self.files = files or {}
+        self._by_name = None
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f).get("files", {}))
+
+    def save(self, path):
+        names = {}
+        for rel, entry in self.files.items():
+            urls = names.setdefault(os.path.basename(rel), [])
+            if entry["url"] not in urls:
+                urls.append(entry["url"])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files, "names": names}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def resolve(self, src):
+        """본문 <img src> 값 → 저장된 URL (모르는 파일이면 None)
+
+        같은 이름의 파일이 여러 개면 src 의 폴더 경로와 가장 길게 겹치는 것을 고른다.
+        """
+        if self._by_name is None:
+            self._by_name = {}
+            for rel in self.files:
+                self._by_name.setdefault(os.path.basename(rel).lower(), []).append(rel)
+
+        path = unquote(src.split("?", 1)[0]).replace("\\", "/").strip()
+        candidates = self._by_name.get(os.path.basename(path).lower())
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return self.files[candidates[0]]["url"]
+
+        def overlap(rel):
+            a, b = rel.lower().split("/")[::-1], path.lower().split("/")[::-1]
+            n = 0
+            while n < min(len(a), len(b)) and a[n] == b[n]:
+                n += 1
+            return n
+
+        return self.files[max(candidates, key=overlap)]["url"]
+
+
+class ImageCollector:
+    def __init__(self, source_root, target_dir=DEFAULT_TARGET, workers=8, hardlink=True):
+        self.source_root = os.path.abspath(source_root)
+        self.target_dir = os.path.abspath(target_dir)
+        self.workers = workers
+        self.hardlink = hardlink
+        self.manifest_path = os.path.join(self.target_dir, MANIFEST_NAME)
+        self.manifest = ImageManifest.load(self.manifest_path)
+        self.stats = {"stored": 0, "linked": 0, "duplicate": 0, "unchanged": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def iter_sources(self):
+        for dirpath, dirnames, filenames in os.walk(self.source_root):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS:
+                    yield os.path.join(dirpath, filename)
+
+    def _store(self, src_path, sha, ext):
+        """해시 경로에 저장. 이미 있으면 'duplicate', 하드링크면 'linked', 복사면 'stored'"""
+        dst_path = os.path.join(self.target_dir, sha[:2], sha + ext)
+        if os.path.exists(dst_path):
+            return dst_path, "duplicate"
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        if self.hardlink:
+            try:
+                os.link(src_path, dst_path)
+                return dst_path, "linked"
+            except FileExistsError:
+                return dst_path, "duplicate"
+            except OSError:
+                pass  # 다른 디스크 / 하드링크 미지원 → 복사
+        tmp_path = f"{dst_path}.{threading.get_ident()}.tmp"
+        shutil.copy2(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+        return dst_path, "stored"
+
+    def _collect_one(self, src_path):
+        rel = os.path.relpath(src_path, self.source_root).replace(os.sep, "/")
+        try:
+            stat = os.stat(src_path)
+            known = self.manifest.files.get(rel)
+            if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+                return "unchanged"
+
+            sha = file_sha256(src_path)
+            ext = os.path.splitext(src_path)[1].lower()
+            dst_path, result = self._store(src_path, sha, ext)
+            entry = {"url": _static_url(dst_path), "sha256": sha, "size": stat.st_size, "mtime": stat.st_mtime}
+            with self._lock:
+                self.manifest.files[rel] = entry
+            return result
+        except OSError as e:
+            print(f"⚠️ {rel}: {e}")
+            return "failed"
+
+    def run(self):
+        os.makedirs(self.target_dir, exist_ok=True)
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for done, result in enumerate(pool.map(self._collect_one, self.iter_sources()), start=1):
+                self.stats[result] += 1
+                if done % 500 == 0:
+                    print(f"📥 {done}개 처리 ({time.monotonic() - started:.1f}초)")
+        self.manifest.save(self.manifest_path)
+        return self.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="첨부 이미지를 내용 해시 기준으로 수집")
+    parser.add_argument("source_root", help="이미지가 흩어져 있는 루트 경로 (예: D:\\myboard\\parsing\\bbs)")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="저장 폴더 (static 아래, 기본: static/restore_images1)")
+    parser.add_argument("--workers", type=int, default=8, help="해시/복사 스레드 수")
+    parser.add_argument("--no-hardlink", action="store_true", help="하드링크 대신 항상 복사")
+    args = parser.parse_args()
+
+    collector = ImageCollector(args.source_root, args.target, args.workers, hardlink=not args.no_hardlink)
+    stats = collector.run()
+    print("✅ 이미지 수집 완료!")
+    print(f"📥 새로 저장: 복사 {stats['stored']}개 / 하드링크 {stats['linked']}개")
+    print(f"♻️ 내용이 같아 합침: {stats['duplicate']}개")
+    print(f"⏩ 지난번과 그대로: {stats['unchanged']}개")
+    if stats["failed"]:
+        print(f"⚠️ 실패: {stats['failed']}개")
+    print(f"📁 대상 폴더: {collector.target_dir}")
+    print(f"🗂 매니페스트: {collector.manifest_path}")
@@ -0,0 +1,43 @@
+# 상세 화면 댓글 페이지
+#
+# post.comments 관계를 템플릿에서 지연 로딩하면 댓글 수백 개짜리 글도 전부 한 번에 읽게 되므로
+# - 글 하나의 댓글을 (post_id, id) 인덱스로 한 번에 PER_PAGE 개씩만 읽음 (SQL 한 번)
+# - 오래된 순(기본) / 최신 순, ?cursor=<마지막 댓글 id> 로 다음 페이지 ("더 보기" JSON)
+# - 화면에 필요한 컬럼만 읽음
+
+from sqlalchemy import select
+
+from models import db, Comment
+
+PER_PAGE = 20
+ORDERS = ("oldest", "newest")
+
+
+class CommentPage:
+    """한 페이지 분량의 댓글 + 다음 페이지 커서 (마지막 페이지면 None)"""
+
+    def __init__(self, items, order, next_cursor):
+        self.items = items
+        self.order = order
+        self.next_cursor = next_cursor
+
+
+def parse_order(value):
+    return value if value in ORDERS else ORDERS[0]
+
+
+def comment_page(post_id, order="oldest", cursor=None, per_page=PER_PAGE):
+    """per_page + 1 개를 읽어 다음 페이지 유무 판단"""
+    stmt = select(Comment.id, Comment.post_id, Comment.author, Comment.content, Comment.created_at) \
+        .where(Comment.post_id == post_id)
+    if order == "newest":
+        if cursor is not None:
+            stmt = stmt.where(Comment.id < cursor)
+        stmt = stmt.order_by(Comment.id.desc())
+    else:
+        if cursor is not None:
+            stmt = stmt.where(Comment.id > cursor)
+        stmt = stmt.order_by(Comment.id)
+    rows = db.session.execute(stmt.limit(per_page + 1)).all()
+    items = rows[:per_page]
+    return CommentPage(items, order, items[-1].id if len(rows) > per_page else None)
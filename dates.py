@@ -0,0 +1,47 @@
+# 날짜 문자열 ↔ datetime
+#
+# post.date / comment.created_at 은 DateTime 컬럼. 백업 XML(regdate), 예전 문자열 컬럼 값 등
+# 여러 형식을 받아 datetime 으로 바꾸고, 화면에는 format_datetime 필터로 출력한다.
+
+from datetime import datetime
+
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M"
+
+# 받아들이는 형식 (앞에서부터 시도)
+INPUT_FORMATS = (
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y%m%d%H%M%S",         # 제로보드 regdate
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y.%m.%d %H:%M",
+    "%Y/%m/%d %H:%M",
+    "%Y-%m-%d",
+)
+
+
+def parse_datetime(value):
+    """문자열 → datetime. 알 수 없는 형식이면 None (datetime 은 그대로)"""
+    if isinstance(value, datetime):
+        return value
+    # DATETIME 컬럼은 숫자 친화(NUMERIC affinity)라 '20040512113905' 같은 값은 정수로 읽힐 수 있음
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        return None
+    for fmt in INPUT_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    if value.isdigit() and len(value) in (9, 10):  # 유닉스 시각
+        return datetime.fromtimestamp(int(value))
+    return None
+
+
+def format_datetime(value, fmt=DISPLAY_FORMAT):
+    """템플릿 필터: datetime → 문자열 (None 은 빈 문자열)"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return value.strftime(fmt)
@@ -0,0 +1,134 @@
+# SQLite 운영 설정 (gunicorn 여러 워커 기준)
+#
+# - DB 파일 경로를 instance/board.db 절대 경로로 고정
+#   (예전 'sqlite:///board.db' 는 Flask-SQLAlchemy 3 에서 instance/board.db 로 풀리는데,
+#    sqlite3 도구 / 스크립트는 프로젝트 폴더의 빈 board.db 를 열어 헷갈렸음)
+# - 새 연결마다 WAL, synchronous=NORMAL, busy_timeout, mmap_size, cache_size 설정
+#   → 읽기는 쓰기를 기다리지 않고, 잠겨 있으면 바로 'database is locked' 대신 잠깐 기다림
+# - 워커 프로세스당 연결 풀 크기 지정
+# - 워커마다 주기적으로 PRAGMA optimize + WAL 체크포인트 (WAL 파일이 계속 커지지 않도록)
+#
+# 환경 변수 (괄호 안은 기본값):
+#   DATABASE_URL                  (sqlite:///<instance>/board.db)
+#   SQLITE_JOURNAL_MODE           (WAL)
+#   SQLITE_SYNCHRONOUS            (NORMAL)
+#   SQLITE_BUSY_TIMEOUT_MS        (5000)
+#   SQLITE_MMAP_SIZE              (268435456 = 256MB)
+#   SQLITE_CACHE_SIZE             (-20000 = 약 20MB, 음수는 KB 단위)
+#   DB_POOL_SIZE                  (5, 워커 스레드 수에 맞춤)
+#   DB_MAX_OVERFLOW               (5)
+#   DB_POOL_TIMEOUT               (10 초)
+#   SQLITE_MAINTENANCE_INTERVAL   (3600 초, 0 이면 끔)
+#
+# 현재 설정 확인 + 체크포인트 / optimize 한 번 실행: python db_config.py
+
+import os
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from background import PeriodicFlusher
+from models import db
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_FILENAME = "board.db"
+
+_pragmas = {}  # init_app 에서 채움 (연결 이벤트는 앱 밖에서도 불리므로 모듈에 보관)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def database_uri(app):
+    """DATABASE_URL 이 없으면 instance/board.db 절대 경로"""
+    uri = os.environ.get("DATABASE_URL")
+    if uri:
+        return uri
+    os.makedirs(app.instance_path, exist_ok=True)
+    return "sqlite:///" + os.path.join(app.instance_path, DB_FILENAME)
+
+
+def init_app(app):
+    """db.init_app(app) 보다 먼저 호출"""
+    app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_uri(app))
+    app.config.setdefault("SQLITE_JOURNAL_MODE", os.environ.get("SQLITE_JOURNAL_MODE", "WAL"))
+    app.config.setdefault("SQLITE_SYNCHRONOUS", os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"))
+    app.config.setdefault("SQLITE_BUSY_TIMEOUT_MS", _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    app.config.setdefault("SQLITE_MMAP_SIZE", _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    app.config.setdefault("SQLITE_CACHE_SIZE", _env_int("SQLITE_CACHE_SIZE", -20000))
+    app.config.setdefault("SQLITE_MAINTENANCE_INTERVAL", _env_int("SQLITE_MAINTENANCE_INTERVAL", 3600))
+
+    options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+    if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite") and ":memory:" not in app.config["SQLALCHEMY_DATABASE_URI"]:
+        options.setdefault("pool_size", _env_int("DB_POOL_SIZE", 5))
+        options.setdefault("max_overflow", _env_int("DB_MAX_OVERFLOW", 5))
+        options.setdefault("pool_timeout", _env_int("DB_POOL_TIMEOUT", 10))
+        connect_args = options.setdefault("connect_args", {})
+        # sqlite3 드라이버 자체 대기 시간 (busy_timeout PRAGMA 와 같은 값)
+        connect_args.setdefault("timeout", app.config["SQLITE_BUSY_TIMEOUT_MS"] / 1000)
+
+    _pragmas.update({
+        "journal_mode": app.config["SQLITE_JOURNAL_MODE"],
+        "synchronous": app.config["SQLITE_SYNCHRONOUS"],
+        "busy_timeout": int(app.config["SQLITE_BUSY_TIMEOUT_MS"]),
+        "mmap_size": int(app.config["SQLITE_MMAP_SIZE"]),
+        "cache_size": int(app.config["SQLITE_CACHE_SIZE"]),
+    })
+
+    _warn_stray_database(app)
+
+    def maintain():
+        with app.app_context():
+            run_maintenance(db.engine)
+
+    maintenance = PeriodicFlusher(maintain, "sqlite-maintenance",
+                                  "SQLite 정리(optimize / checkpoint) 실패 (다음 주기에 다시 시도)",
+                                  flush_at_exit=False)
+    maintenance.init_app(app, app.config["SQLITE_MAINTENANCE_INTERVAL"] or 0)
+    app.before_request(maintenance.ensure_started)
+
+
+def _warn_stray_database(app):
+    stray = os.path.join(BASE_DIR, DB_FILENAME)
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if os.path.exists(stray) and os.path.getsize(stray) > 0 and not uri.endswith(stray):
+        app.logger.warning("⚠️ 사용하지 않는 DB 파일이 있습니다: %s (현재 DB: %s)", stray, uri)
+
+
+# ✅ 새 SQLite 연결마다 PRAGMA 설정 (마이그레이션 / 스크립트 연결 포함)
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not _pragmas or not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size"):
+            cursor.execute(f"PRAGMA {name} = {_pragmas[name]}")
+    finally:
+        cursor.close()
+
+
+def run_maintenance(engine, checkpoint="PASSIVE"):
+    """PRAGMA optimize + WAL 체크포인트. (busy, WAL 페이지 수, 체크포인트된 페이지 수) 반환"""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+        result = conn.exec_driver_sql(f"PRAGMA wal_checkpoint({checkpoint})").first()
+        conn.commit()
+    return tuple(result) if result else None
+
+
+if __name__ == "__main__":
+    from app import app
+
+    with app.app_context():
+        print(f"📁 {db.engine.url}")
+        with db.engine.connect() as conn:
+            for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size"):
+                print(f"   {name} = {conn.exec_driver_sql(f'PRAGMA {name}').scalar()}")
+        print(f"🧹 checkpoint(TRUNCATE) → {run_maintenance(db.engine, checkpoint='TRUNCATE')}")
@@ -0,0 +1,195 @@
+# 글 / 댓글 일괄 삭제
+#
+# 한 건씩 get() → delete() 하지 않고, CHUNK_SIZE 개씩 잘라 청크마다 몇 개의 집합 SQL 로
+#   댓글 → 이미지 참조(post_image) → 글 → 검색 색인 순으로 지운다.
+# Core 문장이라 ORM flush 훅이 돌지 않으므로, 훅이 하던 일(검색 색인, 이미지 GC 후보,
+# 게시판 버전, 목록 앵커, 댓글 수, 월별 요약)은 여기서 직접 처리.
+#
+# 게시판 통째 삭제처럼 큰 작업은 delete_job 행을 만들고 백그라운드 스레드에서
+# 청크마다 따로 커밋한다 (SQLite 쓰기 잠금을 오래 잡지 않도록). 진행률은 관리자 화면에서 확인.
+#
+# 중단된 작업(워커 재시작 등) 이어서 실행: python deletion.py --resume
+
+import argparse
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+
+import archive
+import http_cache
+import image_refs
+import search
+from models import db, Post, Comment, PostImage, CacheVersion, DeleteJob, refresh_comment_counts
+from pagination import invalidate_anchors
+
+CHUNK_SIZE = 200
+JOB_PAUSE = 0.05  # 청크 사이 쉬는 시간(초). 그 사이 다른 요청이 쓰기 잠금을 잡을 수 있게
+ACTIVE_STATUSES = ("queued", "running")
+
+_start_lock = threading.Lock()
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _ids(values):
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return sorted(ids)
+
+
+def _posts_changed(conn, categories):
+    categories = {c for c in categories if c}
+    if categories:
+        CacheVersion.bump(conn, [http_cache.posts_version_name(c) for c in categories])
+    for category in categories:
+        invalidate_anchors(category)
+
+
+def delete_posts(conn, post_ids):
+    """글과 그 댓글 / 이미지 참조 / 검색 색인 삭제. 지운 글 수 반환 (커밋은 호출한 쪽에서)"""
+    deleted = 0
+    categories = set()
+    for chunk in _chunks(_ids(post_ids), CHUNK_SIZE):
+        categories.update(conn.execute(
+            select(Post.category).where(Post.id.in_(chunk)).distinct()
+        ).scalars())
+        months = archive.months_for_posts(conn, chunk)
+        conn.execute(delete(Comment).where(Comment.post_id.in_(chunk)))
+        paths = conn.execute(
+            delete(PostImage).where(PostImage.post_id.in_(chunk)).returning(PostImage.path)
+        ).scalars().all()
+        deleted += conn.execute(delete(Post).where(Post.id.in_(chunk))).rowcount
+        search.reindex_posts(conn, chunk)  # 글이 없으니 색인 행만 지워짐
+        image_refs.queue_paths(conn, paths)  # 다른 글이 아직 쓰는 파일은 GC 가 확인하고 남김
+        archive.refresh_months(conn, months)
+    _posts_changed(conn, categories)
+    return deleted
+
+
+def delete_comments(conn, comment_ids):
+    """댓글 삭제 후 해당 글의 댓글 수 / 검색 색인 갱신. 지운 댓글 수 반환 (커밋은 호출한 쪽에서)"""
+    deleted = 0
+    post_ids = set()
+    for chunk in _chunks(_ids(comment_ids), CHUNK_SIZE):
+        rows = conn.execute(
+            delete(Comment).where(Comment.id.in_(chunk)).returning(Comment.post_id)
+        ).scalars().all()
+        deleted += len(rows)
+        post_ids.update(i for i in rows if i is not None)
+    if post_ids:
+        refresh_comment_counts(conn, post_ids)
+        search.reindex_posts(conn, post_ids)
+        _posts_changed(conn, conn.execute(
+            select(Post.category).where(Post.id.in_(sorted(post_ids))).distinct()
+        ).scalars())
+    return deleted
+
+
+# 🧵 백그라운드 삭제 작업
+def start_category_job(category):
+    """게시판 글 전체 삭제 작업을 등록하고 백그라운드에서 실행. 같은 게시판 작업이 이미 있으면 그것을 반환
+
+    스레드는 queued → running 으로 바꾸는 데 성공한 쪽만 띄움 (같은 작업을 두 스레드가 돌리지 않도록).
+    실행 중이던 워커가 죽어 running 으로 남은 작업은 python deletion.py --resume 으로 이어서 실행.
+    """
+    with _start_lock:
+        # 지울 글 범위는 지금 시점의 마지막 id 까지 (작업 도중 같은 이름으로 다시 만든 게시판의 글은 남김)
+        total, max_post_id = db.session.execute(
+            select(db.func.count(), db.func.max(Post.id)).where(Post.category == category)
+        ).one()
+        job = db.session.execute(
+            select(DeleteJob).where(DeleteJob.category == category, DeleteJob.status.in_(ACTIVE_STATUSES))
+        ).scalar()
+        if job is None:
+            job = DeleteJob(category=category, status="queued", total=total, done=0,
+                            max_post_id=max_post_id, created_at=datetime.now())
+            db.session.add(job)
+        elif job.max_post_id is not None and (max_post_id or 0) > job.max_post_id:
+            # 진행 중인 작업이 있는 게시판을 다시 지움 → 그 사이 생긴 글까지 범위 확장
+            job.total = job.done + total
+            job.max_post_id = max_post_id
+        db.session.commit()
+        claimed = db.session.execute(
+            update(DeleteJob).where(DeleteJob.id == job.id, DeleteJob.status == "queued").values(status="running")
+        ).rowcount
+        db.session.commit()
+    if claimed:
+        app = current_app._get_current_object()
+        threading.Thread(target=_run_in_app, args=(app, job.id), name=f"delete-job-{job.id}", daemon=True).start()
+    return job
+
+
+def _run_in_app(app, job_id):
+    with app.app_context():
+        try:
+            run_job(job_id)
+        except Exception:
+            app.logger.exception("삭제 작업 %s 실패", job_id)
+
+
+def _set_job(conn, job_id, **values):
+    conn.execute(update(DeleteJob).where(DeleteJob.id == job_id).values(**values))
+
+
+def run_job(job_id, verbose=False):
+    """작업 실행. 청크마다 커밋하므로 중단돼도 다시 실행하면 남은 글부터 이어서 지움"""
+    with db.engine.begin() as conn:
+        _set_job(conn, job_id, status="running", error=None)
+    try:
+        while True:
+            with db.engine.begin() as conn:
+                # 범위는 청크마다 다시 읽음 (같은 게시판을 다시 지우면 start_category_job 이 늘림)
+                category, max_post_id = conn.execute(
+                    select(DeleteJob.category, DeleteJob.max_post_id).where(DeleteJob.id == job_id)
+                ).one()
+                stmt = select(Post.id).where(Post.category == category)
+                if max_post_id is not None:
+                    stmt = stmt.where(Post.id <= max_post_id)
+                ids = conn.execute(stmt.order_by(Post.id).limit(CHUNK_SIZE)).scalars().all()
+                if not ids:
+                    break
+                deleted = delete_posts(conn, ids)
+                _set_job(conn, job_id, done=DeleteJob.done + deleted)
+            if verbose:
+                print(f"🗑️ {category}: {deleted}개 삭제")
+            time.sleep(JOB_PAUSE)
+    except Exception as e:
+        with db.engine.begin() as conn:
+            _set_job(conn, job_id, status="failed", error=str(e)[:1000], finished_at=datetime.now())
+        raise
+    with db.engine.begin() as conn:
+        _set_job(conn, job_id, status="done", finished_at=datetime.now())
+
+
+def recent_jobs(limit=5):
+    return db.session.execute(select(DeleteJob).order_by(DeleteJob.id.desc()).limit(limit)).scalars().all()
+
+
+if __name__ == "__main__":
+    from app import app
+
+    parser = argparse.ArgumentParser(description="글 일괄 삭제 작업")
+    parser.add_argument("--resume", action="store_true", help="끝나지 않은 작업(대기 / 실행 중 / 실패) 이어서 실행")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.resume:
+            job_ids = db.session.execute(
+                select(DeleteJob.id).where(DeleteJob.status.in_(ACTIVE_STATUSES + ("failed",))).order_by(DeleteJob.id)
+            ).scalars().all()
+            for job_id in job_ids:
+                run_job(job_id, verbose=True)
+            print(f"✅ 삭제 작업 {len(job_ids)}개 완료")
+        else:
+            for job in recent_jobs(20):
+                print(f"#{job.id} {job.category} {job.status} {job.done}/{job.total} {job.error or ''}")
@@ -0,0 +1,21 @@
+# gunicorn 설정 (Procfile / render.yaml 에서 -c gunicorn.conf.py 로 읽음)
+#
+# /metrics 는 워커마다 PROMETHEUS_MULTIPROC_DIR 에 값을 기록하고 합쳐서 보여 준다 (metrics.py).
+# - 환경 변수가 없으면 instance/prometheus 사용 (metrics 를 불러오기 전에 정해야 함)
+# - 시작할 때 이전 실행의 값 파일을 지움
+# - 워커가 끝나면 그 워커의 게이지 값을 빼도록 표시
+
+import os
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR",
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "prometheus"))
+
+import metrics  # noqa: E402
+
+
+def on_starting(server):
+    metrics.reset_multiproc_dir()
+
+
+def child_exit(server, worker):
+    metrics.mark_process_dead(worker.pid)
@@ -0,0 +1,77 @@
+# 게시글 HTML → 텍스트 변환 도우미
+
+import html
+import os
+import re
+from urllib.parse import unquote
+
+_SCRIPT_STYLE = re.compile(r'<(script|style)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BREAK_TAGS = re.compile(r'<\s*(br|/p|/div|/li|/tr|/h[1-6])[^>]*>', re.IGNORECASE)
+_TAGS = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'\s+')
+_IMG_SRC = re.compile(r'<img[^>]+src=["\']?([^"\'>]+)["\']?', re.IGNORECASE)
+
+EXCERPT_LENGTH = 150
+THUMBNAIL_MAX_LENGTH = 500
+
+# 게시글 이미지가 저장되는 static 아래 폴더들
+STATIC_IMAGE_DIRS = ("restore_images", "restore_images1", "uploads")
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+
+
+def strip_html(value):
+    """HTML 태그를 걷어내고 공백을 정리한 순수 텍스트 반환"""
+    if not value:
+        return ""
+    text = _SCRIPT_STYLE.sub(" ", value)
+    text = _BREAK_TAGS.sub(" ", text)
+    text = _TAGS.sub(" ", text)
+    text = html.unescape(text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def first_img_src(value):
+    """본문의 첫 번째 <img> src (HTML 엔티티로 감싼 경우 포함), 없으면 None"""
+    if not value:
+        return None
+    match = _IMG_SRC.search(html.unescape(value))
+    return match.group(1) if match else None
+
+
+def static_image_rel(src):
+    """'/static/uploads/a.jpg' 같은 URL → 'uploads/a.jpg' (이미지 폴더가 아니면 None)"""
+    if not src:
+        return None
+    path = unquote(src.split("?", 1)[0].split("#", 1)[0])
+    if not path.startswith("/static/"):
+        return None
+    rel = path[len("/static/"):]
+    if rel.split("/", 1)[0] not in STATIC_IMAGE_DIRS or ".." in rel.split("/"):
+        return None
+    if os.path.splitext(rel)[1].lower() not in IMAGE_EXTENSIONS:
+        return None
+    return rel
+
+
+def image_paths(value):
+    """본문이 참조하는 static 이미지 파일들 (static 기준 상대 경로 집합)"""
+    if not value:
+        return set()
+    rels = (static_image_rel(src) for src in _IMG_SRC.findall(html.unescape(value)))
+    return {rel for rel in rels if rel}
+
+
+def make_excerpt(value, length=EXCERPT_LENGTH):
+    """목록에 보여줄 본문 앞부분 (태그 제거)"""
+    text = strip_html(value)
+    return text if len(text) <= length else text[:length - 1] + "…"
+
+
+def list_meta(value):
+    """목록 화면용 요약 정보 (Post.thumbnail / has_image / excerpt 컬럼 값)"""
+    src = first_img_src(value)
+    return {
+        "thumbnail": src if src and len(src) <= THUMBNAIL_MAX_LENGTH else None,  # data: URI 등은 제외
+        "has_image": src is not None,
+        "excerpt": make_excerpt(value),
+    }
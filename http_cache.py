@@ -0,0 +1,112 @@
+# 게시판 화면 조건부 응답 (ETag / 304)
+#
+# 목록 / 상세 화면은 템플릿을 그리기 전에 싼 "버전 키"만으로 ETag 를 만들고,
+# 브라우저가 보낸 If-None-Match 와 같으면 템플릿 없이 304 로 끝낸다.
+# - 게시판별 버전: cache_version 의 'posts:<게시판>' 행. 그 게시판의 글 / 댓글이 바뀔 때마다 올림
+# - 글별 버전: post.updated_at (글 수정, 댓글 추가/수정/삭제 시 갱신)
+# - 조회수는 키에 넣지 않음 (보는 것만으로 ETag 가 바뀌면 304 가 나올 일이 없음)
+# - 로그인 사용자 / 관리자 여부, 템플릿 파일 수정 시각도 키에 포함
+# - 보여줄 flash 메시지가 남아 있으면 ETag 를 붙이지 않음
+# - 화면에 CSRF 토큰이 든 폼이 있으므로 세션 토큰과 시간 구간도 키에 포함
+#   (구간 길이는 WTF_CSRF_TIME_LIMIT 의 절반 → 304 로 다시 쓰는 화면의 토큰이 만료 전이 되도록)
+
+import hashlib
+import os
+import time
+
+from flask import current_app, g, make_response, request, session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+import metrics
+from models import Post, Comment, CacheVersion, POST_DISPLAY_FIELDS
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+CACHE_CONTROL = "private, no-cache"  # 매번 재검증 (304 면 본문 전송 없음)
+
+_template_stamp = None
+
+
+def posts_version_name(category):
+    return f"posts:{category}"
+
+
+def _templates_stamp():
+    """템플릿이 배포로 바뀌면 ETag 도 바뀌도록 (워커마다 같은 값이 나오게 수정 시각 기준)"""
+    global _template_stamp
+    if _template_stamp is None:
+        stamps = []
+        for dirpath, dirnames, filenames in os.walk(TEMPLATE_DIR):
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                stamps.append(f"{filename}:{os.path.getmtime(path)}")
+        _template_stamp = hashlib.sha1("|".join(sorted(stamps)).encode()).hexdigest()[:12]
+    return _template_stamp
+
+
+def _csrf_stamp():
+    """세션 CSRF 토큰 + 토큰 유효 시간 절반 단위 시간 구간 (만료 없음이면 구간 없음)"""
+    limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    bucket = int(time.time() // max(limit // 2, 1)) if limit else None
+    return session.get("csrf_token"), bucket
+
+
+def make_etag(*parts):
+    user = (session.get("user_id"), session.get("is_admin"))
+    raw = repr((_templates_stamp(), user, _csrf_stamp()) + parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def not_modified(*parts):
+    """템플릿을 그리기 전에 호출. 브라우저 캐시가 최신이면 304 응답, 아니면 None
+
+    None 이면 이어서 그린 응답에 after_request 에서 같은 ETag 를 붙인다.
+    """
+    if session.get("_flashes"):
+        return None
+    etag = make_etag(*parts)
+    g._etag = etag
+    hit = etag in request.if_none_match
+    metrics.cache_result("etag", hit)
+    if hit:
+        return make_response("", 304)
+    return None
+
+
+def add_etag_headers(response):
+    """app.after_request 로 등록"""
+    etag = g.pop("_etag", None)
+    if etag and response.status_code in (200, 304):
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def category_versions(category):
+    """목록 ETag 키: 게시판 구성 버전 + 이 게시판 글 버전"""
+    versions = CacheVersion.current(["category", posts_version_name(category)])
+    return versions["category"], versions[posts_version_name(category)]
+
+
+# ✅ 글 / 댓글이 바뀌면 그 게시판의 버전 번호 올림
+#    (executemany 로 저장하는 임포터는 CacheVersion.bump 를 직접 호출)
+@event.listens_for(Session, "after_flush")
+def _bump_posts_versions(session, flush_context):
+    categories = set()
+    comment_post_ids = set()
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, Post):
+            state = inspect(obj)
+            if obj in session.dirty and not any(state.attrs[f].history.has_changes() for f in POST_DISPLAY_FIELDS):
+                continue
+            categories.add(obj.category)
+            categories.update(state.attrs.category.history.deleted)  # 게시판을 옮긴 경우 이전 게시판도
+        elif isinstance(obj, Comment) and obj.post_id is not None:
+            comment_post_ids.add(obj.post_id)
+    if comment_post_ids:
+        categories.update(session.connection().execute(
+            select(Post.category).where(Post.id.in_(comment_post_ids)).distinct()
+        ).scalars())
+    categories.discard(None)
+    if categories:
+        CacheVersion.bump(session.connection(), [posts_version_name(c) for c in categories])
@@ -0,0 +1,228 @@
+# 게시글 이미지 참조 추적 + 고아 이미지 정리(GC)
+#
+# - post_image: 글 본문이 참조하는 static 이미지 파일. 글이 flush 될 때 바뀐 글만 다시 계산
+# - image_gc_candidate: 참조가 끊긴(또는 업로드만 되고 쓰이지 않은) 파일 대기열
+# - GC 는 대기열만 확인하므로 매번 전체 글 / 전체 이미지를 훑지 않는다
+#   1) 유예 기간이 지난 후보 → instance/image_quarantine 으로 격리
+#   2) 격리 후 다시 유예 기간이 지나면 삭제 (그 사이 다시 참조되면 원위치)
+#
+# 사용 예:
+#   python image_refs.py --backfill          # 기존 글 참조 다시 계산
+#   python image_refs.py --scan              # 디스크 전체에서 참조 없는 파일을 대기열에 추가 (처음 한 번)
+#   python image_refs.py --dry-run           # GC 대상만 확인
+#   python image_refs.py --grace-days 7      # GC 실행
+
+import argparse
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+import thumbnails
+from html_utils import image_paths
+from models import db, Post, PostImage, ImageGcCandidate, Attachment
+
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+GRACE_DAYS = 7
+CHUNK_SIZE = 500
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def queue_paths(conn, paths, now=None):
+    """GC 후보로 등록 (이미 있으면 유예 기간을 다시 시작)"""
+    rows = [{"path": p, "queued_at": now or datetime.now()} for p in sorted(set(paths))]
+    if rows:
+        stmt = insert(ImageGcCandidate)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["path"], set_={"queued_at": stmt.excluded.queued_at, "quarantined_at": None}
+            ),
+            rows,
+        )
+
+
+def sync_posts(conn, post_ids):
+    """주어진 글들의 참조를 현재 본문 기준으로 맞추고, 끊긴 참조는 GC 후보로"""
+    ids = sorted({i for i in post_ids if i is not None})
+    released = set()
+    for chunk in _chunks(ids, CHUNK_SIZE):
+        old = set(conn.execute(
+            select(PostImage.post_id, PostImage.path).where(PostImage.post_id.in_(chunk))
+        ).tuples())
+        new = set()
+        for post_id, content in conn.execute(select(Post.id, Post.content).where(Post.id.in_(chunk))):
+            new.update((post_id, path) for path in image_paths(content))
+
+        stale = old - new
+        for post_id, path in stale:
+            conn.execute(delete(PostImage).where(PostImage.post_id == post_id, PostImage.path == path))
+        if new - old:
+            conn.execute(insert(PostImage), [{"post_id": i, "path": p} for i, p in sorted(new - old)])
+        released.update(path for _, path in stale)
+    queue_paths(conn, released)
+
+
+# ✅ 글 작성/수정/삭제 시 참조 자동 갱신 (임포터처럼 executemany 로 저장하면 sync_posts 직접 호출)
+@event.listens_for(Session, "after_flush")
+def _sync_image_refs(session, flush_context):
+    post_ids = set()
+    for obj in session.new | session.dirty | session.deleted:
+        if not isinstance(obj, Post):
+            continue
+        if obj in session.dirty and not inspect(obj).attrs.content.history.has_changes():
+            continue
+        post_ids.add(obj.id)
+    if post_ids:
+        sync_posts(session.connection(), post_ids)
+
+
+def backfill():
+    """모든 글의 참조를 다시 계산"""
+    ids = db.session.execute(select(Post.id).order_by(Post.id)).scalars().all()
+    for done, chunk in enumerate(_chunks(ids, CHUNK_SIZE), start=1):
+        sync_posts(db.session.connection(), chunk)
+        db.session.commit()
+        print(f"🔗 {min(done * CHUNK_SIZE, len(ids))}/{len(ids)} 글 확인")
+    return len(ids)
+
+
+def prune_dangling_refs():
+    """SQL 로 한꺼번에 지운 글(관리자 게시판 삭제 등)의 참조를 정리하고 파일은 GC 후보로"""
+    conn = db.session.connection()
+    paths = conn.execute(
+        delete(PostImage)
+        .where(PostImage.post_id.not_in(select(Post.id)))
+        .returning(PostImage.path)
+    ).scalars().all()
+    queue_paths(conn, paths)
+    return len(paths)
+
+
+def scan_files():
+    """디스크의 이미지 중 참조 없는 파일을 모두 GC 후보로 (처음 도입할 때 / collect_images.py 후)"""
+    referenced = set(db.session.execute(select(PostImage.path).distinct()).scalars())
+    queued = set(db.session.execute(select(ImageGcCandidate.path)).scalars())
+    orphans = []
+    for rel in thumbnails.iter_sources():
+        if rel not in referenced and rel not in queued:
+            orphans.append(rel)
+    queue_paths(db.session.connection(), orphans)
+    db.session.commit()
+    return len(orphans)
+
+
+def _quarantine_path(rel):
+    return os.path.join(current_app.instance_path, "image_quarantine", *rel.split("/"))
+
+
+def _move(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.move(src, dst)
+
+
+def _is_referenced(rel):
+    return db.session.execute(
+        select(PostImage.id).where(PostImage.path == rel).limit(1)
+    ).first() is not None
+
+
+def _forget(rel):
+    db.session.execute(delete(ImageGcCandidate).where(ImageGcCandidate.path == rel))
+    db.session.execute(delete(Attachment).where(Attachment.path == rel))
+
+
+def collect_garbage(grace_days=GRACE_DAYS, delete_now=False, dry_run=False, limit=None):
+    """유예 기간이 지난 후보만 처리. 처리 결과 건수 dict 반환"""
+    stats = {"dangling": 0, "kept": 0, "quarantined": 0, "restored": 0, "deleted": 0, "missing": 0}
+    cutoff = datetime.now() - timedelta(days=grace_days)
+    if not dry_run:
+        stats["dangling"] = prune_dangling_refs()
+        db.session.commit()
+
+    due = db.session.execute(
+        select(ImageGcCandidate)
+        # 격리된 파일은 매번 확인 (그 사이 다시 참조되면 바로 원위치)
+        .where(db.or_(ImageGcCandidate.queued_at <= cutoff, ImageGcCandidate.quarantined_at.is_not(None)))
+        .order_by(ImageGcCandidate.id)
+        .limit(limit)
+    ).scalars().all()
+
+    for done, candidate in enumerate(due, start=1):
+        rel = candidate.path
+        live_path = os.path.join(STATIC_ROOT, *rel.split("/"))
+        quarantined = candidate.quarantined_at is not None
+
+        if _is_referenced(rel):
+            # 다시 쓰이기 시작한 파일 → 후보에서 제외 (격리 중이었다면 원위치)
+            stats["restored" if quarantined else "kept"] += 1
+            if not dry_run:
+                if quarantined and os.path.exists(_quarantine_path(rel)):
+                    _move(_quarantine_path(rel), live_path)
+                db.session.delete(candidate)
+        elif quarantined:
+            if candidate.quarantined_at > cutoff:
+                continue
+            stats["deleted"] += 1
+            if not dry_run:
+                if os.path.exists(_quarantine_path(rel)):
+                    os.remove(_quarantine_path(rel))
+                _forget(rel)
+        elif not os.path.exists(live_path):
+            if os.path.exists(_quarantine_path(rel)):
+                # 격리 중에 다시 대기열에 들어온 파일 → 격리 상태로 되돌림
+                stats["quarantined"] += 1
+                if not dry_run:
+                    candidate.quarantined_at = datetime.now()
+                continue
+            stats["missing"] += 1
+            if not dry_run:
+                _forget(rel)
+        elif delete_now:
+            stats["deleted"] += 1
+            if not dry_run:
+                os.remove(live_path)
+                thumbnails.remove_variants(rel)
+                _forget(rel)
+        else:
+            stats["quarantined"] += 1
+            if not dry_run:
+                _move(live_path, _quarantine_path(rel))
+                thumbnails.remove_variants(rel)
+                candidate.quarantined_at = datetime.now()
+
+        if not dry_run and done % CHUNK_SIZE == 0:
+            db.session.commit()
+    if not dry_run:
+        db.session.commit()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 이미지 참조 갱신 / 고아 이미지 정리")
+    parser.add_argument("--backfill", action="store_true", help="모든 글의 이미지 참조 다시 계산")
+    parser.add_argument("--scan", action="store_true", help="참조 없는 파일을 디스크 전체에서 찾아 대기열에 추가")
+    parser.add_argument("--grace-days", type=float, default=GRACE_DAYS, help="격리 / 삭제 전 유예 기간 (일)")
+    parser.add_argument("--delete", action="store_true", help="격리하지 않고 바로 삭제")
+    parser.add_argument("--dry-run", action="store_true", help="파일 / DB 는 건드리지 않고 건수만 출력")
+    parser.add_argument("--limit", type=int, default=None, help="이번에 처리할 최대 후보 수")
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        if args.backfill:
+            print(f"✅ 참조 재계산 완료! 글 {backfill()}개")
+        if args.scan:
+            print(f"🔎 참조 없는 파일 {scan_files()}개를 대기열에 추가")
+        stats = collect_garbage(args.grace_days, delete_now=args.delete, dry_run=args.dry_run, limit=args.limit)
+        prefix = "🧪 [dry-run] " if args.dry_run else "🧹 "
+        print(f"{prefix}격리 {stats['quarantined']}개 / 삭제 {stats['deleted']}개 / 원위치 {stats['restored']}개 / "
+              f"다시 쓰여서 제외 {stats['kept']}개 / 이미 없음 {stats['missing']}개 / 끊긴 참조 정리 {stats['dangling']}개")
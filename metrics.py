@@ -0,0 +1,233 @@
+# Prometheus 지표 (/metrics, 텍스트 노출 형식)
+#
+# gunicorn 워커마다 값이 따로 쌓이므로 prometheus_client 의 multiprocess 모드를 쓴다.
+# - PROMETHEUS_MULTIPROC_DIR 환경 변수가 밖에서 정해진 경우에만 multiprocess 모드
+#   (gunicorn.conf.py 가 기본값 instance/prometheus 를 넣음. 그 밖의 프로세스는 자기 값만 /metrics 에 보임)
+# - 프로세스마다 그 폴더에 mmap 파일로 기록하고, /metrics 에서 전부 합쳐서 출력
+# - gunicorn.conf.py: 시작할 때 폴더 비우기, 워커가 끝나면 mark_process_dead
+# - 그 밖의 프로세스도 끝날 때 자기 pid 의 게이지 값을 지움 (atexit)
+# - 임포터(zeroboard_import.py)도 같은 환경 변수로 실행하면 웹 /metrics 에서 진행률이 보임
+#     PROMETHEUS_MULTIPROC_DIR=instance/prometheus python zeroboard_import.py ...
+#
+# 지표:
+#   http_requests_total / http_request_duration_seconds   엔드포인트 · 메서드 · 상태 코드별
+#   db_connections_total, db_pool_checked_out              새 SQLite 연결 수, 사용 중인 풀 연결
+#   db_write_statement_seconds                             쓰기 문 실행 시간 (쓰기 잠금 대기 포함)
+#   db_lock_errors_total                                   busy_timeout 을 넘겨 'database is locked' 로 실패
+#   cache_requests_total{cache, result}                    etag / category / page_anchors 적중·실패
+#   upload_bytes_total, uploads_total{result}              업로드 용량, 새 파일 / 중복
+#   importer_*                                             임포터 진행 상황
+#
+# 접근: METRICS_TOKEN 환경 변수가 있으면 'Authorization: Bearer <토큰>' 필요, 없으면 127.* 에서만
+# 현재 값 확인: PROMETHEUS_MULTIPROC_DIR=instance/prometheus python metrics.py  (폴더 비우기: --reset)
+
+import argparse
+import atexit
+import hmac
+import os
+import shutil
+import time
+
+from flask import Response, abort, current_app, g, request
+
+# prometheus_client 를 불러오기 전에 폴더가 있어야 multiprocess 모드로 동작
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                                   generate_latest)
+    from prometheus_client import multiprocess
+except ImportError:  # prometheus_client 가 없으면 /metrics 없이 동작
+    multiprocess = None
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SKIP_ENDPOINTS = {"static"}
+NO_ENDPOINT = "none"  # 404 등 라우트에 걸리지 않은 요청
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+LOCK_MESSAGES = ("database is locked", "database table is locked")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+if multiprocess is not None:
+    REQUESTS = Counter("http_requests_total", "처리한 요청 수", ["endpoint", "method", "status"])
+    LATENCY = Histogram("http_request_duration_seconds", "요청 처리 시간", ["endpoint", "method", "status"],
+                        buckets=LATENCY_BUCKETS)
+    DB_CONNECTIONS = Counter("db_connections_total", "새로 연 SQLite 연결 수")
+    DB_CHECKED_OUT = Gauge("db_pool_checked_out", "사용 중인 풀 연결 수", multiprocess_mode="livesum")
+    DB_WRITE_SECONDS = Histogram("db_write_statement_seconds", "쓰기 문 실행 시간 (쓰기 잠금 대기 포함)",
+                                 buckets=DB_BUCKETS)
+    DB_LOCK_ERRORS = Counter("db_lock_errors_total", "잠금 대기 시간 초과로 실패한 SQL 문 수")
+    CACHE_REQUESTS = Counter("cache_requests_total", "캐시 조회 수", ["cache", "result"])
+    UPLOAD_BYTES = Counter("upload_bytes_total", "업로드된 이미지 용량")
+    UPLOADS = Counter("uploads_total", "업로드된 이미지 수", ["result"])
+    IMPORTER_POSTS = Counter("importer_posts_total", "임포터가 처리한 글 수", ["category", "result"])
+    IMPORTER_COMMENTS = Counter("importer_comments_total", "임포터가 저장한 댓글 수", ["category"])
+    IMPORTER_FILE_POSITION = Gauge("importer_file_posts_done", "처리 중인 파일에서 커밋까지 끝난 글 수",
+                                   ["category"], multiprocess_mode="mostrecent")
+    IMPORTER_FILES_DONE = Gauge("importer_files_completed", "이번 실행에서 끝낸 파일 수",
+                                ["category"], multiprocess_mode="mostrecent")
+    IMPORTER_RUNNING = Gauge("importer_running", "임포트 실행 중이면 1", ["category"], multiprocess_mode="mostrecent")
+    IMPORTER_LAST_BATCH = Gauge("importer_last_batch_timestamp_seconds", "마지막 배치를 커밋한 시각",
+                                ["category"], multiprocess_mode="mostrecent")
+
+
+def init_app(app):
+    if multiprocess is None:
+        app.logger.warning("⚠️ prometheus_client 가 없어 /metrics 를 사용할 수 없습니다.")
+        return
+    app.config.setdefault("METRICS_TOKEN", os.environ.get("METRICS_TOKEN", ""))
+    app.before_request(_start_timer)
+    app.after_request(_observe_request)
+    app.add_url_rule("/metrics", "metrics", _metrics_view)
+
+
+def _start_timer():
+    g._metrics_started = time.perf_counter()
+
+
+def _observe_request(response):
+    started = g.pop("_metrics_started", None)
+    if started is None or request.endpoint in SKIP_ENDPOINTS:
+        return response
+    labels = (request.endpoint or NO_ENDPOINT, request.method, str(response.status_code))
+    REQUESTS.labels(*labels).inc()
+    LATENCY.labels(*labels).observe(time.perf_counter() - started)
+    return response
+
+
+def _allowed():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        return hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+    return (request.remote_addr or "").startswith("127.")
+
+
+def _metrics_view():
+    if not _allowed():
+        abort(403)
+    return Response(exposition(), content_type=CONTENT_TYPE_LATEST)
+
+
+def exposition():
+    """텍스트 노출 형식 (multiprocess 모드면 모든 프로세스 값을 합침)"""
+    if MULTIPROC_DIR is None:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+# 🗂 다른 모듈에서 부르는 기록 함수 (prometheus_client 가 없으면 아무 일도 안 함)
+def cache_result(cache, hit):
+    if multiprocess is not None:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_upload(size, duplicate):
+    if multiprocess is not None:
+        UPLOAD_BYTES.inc(size)
+        UPLOADS.labels("duplicate" if duplicate else "new").inc()
+
+
+def import_started(category):
+    if multiprocess is not None:
+        IMPORTER_RUNNING.labels(category).set(1)
+        IMPORTER_FILES_DONE.labels(category).set(0)
+
+
+def import_batch(category, posts_done, inserted, updated, skipped, comments):
+    if multiprocess is not None:
+        IMPORTER_POSTS.labels(category, "inserted").inc(inserted)
+        IMPORTER_POSTS.labels(category, "updated").inc(updated)
+        IMPORTER_POSTS.labels(category, "skipped").inc(skipped)
+        IMPORTER_COMMENTS.labels(category).inc(comments)
+        IMPORTER_FILE_POSITION.labels(category).set(posts_done)
+        IMPORTER_LAST_BATCH.labels(category).set_to_current_time()
+
+
+def import_file_done(category, files_done):
+    if multiprocess is not None:
+        IMPORTER_FILES_DONE.labels(category).set(files_done)  # mostrecent 게이지는 inc 불가
+
+
+def import_finished(category):
+    if multiprocess is not None:
+        IMPORTER_RUNNING.labels(category).set(0)
+
+
+# 🚀 gunicorn.conf.py 에서 호출
+def reset_multiproc_dir():
+    """이전 실행의 값 파일 삭제 (마스터 시작 시, 워커를 띄우기 전)"""
+    if MULTIPROC_DIR is None:
+        return
+    for name in os.listdir(MULTIPROC_DIR):
+        path = os.path.join(MULTIPROC_DIR, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def mark_process_dead(pid):
+    if multiprocess is not None and MULTIPROC_DIR is not None:
+        multiprocess.mark_process_dead(pid, MULTIPROC_DIR)
+
+
+if multiprocess is not None and MULTIPROC_DIR is not None:
+    # gunicorn 밖의 프로세스(CLI 등)는 child_exit 가 불리지 않으므로 직접 (워커는 두 번 불려도 무해)
+    atexit.register(mark_process_dead, os.getpid())
+
+
+# ✅ DB 연결 / 잠금 지표 (앱 밖 스크립트 연결 포함)
+if multiprocess is not None:
+    @event.listens_for(Engine, "connect")
+    def _count_connection(dbapi_connection, connection_record):
+        DB_CONNECTIONS.inc()
+
+    @event.listens_for(Engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_CHECKED_OUT.inc()
+
+    @event.listens_for(Engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        DB_CHECKED_OUT.dec()
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_write(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip()[:7].upper().startswith(WRITE_PREFIXES):
+            conn.info["_metrics_write_started"] = time.perf_counter()
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_write(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("_metrics_write_started", None)
+        if started is not None:
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started)
+
+    @event.listens_for(Engine, "handle_error")
+    def _count_lock_error(context):
+        conn = context.connection
+        if conn is not None:
+            conn.info.pop("_metrics_write_started", None)
+        if any(message in str(context.original_exception) for message in LOCK_MESSAGES):
+            DB_LOCK_ERRORS.inc()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prometheus 지표 확인")
+    parser.add_argument("--reset", action="store_true", help="PROMETHEUS_MULTIPROC_DIR 의 값 파일 삭제 (서버를 멈춘 뒤)")
+    args = parser.parse_args()
+
+    if MULTIPROC_DIR is None:
+        parser.error("PROMETHEUS_MULTIPROC_DIR 를 지정해서 실행하세요 "
+                     "(예: PROMETHEUS_MULTIPROC_DIR=instance/prometheus python metrics.py)")
+    if args.reset:
+        reset_multiproc_dir()
+        print(f"✅ {MULTIPROC_DIR} 비움")
+    elif multiprocess is None:
+        print("⚠️ prometheus_client 가 설치되어 있지 않습니다.")
+    else:
+        print(exposition().decode("utf-8"))
@@ -0,0 +1,28 @@
+"""baseline: 기존 운영 DB 스키마 기준점
+
+운영 DB(instance/board.db)의 alembic_version 은 5e3583d42a2c 를 가리키지만
+해당 리비전 파일이 저장소에 남아 있지 않다. db.create_all() 로 만들어진 기존
+테이블을 그대로 기준점으로 삼고, 이후 마이그레이션은 여기서부터 이어 붙인다.
+
+Revision ID: 5e3583d42a2c
+Revises: 
+Create Date: 2025-07-01 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e3583d42a2c'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
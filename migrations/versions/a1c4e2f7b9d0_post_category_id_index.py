@@ -0,0 +1,24 @@
+"""post(category, id) 인덱스 추가 (키셋 페이지네이션)
+
+Revision ID: a1c4e2f7b9d0
+Revises: 5e3583d42a2c
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e2f7b9d0'
+down_revision = '5e3583d42a2c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_post_category_id', 'post', ['category', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_post_category_id', table_name='post')
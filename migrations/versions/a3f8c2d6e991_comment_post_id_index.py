@@ -0,0 +1,24 @@
+"""comment(post_id, id) 인덱스 추가 (상세 화면 댓글 키셋 페이지)
+
+Revision ID: a3f8c2d6e991
+Revises: f2c7d9a1e884
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f8c2d6e991'
+down_revision = 'f2c7d9a1e884'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_comment_post_id', 'comment', ['post_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_comment_post_id', table_name='comment')
@@ -0,0 +1,26 @@
+"""post.updated_at 추가 (목록 / 상세 ETag 용)
+
+Revision ID: a7c4d0e6f339
+Revises: f6b3c9d5e228
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c4d0e6f339'
+down_revision = 'f6b3c9d5e228'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,90 @@
+"""검색 색인 테이블 post_fts (FTS5 trigram) 생성 + 기존 글 색인
+
+Revision ID: b4e9d1f3a208
+Revises: a3f8c2d6e991
+Create Date: 2026-10-18 20:00:00
+
+"""
+import html
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e9d1f3a208'
+down_revision = 'a3f8c2d6e991'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 500
+
+# 이 리비전 시점의 html_utils.strip_html 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로)
+_SCRIPT_STYLE = re.compile(r'<(script|style)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BREAK_TAGS = re.compile(r'<\s*(br|/p|/div|/li|/tr|/h[1-6])[^>]*>', re.IGNORECASE)
+_TAGS = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'\s+')
+
+
+def _strip_html(value):
+    if not value:
+        return ""
+    text = _SCRIPT_STYLE.sub(" ", value)
+    text = _BREAK_TAGS.sub(" ", text)
+    text = _TAGS.sub(" ", text)
+    text = html.unescape(text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def upgrade():
+    conn = op.get_bind()
+    try:
+        conn.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS post_fts USING fts5("
+            "title, author, body, comments, category UNINDEXED, "
+            "tokenize='trigram')"
+        )
+    except OperationalError:
+        print("⚠️ 이 SQLite 는 FTS5 trigram 을 지원하지 않아 post_fts 를 만들지 않습니다 (LIKE 검색 사용).")
+        return
+
+    # 예전 버전이 실행 중에 만들어 둔 색인이 있을 수 있으므로 비우고 전부 다시 색인
+    conn.exec_driver_sql("DELETE FROM post_fts")
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, title, author, content, category FROM post "
+                    "WHERE id > :last ORDER BY id LIMIT :limit"),
+            {"last": last_id, "limit": CHUNK_SIZE},
+        ).all()
+        if not rows:
+            break
+        comments = {}
+        for post_id, author, content in conn.execute(
+            sa.text("SELECT post_id, author, content FROM comment "
+                    "WHERE post_id BETWEEN :first AND :last ORDER BY id"),
+            {"first": rows[0].id, "last": rows[-1].id},
+        ):
+            comments.setdefault(post_id, []).append(f"{author or ''} {content or ''}")
+        conn.execute(
+            sa.text("INSERT INTO post_fts (rowid, title, author, body, comments, category) "
+                    "VALUES (:rowid, :title, :author, :body, :comments, :category)"),
+            [
+                {
+                    "rowid": row.id,
+                    "title": row.title or "",
+                    "author": row.author or "",
+                    "body": _strip_html(row.content),
+                    "comments": " ".join(comments.get(row.id, [])),
+                    "category": row.category,
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS post_fts")
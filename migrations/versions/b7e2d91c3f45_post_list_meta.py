@@ -0,0 +1,95 @@
+"""post 목록용 요약 컬럼 추가 (thumbnail, has_image, excerpt, comment_count)
+
+Revision ID: b7e2d91c3f45
+Revises: a1c4e2f7b9d0
+Create Date: 2026-10-18 11:00:00
+
+"""
+import html
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d91c3f45'
+down_revision = 'a1c4e2f7b9d0'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 200
+EXCERPT_LENGTH = 150
+
+# 이 리비전 시점의 html_utils.first_img_src / make_excerpt 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로)
+_SCRIPT_STYLE = re.compile(r'<(script|style)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BREAK_TAGS = re.compile(r'<\s*(br|/p|/div|/li|/tr|/h[1-6])[^>]*>', re.IGNORECASE)
+_TAGS = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'\s+')
+_IMG_SRC = re.compile(r'<img[^>]+src=["\']?([^"\'>]+)["\']?', re.IGNORECASE)
+
+
+def _first_img_src(value):
+    if not value:
+        return None
+    match = _IMG_SRC.search(html.unescape(value))
+    return match.group(1) if match else None
+
+
+def _make_excerpt(value):
+    if not value:
+        return ""
+    text = _SCRIPT_STYLE.sub(" ", value)
+    text = _BREAK_TAGS.sub(" ", text)
+    text = _TAGS.sub(" ", text)
+    text = _SPACES.sub(" ", html.unescape(text)).strip()
+    return text if len(text) <= EXCERPT_LENGTH else text[:EXCERPT_LENGTH - 1] + "…"
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('thumbnail', sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column('has_image', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('excerpt', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # 기존 글 채우기 (id 순으로 잘라서 처리)
+    conn = op.get_bind()
+    conn.execute(sa.text(
+        "UPDATE post SET comment_count = "
+        "(SELECT count(*) FROM comment WHERE comment.post_id = post.id)"
+    ))
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, content FROM post WHERE id > :last ORDER BY id LIMIT :limit"),
+            {"last": last_id, "limit": CHUNK_SIZE},
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            src = _first_img_src(row.content)
+            params.append({
+                "id": row.id,
+                "thumbnail": src if src and len(src) <= 500 else None,
+                "has_image": src is not None,
+                "excerpt": _make_excerpt(row.content),
+            })
+        conn.execute(
+            sa.text(
+                "UPDATE post SET thumbnail = :thumbnail, has_image = :has_image, "
+                "excerpt = :excerpt WHERE id = :id"
+            ),
+            params,
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('comment_count')
+        batch_op.drop_column('excerpt')
+        batch_op.drop_column('has_image')
+        batch_op.drop_column('thumbnail')
@@ -0,0 +1,30 @@
+"""post.rendered_content 추가 (정리된 본문 HTML, 저장 시 한 번만 생성)
+
+컬럼만 추가한다. 렌더링 결과는 앱 코드(post_html, 썸네일 변환본 유무, Pillow)에 따라 달라지므로
+기존 글은 업그레이드 후 `python post_html.py` 로 채운다. 채우기 전까지 NULL 인 글은 상세 화면에서
+render_content 필터로 그때그때 렌더링된다.
+
+Revision ID: b8d5e1f7a440
+Revises: a7c4d0e6f339
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d5e1f7a440'
+down_revision = 'a7c4d0e6f339'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rendered_content', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('rendered_content')
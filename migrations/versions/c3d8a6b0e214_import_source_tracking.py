@@ -0,0 +1,44 @@
+"""재임포트용 원본 문서 ID / 해시 컬럼과 임포트 체크포인트 테이블
+
+Revision ID: c3d8a6b0e214
+Revises: b7e2d91c3f45
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d8a6b0e214'
+down_revision = 'b7e2d91c3f45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source_id', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('source_hash', sa.String(length=40), nullable=True))
+        batch_op.create_index('ix_post_category_source_id', ['category', 'source_id'], unique=True)
+
+    op.create_table(
+        'import_checkpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('file_mtime', sa.Float(), nullable=False),
+        sa.Column('posts_done', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('file_path'),
+    )
+
+
+def downgrade():
+    op.drop_table('import_checkpoint')
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_category_source_id')
+        batch_op.drop_column('source_hash')
+        batch_op.drop_column('source_id')
@@ -0,0 +1,27 @@
+"""delete_job.max_post_id 추가 (작업 시작 시점의 마지막 글 id 까지만 삭제)
+
+Revision ID: c5a7e3b2d419
+Revises: b4e9d1f3a208
+Create Date: 2026-10-18 20:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a7e3b2d419'
+down_revision = 'b4e9d1f3a208'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('delete_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('max_post_id', sa.Integer(), nullable=True))
+    # 이미 실행 중 / 대기 중인 작업은 NULL 로 두어 예전처럼 게시판 전체를 지움
+
+
+def downgrade():
+    with op.batch_alter_table('delete_job', schema=None) as batch_op:
+        batch_op.drop_column('max_post_id')
@@ -0,0 +1,38 @@
+"""백그라운드 일괄 삭제 작업 테이블 + 예전 게시판 삭제로 남은 고아 댓글 정리
+
+Revision ID: c9e6f2a8b551
+Revises: b8d5e1f7a440
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e6f2a8b551'
+down_revision = 'b8d5e1f7a440'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'delete_job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('done', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    # Post.query.filter_by(category=...).delete() 로 글만 지워지고 남은 댓글 (어느 화면에서도 안 보임)
+    op.execute("DELETE FROM comment WHERE post_id IS NOT NULL AND post_id NOT IN (SELECT id FROM post)")
+
+
+def downgrade():
+    op.drop_table('delete_job')
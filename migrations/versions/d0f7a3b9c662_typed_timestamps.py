@@ -0,0 +1,140 @@
+"""post.date / comment.created_at 문자열 → DateTime + (category, date), (post_id, created_at) 인덱스
+
+기존 문자열('YYYY-MM-DD HH:MM' 등)을 id 순으로 잘라 datetime 으로 바꿔 저장한다.
+형식을 알 수 없는 값은 NULL 로 두고 instance/date_backfill_errors.csv 에 (테이블, id, 원래 값) 기록.
+
+Revision ID: d0f7a3b9c662
+Revises: c9e6f2a8b551
+Create Date: 2026-10-18 19:00:00
+
+"""
+import csv
+from datetime import datetime
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0f7a3b9c662'
+down_revision = 'c9e6f2a8b551'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 500
+TIMESTAMP_COLUMNS = (('post', 'date'), ('comment', 'created_at'))
+INDEXES = (('ix_post_category_date', ['category', 'date']), ('ix_comment_post_created', ['post_id', 'created_at']))
+# 앱 컨텍스트 없이도 돌도록 instance 폴더를 이 파일 위치 기준으로 (migrations/versions → 저장소 루트)
+REPORT_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'instance', 'date_backfill_errors.csv'))
+
+# 이 리비전 시점의 dates.parse_datetime 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로)
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M"
+INPUT_FORMATS = (
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y%m%d%H%M%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y.%m.%d %H:%M",
+    "%Y/%m/%d %H:%M",
+    "%Y-%m-%d",
+)
+
+
+def _parse_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        return None
+    for fmt in INPUT_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    if value.isdigit() and len(value) in (9, 10):  # 유닉스 시각
+        return datetime.fromtimestamp(int(value))
+    return None
+
+
+def _copy_converted(conn, table_name, source, target, convert):
+    """id 순으로 잘라 읽어 target = convert(source) 로 채움. 변환 실패 (id, 원래 값) 목록 반환"""
+    read = sa.text(
+        f"SELECT id, {source} AS value FROM {table_name} "
+        f"WHERE id > :last AND {source} IS NOT NULL ORDER BY id LIMIT :limit"
+    )
+    failed = []
+    last_id = 0
+    while True:
+        rows = conn.execute(read, {"last": last_id, "limit": CHUNK_SIZE}).all()
+        if not rows:
+            return failed
+        params = []
+        for row in rows:
+            value = convert(row.value)
+            if value is None:
+                failed.append((row.id, row.value))
+            params.append({"row_id": row.id, "value": value})
+        conn.execute(
+            sa.text(f"UPDATE {table_name} SET {target} = :value WHERE id = :row_id"),
+            params,
+        )
+        last_id = rows[-1].id
+
+
+def _swap_column(table_name, column_name, new_type, convert, index=None, drop_index=None):
+    """새 타입 임시 컬럼에 변환 값을 채운 뒤 원래 컬럼과 바꿔치기. 변환 실패 목록 반환
+
+    batch_alter_table 의 alter_column(type_=...) 은 테이블을 다시 만들며 CAST 로 복사하는데,
+    SQLite 에서 CAST('2004-02-06 17:18' AS DATETIME) 은 숫자 2004 가 되어 값이 망가지므로 쓰지 않는다.
+    """
+    temp_name = f"{column_name}_new"
+    if drop_index:
+        op.drop_index(drop_index, table_name=table_name)
+    with op.batch_alter_table(table_name, schema=None) as batch_op:
+        batch_op.add_column(sa.Column(temp_name, new_type, nullable=True))
+    failed = _copy_converted(op.get_bind(), table_name, column_name, temp_name, convert)
+    with op.batch_alter_table(table_name, schema=None) as batch_op:
+        batch_op.drop_column(column_name)
+        batch_op.alter_column(temp_name, new_column_name=column_name, existing_type=new_type, existing_nullable=True)
+    if index:
+        op.create_index(index[0], table_name, index[1], unique=False)
+    return failed
+
+
+def _to_storage(value):
+    # SQLAlchemy DateTime 이 SQLite 에 저장하는 형식과 같게 (문자열 비교 = 시간 순)
+    parsed = _parse_datetime(value)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S.%f") if parsed else None
+
+
+def _to_display(value):
+    parsed = _parse_datetime(value)
+    return parsed.strftime(DISPLAY_FORMAT) if parsed else value
+
+
+def _write_report(failed):
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['table', 'id', 'value'])
+        writer.writerows(failed)
+    print(f"⚠️ 날짜로 바꾸지 못한 값 {len(failed)}개 → NULL 로 저장, 원래 값은 {REPORT_PATH}")
+
+
+def upgrade():
+    failed = []
+    for (table_name, column_name), index in zip(TIMESTAMP_COLUMNS, INDEXES):
+        failed += [
+            (table_name, row_id, value)
+            for row_id, value in _swap_column(table_name, column_name, sa.DateTime(), _to_storage, index=index)
+        ]
+    if failed:
+        _write_report(failed)
+
+
+def downgrade():
+    for (table_name, column_name), index in zip(TIMESTAMP_COLUMNS, INDEXES):
+        _swap_column(table_name, column_name, sa.String(length=20), _to_display, drop_index=index[0])
@@ -0,0 +1,35 @@
+"""업로드 파일 테이블 (내용 해시 기준 저장)
+
+Revision ID: d4f1a7c2e830
+Revises: c3d8a6b0e214
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f1a7c2e830'
+down_revision = 'c3d8a6b0e214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'attachment',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('path', sa.String(length=200), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=False),
+        sa.Column('original_name', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sha256'),
+    )
+
+
+def downgrade():
+    op.drop_table('attachment')
@@ -0,0 +1,42 @@
+"""게시판 월별 요약 테이블 (post_archive_month)
+
+Revision ID: e1a8b4c0d773
+Revises: d0f7a3b9c662
+Create Date: 2026-10-18 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a8b4c0d773'
+down_revision = 'd0f7a3b9c662'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'post_archive_month',
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('post_count', sa.Integer(), nullable=False),
+        sa.Column('first_id', sa.Integer(), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('category', 'year', 'month'),
+    )
+
+    # 기존 글 집계 (post(category, date) 인덱스 순서대로 한 번 훑음)
+    op.execute(
+        "INSERT INTO post_archive_month (category, year, month, post_count, first_id, last_id) "
+        "SELECT category, CAST(strftime('%Y', date) AS INTEGER), CAST(strftime('%m', date) AS INTEGER), "
+        "       count(*), min(id), max(id) "
+        "FROM post WHERE date IS NOT NULL "
+        "GROUP BY category, strftime('%Y', date), strftime('%m', date)"
+    )
+
+
+def downgrade():
+    op.drop_table('post_archive_month')
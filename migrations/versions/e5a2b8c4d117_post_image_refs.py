@@ -0,0 +1,94 @@
+"""게시글 이미지 참조 테이블 + 이미지 GC 대기열
+
+Revision ID: e5a2b8c4d117
+Revises: d4f1a7c2e830
+Create Date: 2026-10-18 14:00:00
+
+"""
+import html
+import os
+import re
+from urllib.parse import unquote
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a2b8c4d117'
+down_revision = 'd4f1a7c2e830'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 200
+
+# 이 리비전 시점의 html_utils.image_paths 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로)
+_IMG_SRC = re.compile(r'<img[^>]+src=["\']?([^"\'>]+)["\']?', re.IGNORECASE)
+STATIC_IMAGE_DIRS = ("restore_images", "restore_images1", "uploads")
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+
+
+def _static_image_rel(src):
+    path = unquote(src.split("?", 1)[0].split("#", 1)[0])
+    if not path.startswith("/static/"):
+        return None
+    rel = path[len("/static/"):]
+    if rel.split("/", 1)[0] not in STATIC_IMAGE_DIRS or ".." in rel.split("/"):
+        return None
+    if os.path.splitext(rel)[1].lower() not in IMAGE_EXTENSIONS:
+        return None
+    return rel
+
+
+def _image_paths(value):
+    if not value:
+        return set()
+    rels = (_static_image_rel(src) for src in _IMG_SRC.findall(html.unescape(value)))
+    return {rel for rel in rels if rel}
+
+
+def upgrade():
+    op.create_table(
+        'post_image',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(length=300), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['post.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('post_id', 'path', name='uq_post_image_post_path'),
+    )
+    op.create_index('ix_post_image_path', 'post_image', ['path'])
+    op.create_table(
+        'image_gc_candidate',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(length=300), nullable=False),
+        sa.Column('queued_at', sa.DateTime(), nullable=False),
+        sa.Column('quarantined_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('path'),
+    )
+
+    # 기존 글 참조 채우기 (id 순으로 잘라서 처리)
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, content FROM post WHERE id > :last ORDER BY id LIMIT :limit"),
+            {"last": last_id, "limit": CHUNK_SIZE},
+        ).all()
+        if not rows:
+            break
+        params = [
+            {"post_id": row.id, "path": path}
+            for row in rows
+            for path in sorted(_image_paths(row.content))
+        ]
+        if params:
+            conn.execute(sa.text("INSERT INTO post_image (post_id, path) VALUES (:post_id, :path)"), params)
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_table('image_gc_candidate')
+    op.drop_index('ix_post_image_path', table_name='post_image')
+    op.drop_table('post_image')
@@ -0,0 +1,38 @@
+"""엔드포인트별 요청 통계 테이블 (request_stat)
+
+Revision ID: f2c7d9a1e884
+Revises: e1a8b4c0d773
+Create Date: 2026-10-18 21:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7d9a1e884'
+down_revision = 'e1a8b4c0d773'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'request_stat',
+        sa.Column('endpoint', sa.String(length=100), nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False),
+        sa.Column('total_ms', sa.Float(), nullable=False),
+        sa.Column('max_ms', sa.Float(), nullable=False),
+        sa.Column('sql_count', sa.Integer(), nullable=False),
+        sa.Column('max_sql_count', sa.Integer(), nullable=False),
+        sa.Column('sql_ms', sa.Float(), nullable=False),
+        sa.Column('render_ms', sa.Float(), nullable=False),
+        sa.Column('slow_count', sa.Integer(), nullable=False),
+        sa.Column('error_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('endpoint'),
+    )
+
+
+def downgrade():
+    op.drop_table('request_stat')
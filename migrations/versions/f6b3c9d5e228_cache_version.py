@@ -0,0 +1,29 @@
+"""캐시 무효화용 버전 번호 테이블
+
+Revision ID: f6b3c9d5e228
+Revises: e5a2b8c4d117
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b3c9d5e228'
+down_revision = 'e5a2b8c4d117'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cache_version',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade():
+    op.drop_table('cache_version')
@@ -1,5 +1,11 @@
+from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 from werkzeug.security import generate_password_hash, check_password_hash
+from html_utils import list_meta
+from post_html import render_content
 
 db = SQLAlchemy()
 
@@ -9,11 +15,23 @@ class Post(db.Model):
     title = db.Column(db.String(200))
     author = db.Column(db.String(50))
     content = db.Column(db.Text)
-    date = db.Column(db.String(20))
+    date = db.Column(db.DateTime, nullable=True)  # 작성 시각
     read_count = db.Column(db.Integer)
     category = db.Column(db.String(50), nullable=False, default="자유게시판")
     password = db.Column(db.String(200), nullable=True)  # 게시글 비밀번호 (옵션)
 
+    # 📋 목록 화면용 요약 정보 (글 저장 시 계산 → 목록에서 content 를 읽지 않음)
+    thumbnail = db.Column(db.String(500), nullable=True)  # 첫 번째 이미지 src
+    has_image = db.Column(db.Boolean, nullable=False, default=False)
+    excerpt = db.Column(db.String(200), nullable=True)  # 태그 뺀 본문 앞부분
+    comment_count = db.Column(db.Integer, nullable=False, default=0)
+    rendered_content = db.Column(db.Text, nullable=True)  # 정리된 본문 HTML (저장 시 생성, 상세 화면에서 그대로 출력)
+    updated_at = db.Column(db.DateTime, nullable=True)  # 글 / 댓글이 마지막으로 바뀐 시각 (ETag 용, 조회수 제외)
+
+    # 📥 백업 XML 에서 가져온 글: 원본 문서 ID 와 원본 내용 해시 (재임포트 시 비교)
+    source_id = db.Column(db.String(100), nullable=True)
+    source_hash = db.Column(db.String(40), nullable=True)
+
     # 💬 댓글 연결
     comments = db.relationship(
         'Comment',
@@ -22,6 +40,13 @@ class Post(db.Model):
         lazy=True
     )
 
+    # 📑 카테고리별 목록 / 키셋 페이지네이션용 인덱스
+    __table_args__ = (
+        db.Index("ix_post_category_id", "category", "id"),
+        db.Index("ix_post_category_source_id", "category", "source_id", unique=True),
+        db.Index("ix_post_category_date", "category", "date"),
+    )
+
     def __repr__(self):
         return f"<Post {self.id} | {self.title}>"
 
@@ -29,14 +54,25 @@ class Post(db.Model):
     def check_password(self, password):
         return check_password_hash(self.password, password) if self.password else True
 
+    # 목록용 요약 정보 / 상세 화면용 본문 다시 계산
+    def refresh_list_meta(self):
+        for key, value in list_meta(self.content).items():
+            setattr(self, key, value)
+        self.rendered_content = render_content(self.content)
+
 # 댓글 모델
 class Comment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     author = db.Column(db.String(50))
     content = db.Column(db.Text)
-    created_at = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, nullable=True)
     post_id = db.Column(db.Integer, db.ForeignKey('post.id'))
 
+    __table_args__ = (
+        db.Index("ix_comment_post_created", "post_id", "created_at"),
+        db.Index("ix_comment_post_id", "post_id", "id"),  # 상세 화면 댓글 페이지 (comments.py)
+    )
+
     def __repr__(self):
         return f"<Comment {self.id} | post_id={self.post_id}>"
 
@@ -58,6 +94,86 @@ class User(db.Model):
     def __repr__(self):
         return f"<User {self.username}>"
 
+# 임포트 진행 상황 (XML 파일별 체크포인트)
+class ImportCheckpoint(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    file_path = db.Column(db.String(500), unique=True, nullable=False)
+    file_size = db.Column(db.Integer, nullable=False)
+    file_mtime = db.Column(db.Float, nullable=False)
+    posts_done = db.Column(db.Integer, nullable=False, default=0)  # 커밋까지 끝난 <post> 개수
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ImportCheckpoint {self.file_path} | {self.posts_done}>"
+
+# 업로드 파일 (내용 해시 하나당 한 행, 실제 파일은 static/<path>)
+class Attachment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    path = db.Column(db.String(200), nullable=False)  # static 기준 상대 경로 (uploads/ab/<해시>.jpg)
+    size = db.Column(db.Integer, nullable=False)
+    content_type = db.Column(db.String(50), nullable=False)
+    original_name = db.Column(db.String(255), nullable=True)  # 처음 올린 파일 이름
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    @property
+    def url(self):
+        return "/static/" + self.path
+
+    def __repr__(self):
+        return f"<Attachment {self.path}>"
+
+# 게시글 → 본문이 참조하는 이미지 파일 (static 기준 상대 경로)
+class PostImage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
+    path = db.Column(db.String(300), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("post_id", "path", name="uq_post_image_post_path"),
+        db.Index("ix_post_image_path", "path"),
+    )
+
+    def __repr__(self):
+        return f"<PostImage post_id={self.post_id} | {self.path}>"
+
+# 이미지 GC 후보 (참조가 끊긴 파일, 유예 기간 뒤 격리 → 삭제)
+class ImageGcCandidate(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(300), unique=True, nullable=False)
+    queued_at = db.Column(db.DateTime, nullable=False)
+    quarantined_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ImageGcCandidate {self.path}>"
+
+# 캐시 무효화용 버전 번호 (이름별로 하나씩, 값이 바뀌면 각 워커가 캐시를 다시 읽음)
+class CacheVersion(db.Model):
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def bump(cls, conn, names):
+        """버전 번호 올리기 (없으면 1 로 만들기)"""
+        rows = [{"name": name, "version": 1} for name in sorted(set(names))]
+        if rows:
+            stmt = sqlite_insert(cls)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=["name"], set_={"version": cls.version + 1}
+            ), rows)
+
+    @classmethod
+    def current(cls, names):
+        """{이름: 버전} (한 번도 안 올린 이름은 0)"""
+        rows = db.session.execute(
+            db.select(cls.name, cls.version).where(cls.name.in_(list(names)))
+        ).all()
+        return dict({name: 0 for name in names}, **dict(rows))
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
+
 # 카테고리 모델
 class Category(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -68,3 +184,118 @@ class Category(db.Model):
     def __repr__(self):
         return f"<Category {self.name}>"
 
+# 게시판별 월간 요약 (월별 보기: 글 수, 그 달 첫 / 마지막 글 id). archive.py 가 글 변경 시 갱신
+class PostArchiveMonth(db.Model):
+    __tablename__ = "post_archive_month"
+    category = db.Column(db.String(100), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    post_count = db.Column(db.Integer, nullable=False, default=0)
+    first_id = db.Column(db.Integer, nullable=False)
+    last_id = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<PostArchiveMonth {self.category} {self.year}-{self.month:02d} | {self.post_count}>"
+
+# 백그라운드 일괄 삭제 작업 (게시판 통째 삭제 등) 진행 상황
+class DeleteJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.String(100), nullable=False)  # 글을 지울 게시판 이름
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued / running / done / failed
+    total = db.Column(db.Integer, nullable=False, default=0)  # 시작할 때 센 글 수
+    max_post_id = db.Column(db.Integer, nullable=True)  # 이 id 까지만 삭제 (작업 중 같은 이름으로 새로 만든 게시판 글 보호)
+    done = db.Column(db.Integer, nullable=False, default=0)   # 지금까지 지운 글 수
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def percent(self):
+        if self.status == "done":
+            return 100
+        return min(100, int(self.done * 100 / self.total)) if self.total else 0
+
+    def __repr__(self):
+        return f"<DeleteJob {self.id} {self.category} | {self.status} {self.done}/{self.total}>"
+
+# 엔드포인트별 요청 통계 (profiling.py 가 워커마다 모았다가 주기적으로 더함)
+class RequestStat(db.Model):
+    endpoint = db.Column(db.String(100), primary_key=True)
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+    total_ms = db.Column(db.Float, nullable=False, default=0)
+    max_ms = db.Column(db.Float, nullable=False, default=0)
+    sql_count = db.Column(db.Integer, nullable=False, default=0)  # SQL 문 수 합계
+    max_sql_count = db.Column(db.Integer, nullable=False, default=0)  # 요청 하나에서 가장 많이 실행한 SQL 문 수
+    sql_ms = db.Column(db.Float, nullable=False, default=0)
+    render_ms = db.Column(db.Float, nullable=False, default=0)  # 템플릿 렌더링 시간 합계
+    slow_count = db.Column(db.Integer, nullable=False, default=0)  # PROFILE_SLOW_MS 를 넘은 요청 수
+    error_count = db.Column(db.Integer, nullable=False, default=0)  # 5xx 응답 수
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    def _avg(self, total):
+        return total / self.request_count if self.request_count else 0
+
+    @property
+    def avg_ms(self):
+        return self._avg(self.total_ms)
+
+    @property
+    def avg_sql_count(self):
+        return self._avg(self.sql_count)
+
+    @property
+    def avg_sql_ms(self):
+        return self._avg(self.sql_ms)
+
+    @property
+    def avg_render_ms(self):
+        return self._avg(self.render_ms)
+
+    def __repr__(self):
+        return f"<RequestStat {self.endpoint} | {self.request_count}회 평균 {self.avg_ms:.1f}ms>"
+
+
+# 화면에 보이는 글 필드 (바뀌면 updated_at 갱신, 조회수는 제외)
+POST_DISPLAY_FIELDS = ("title", "author", "content", "date", "category", "password")
+
+
+# ✅ 글 작성/수정/임포트 시 목록용 요약 정보 / updated_at 자동 갱신
+@event.listens_for(Session, "before_flush")
+def _refresh_post_list_meta(session, flush_context, instances):
+    for obj in session.new:
+        if isinstance(obj, Post):
+            obj.refresh_list_meta()
+            obj.updated_at = datetime.now()
+    for obj in session.dirty:
+        if not isinstance(obj, Post):
+            continue
+        state = inspect(obj)
+        if state.attrs.content.history.has_changes():
+            obj.refresh_list_meta()
+        if any(state.attrs[f].history.has_changes() for f in POST_DISPLAY_FIELDS):
+            obj.updated_at = datetime.now()
+
+
+def refresh_comment_counts(conn, post_ids):
+    """글들의 comment_count 다시 세고 updated_at 갱신"""
+    conn.execute(
+        text(
+            "UPDATE post SET comment_count = "
+            "(SELECT count(*) FROM comment WHERE comment.post_id = post.id), "
+            "updated_at = :now "
+            "WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"ids": sorted(post_ids), "now": datetime.now()},
+    )
+
+
+# ✅ 댓글이 추가/수정/삭제되면 해당 글의 comment_count 다시 세고 updated_at 갱신
+#    (SQL 로 한꺼번에 지우는 deletion.py 는 refresh_comment_counts 직접 호출)
+@event.listens_for(Session, "after_flush")
+def _refresh_comment_counts(session, flush_context):
+    post_ids = {
+        obj.post_id for obj in session.new | session.dirty | session.deleted
+        if isinstance(obj, Comment) and obj.post_id is not None
+    }
+    if post_ids:
+        refresh_comment_counts(session.connection(), post_ids)
@@ -0,0 +1,113 @@
+# 카테고리 목록 키셋(커서) 페이지네이션
+#
+# OFFSET 스캔 + COUNT(*) 대신 post(category, id) 인덱스를 타고 id 기준으로 잘라 읽는다.
+# - ?cursor=<id> 가 있으면 그 id 바로 다음 글부터 (다음 페이지 링크)
+# - 페이지 번호만 있으면 "각 페이지 첫 글 id" 앵커를 한 번 계산해 캐시한 뒤 사용
+
+import math
+import threading
+import time
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session, defer
+
+import metrics
+from models import db, Post
+
+ANCHOR_TTL = 300  # 초. 다른 워커의 글쓰기/삭제는 이 시간 안에 반영됨
+
+_anchor_cache = {}  # (category, per_page) → (만료 시각, 앵커 id 목록, 전체 글 수)
+_lock = threading.Lock()
+
+
+class KeysetPage:
+    """한 페이지 분량의 글 목록 (Flask-SQLAlchemy Pagination 과 같은 속성 제공)"""
+
+    def __init__(self, items, page, per_page, total, next_cursor=None):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.next_cursor = next_cursor
+
+    @property
+    def pages(self):
+        return math.ceil(self.total / self.per_page) if self.total else 0
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def page_anchors(category, per_page):
+    """(앵커 id 목록, 전체 글 수). anchors[n-1] 은 n 페이지 첫 글의 id"""
+    key = (category, per_page)
+    now = time.monotonic()
+    with _lock:
+        cached = _anchor_cache.get(key)
+    hit = bool(cached and cached[0] > now)
+    metrics.cache_result("page_anchors", hit)
+    if hit:
+        return cached[1], cached[2]
+
+    rows = db.session.execute(
+        text(
+            "SELECT id, total FROM ("
+            "  SELECT id,"
+            "         row_number() OVER (ORDER BY id DESC) AS rn,"
+            "         count(*) OVER () AS total"
+            "  FROM post WHERE category = :category"
+            ") WHERE (rn - 1) % :per_page = 0 ORDER BY rn"
+        ),
+        {"category": category, "per_page": per_page},
+    ).all()
+    anchors = [r.id for r in rows]
+    total = rows[0].total if rows else 0
+
+    with _lock:
+        _anchor_cache[key] = (now + ANCHOR_TTL, anchors, total)
+    return anchors, total
+
+
+def invalidate_anchors(category=None):
+    with _lock:
+        for key in list(_anchor_cache):
+            if category is None or key[0] == category:
+                del _anchor_cache[key]
+
+
+def paginate_category(category, page=1, per_page=12, cursor=None):
+    """카테고리 글 목록 한 페이지. 범위를 벗어난 페이지면 None"""
+    anchors, total = page_anchors(category, per_page)
+    # 목록에는 요약 컬럼만 쓰므로 본문(content)은 아예 읽지 않음
+    query = Post.query.options(defer(Post.content, raiseload=True)).filter(Post.category == category)
+
+    if cursor is not None:
+        query = query.filter(Post.id < cursor)
+    elif page <= len(anchors):
+        query = query.filter(Post.id <= anchors[page - 1])
+    elif page > 1:
+        return None
+
+    rows = query.order_by(Post.id.desc()).limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = items[-1].id if len(rows) > per_page else None
+    return KeysetPage(items, page, per_page, total, next_cursor)
+
+
+# ✅ 이 워커에서 글이 추가/삭제/이동되면 해당 카테고리 앵커 캐시 비우기
+@event.listens_for(Session, "after_flush")
+def _drop_stale_anchors(session, flush_context):
+    for obj in session.new | session.deleted | session.dirty:
+        if not isinstance(obj, Post):
+            continue
+        if obj in session.dirty:
+            history = inspect(obj).attrs.category.history
+            for name in [*history.added, *history.deleted]:
+                invalidate_anchors(name)
+        else:
+            invalidate_anchors(obj.category)
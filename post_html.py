@@ -0,0 +1,256 @@
+# 게시글 본문 HTML 정리 (저장할 때 한 번만)
+#
+# 상세 화면에서 매번 replace / 필터를 돌리는 대신, 글을 저장할 때
+# - 허용된 태그 / 속성만 남기고 (script, on* 이벤트, javascript: 링크 등 제거)
+# - <img> 에 class="zoomable", loading="lazy", width/height, 중간 크기 변환본 src 를 붙여
+# post.rendered_content 에 저장한다. 상세 화면은 그 문자열을 그대로 출력.
+#
+# 기존 글 / 변환본을 새로 만든 뒤 다시 렌더링: python post_html.py
+
+import html
+import os
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+
+import thumbnails
+from html_utils import image_paths, static_image_rel
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 가 없으면 width/height 없이
+    Image = None
+
+ALLOWED_TAGS = {
+    "a", "b", "big", "blockquote", "br", "center", "code", "div", "em", "figcaption", "figure",
+    "font", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "img", "li", "ol", "p", "pre", "s",
+    "small", "span", "strike", "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th",
+    "thead", "tr", "u", "ul",
+}
+VOID_TAGS = {"br", "hr", "img"}
+# 태그째로 내용까지 버리는 것들
+DROP_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "noscript", "title", "head", "textarea", "select"}
+
+GLOBAL_ATTRS = {"align", "style", "title"}
+TAG_ATTRS = {
+    "a": {"href", "target"},
+    "img": {"src", "alt", "width", "height"},
+    "font": {"color", "size", "face"},
+    "table": {"border", "cellpadding", "cellspacing", "width", "bgcolor"},
+    "td": {"colspan", "rowspan", "valign", "width", "bgcolor"},
+    "th": {"colspan", "rowspan", "valign", "width", "bgcolor"},
+    "ol": {"start", "type"},
+}
+URL_ATTRS = {"href", "src"}
+SAFE_SCHEMES = {"http", "https", "mailto"}
+
+_UNSAFE_STYLE = re.compile(r"expression|javascript:|vbscript:|url\s*\(|@import|behavior", re.IGNORECASE)
+_CONTROL_CHARS = re.compile(r"[\x00-\x20\x7f]+")
+_DIMENSION = re.compile(r"^\d{1,5}%?$")
+
+
+def _safe_url(value, tag):
+    url = _CONTROL_CHARS.sub("", value or "")
+    scheme, sep, _ = url.partition(":")
+    if not sep or "/" in scheme or "?" in scheme or "#" in scheme:
+        return value.strip()  # 상대 경로
+    scheme = scheme.lower()
+    if scheme in SAFE_SCHEMES:
+        return value.strip()
+    if scheme == "data" and tag == "img" and url.lower().startswith("data:image/") and "svg" not in url[:30].lower():
+        return value.strip()
+    return None
+
+
+def _image_size(rel):
+    if Image is None or rel is None:
+        return None
+    try:
+        with Image.open(os.path.join(thumbnails.STATIC_ROOT, rel)) as im:
+            return im.size  # 헤더만 읽음 (디코딩 안 함)
+    except Exception:
+        return None
+
+
+def _image_attrs(attrs):
+    """<img> 속성 정리: 변환본 src, 원본은 data-original, 크기, 지연 로딩"""
+    src = attrs.get("src")
+    if not src:
+        return None
+    rel = static_image_rel(src)
+    medium = thumbnails.variant_url(src, "medium")
+    if medium:
+        attrs["data-original"] = src
+        attrs["src"] = medium
+        size = _image_size(thumbnails.variant_rel(rel, "medium", "jpg"))
+    else:
+        size = _image_size(rel)
+    if size and "width" not in attrs and "height" not in attrs:
+        attrs["width"], attrs["height"] = str(size[0]), str(size[1])
+    attrs["class"] = "zoomable"
+    attrs["loading"] = "lazy"
+    attrs["decoding"] = "async"
+    return attrs
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open_tags = []
+        self.skip_depth = 0
+
+    def _clean_attrs(self, tag, attrs):
+        allowed = GLOBAL_ATTRS | TAG_ATTRS.get(tag, set())
+        cleaned = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRS:
+                value = _safe_url(value, tag)
+                if value is None:
+                    continue
+            elif name == "style" and _UNSAFE_STYLE.search(value):
+                continue
+            elif name in ("width", "height") and not _DIMENSION.match(value.strip()):
+                continue
+            cleaned[name] = value
+        if tag == "a" and cleaned.get("target"):
+            cleaned["target"] = "_blank"
+            cleaned["rel"] = "noopener noreferrer"
+        if tag == "img":
+            return _image_attrs(cleaned)
+        return cleaned
+
+    def _emit_start(self, tag, attrs):
+        attrs = self._clean_attrs(tag, attrs)
+        if attrs is None:
+            return
+        parts = "".join(f' {name}="{html.escape(value, quote=True)}"' for name, value in attrs.items())
+        self.out.append(f"<{tag}{parts}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.skip_depth += 1
+        elif not self.skip_depth and tag in ALLOWED_TAGS:
+            self._emit_start(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.skip_depth and tag in ALLOWED_TAGS:
+            self._emit_start(tag, attrs)
+            if tag not in VOID_TAGS:
+                self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif not self.skip_depth and tag in self.open_tags:
+            # 중간에 안 닫힌 태그는 같이 닫아서 구조를 맞춤
+            while self.open_tags:
+                open_tag = self.open_tags.pop()
+                self.out.append(f"</{open_tag}>")
+                if open_tag == tag:
+                    break
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.out.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        self.out.extend(f"</{tag}>" for tag in reversed(self.open_tags))
+        self.open_tags = []
+        return "".join(self.out)
+
+
+def render_content(content):
+    """본문 HTML → 상세 화면에 그대로 출력할 정리된 HTML"""
+    if not content:
+        return ""
+    parser = _Sanitizer()
+    parser.feed(content)
+    return parser.result()
+
+
+def missing_variants(content):
+    """본문 이미지 중 중간 크기 변환본이 아직 없는 원본 (static 기준 상대 경로)"""
+    return sorted(
+        rel for rel in image_paths(content)
+        if not os.path.isfile(os.path.join(thumbnails.STATIC_ROOT, thumbnails.variant_rel(rel, "medium", "jpg")))
+    )
+
+
+def render_when_ready(app, post_id, content):
+    """글 저장 직후 호출: 변환본이 없는 이미지가 있으면 백그라운드에서 만든 뒤 그 글만 다시 렌더링
+
+    저장 요청 안에서는 Pillow 변환을 하지 않으므로 처음 저장된 rendered_content 는 원본 URL 을 가리킬 수 있음
+    """
+    rels = missing_variants(content)
+    if not rels or Image is None:
+        return
+
+    def rerender():
+        with app.app_context():
+            rerender_posts([post_id])
+
+    thumbnails.schedule_all(rels, then=rerender)
+
+
+def rerender_posts(post_ids):
+    """지정한 글들의 rendered_content 다시 만들기. 바뀐 글 수 반환"""
+    from sqlalchemy import select, update
+    from models import db, Post
+
+    rows = db.session.execute(
+        select(Post.id, Post.content, Post.rendered_content).where(Post.id.in_(list(post_ids)))
+    ).all()
+    now = datetime.now()
+    params = []
+    for row in rows:
+        rendered = render_content(row.content)
+        if rendered != row.rendered_content:
+            params.append({"id": row.id, "rendered_content": rendered, "updated_at": now})
+    if params:
+        db.session.execute(update(Post), params)
+        db.session.commit()
+    return len(params)
+
+
+def rerender_all(chunk_size=200):
+    """모든 글의 rendered_content 다시 만들기 (썸네일 일괄 생성 후 등). 바뀐 글 수 반환"""
+    from sqlalchemy import select, update
+    from models import db, Post  # models 가 이 모듈을 import 하므로 여기서
+
+    last_id = 0
+    changed = 0
+    while True:
+        rows = db.session.execute(
+            select(Post.id, Post.content, Post.rendered_content)
+            .where(Post.id > last_id).order_by(Post.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return changed
+        # 화면 결과만 바뀌는 것이라 목록 요약 / 검색 색인 훅은 필요 없음 → 직접 UPDATE
+        # (updated_at 은 갱신해서 상세 화면 ETag 가 바뀌도록)
+        now = datetime.now()
+        params = []
+        for row in rows:
+            rendered = render_content(row.content)
+            if rendered != row.rendered_content:
+                params.append({"id": row.id, "rendered_content": rendered, "updated_at": now})
+        if params:
+            db.session.execute(update(Post), params)
+            db.session.commit()
+        changed += len(params)
+        last_id = rows[-1].id
+        print(f"🧼 ~{last_id}번 글까지 확인, 바뀐 글 {changed}개")
+
+
+if __name__ == "__main__":
+    from app import app
+
+    with app.app_context():
+        print(f"✅ 본문 렌더링 완료! 바뀐 글 {rerender_all()}개")
@@ -0,0 +1,275 @@
+# 요청별 프로파일링 (느린 요청 로그 + 엔드포인트별 집계)
+#
+# 요청마다 다음을 잰다.
+# - 전체 처리 시간, 템플릿 렌더링 시간 (before_render_template / template_rendered 신호)
+# - SQL 문 수와 SQL 시간 (SQLAlchemy before/after_cursor_execute 이벤트)
+#
+# - PROFILE_SLOW_MS 를 넘은 요청은 slow.log 에 JSON 한 줄로 남김.
+#   같은 SQL 을 묶어 횟수와 시간을 함께 적으므로 N+1 을 바로 찾을 수 있음
+# - 엔드포인트별 합계는 워커 메모리에 모았다가 PROFILE_FLUSH_INTERVAL 마다 request_stat 테이블에 더함
+#   (조회수 버퍼와 같은 방식. gunicorn 워커 여러 개의 값이 한 테이블에 모임)
+# - 관리자 화면: /admin/profile
+#
+# 설정 (app.config, 괄호 안은 기본값):
+#   PROFILE_ENABLED         (True)
+#   PROFILE_SLOW_MS         (500)
+#   PROFILE_SLOW_LOG        (slow.log)
+#   PROFILE_MAX_STATEMENTS  (200, 요청 하나에서 기억할 SQL 문 수. 개수 / 시간은 전부 셈)
+#   PROFILE_FLUSH_INTERVAL  (30 초)
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import before_render_template, g, has_app_context, request, template_rendered
+from sqlalchemy import event, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from background import PeriodicFlusher
+from models import db, RequestStat
+
+SKIP_ENDPOINTS = {"static"}
+NO_ENDPOINT = "(없음)"  # 404 등 라우트에 걸리지 않은 요청
+SQL_PREVIEW_LENGTH = 500
+SLOW_LOG_TAIL_BYTES = 256 * 1024
+
+# request_stat 에 더하는 값 / 큰 값을 남기는 값
+SUM_FIELDS = ("request_count", "total_ms", "sql_count", "sql_ms", "render_ms", "slow_count", "error_count")
+MAX_FIELDS = ("max_ms", "max_sql_count")
+
+slow_logger = logging.getLogger("slow_requests")
+
+
+def _merge(pending, endpoint, stat):
+    current = pending.get(endpoint)
+    if current is None:
+        pending[endpoint] = dict(stat)
+        return
+    for key in SUM_FIELDS:
+        current[key] += stat[key]
+    for key in MAX_FIELDS:
+        current[key] = max(current[key], stat[key])
+
+
+class RequestProfile:
+    """요청 하나의 측정값 (g._profile)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.statements = []
+        self._render_started = []
+
+    def add_statement(self, statement, elapsed, limit):
+        self.sql_count += 1
+        self.sql_time += elapsed
+        if len(self.statements) < limit:
+            self.statements.append((statement, elapsed))
+
+    def grouped_statements(self):
+        """같은 SQL 을 묶어 [{sql, count, ms}, ...] 시간 많이 쓴 순"""
+        groups = {}
+        for statement, elapsed in self.statements:
+            count, total = groups.get(statement, (0, 0.0))
+            groups[statement] = (count + 1, total + elapsed)
+        return [
+            {"sql": sql[:SQL_PREVIEW_LENGTH], "count": count, "ms": round(total * 1000, 2)}
+            for sql, (count, total) in sorted(groups.items(), key=lambda kv: -kv[1][1])
+        ]
+
+
+class RequestProfiler:
+    def __init__(self, interval=30.0):
+        self.interval = interval
+        self.app = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.flush, "request-profiler", "요청 통계 반영 실패 (다음 주기에 다시 시도)")
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault("PROFILE_ENABLED", True)
+        app.config.setdefault("PROFILE_SLOW_MS", 500)
+        app.config.setdefault("PROFILE_SLOW_LOG", "slow.log")
+        app.config.setdefault("PROFILE_MAX_STATEMENTS", 200)
+        self.interval = app.config.setdefault("PROFILE_FLUSH_INTERVAL", self.interval)
+        if not app.config["PROFILE_ENABLED"]:
+            return
+
+        if not slow_logger.handlers:
+            handler = RotatingFileHandler(app.config["PROFILE_SLOW_LOG"], maxBytes=5 * 1024 * 1024,
+                                          backupCount=3, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            slow_logger.addHandler(handler)
+            slow_logger.setLevel(logging.INFO)
+            slow_logger.propagate = False
+
+        app.before_request(_start_profile)
+        app.after_request(self._finish_profile)
+        before_render_template.connect(_render_started, app)
+        template_rendered.connect(_render_finished, app)
+        self._flusher.init_app(app, self.interval)
+
+    def _finish_profile(self, response):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return response
+        wall = time.perf_counter() - profile.started
+        endpoint = request.endpoint or NO_ENDPOINT
+        slow = wall * 1000 >= self.app.config["PROFILE_SLOW_MS"]
+        self.record(endpoint, wall, profile, slow, response.status_code >= 500)
+        if slow:
+            slow_logger.info(json.dumps({
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "pid": os.getpid(),
+                "method": request.method,
+                "path": request.full_path.rstrip("?"),
+                "endpoint": endpoint,
+                "status": response.status_code,
+                "ms": round(wall * 1000, 1),
+                "sql_ms": round(profile.sql_time * 1000, 1),
+                "render_ms": round(profile.render_time * 1000, 1),
+                "queries": profile.sql_count,
+                "statements": profile.grouped_statements(),
+            }, ensure_ascii=False))
+        return response
+
+    def record(self, endpoint, wall, profile, slow, error):
+        stat = {
+            "request_count": 1,
+            "total_ms": wall * 1000,
+            "max_ms": wall * 1000,
+            "sql_count": profile.sql_count,
+            "max_sql_count": profile.sql_count,
+            "sql_ms": profile.sql_time * 1000,
+            "render_ms": profile.render_time * 1000,
+            "slow_count": int(slow),
+            "error_count": int(error),
+        }
+        with self._lock:
+            _merge(self._pending, endpoint, stat)
+        self._flusher.ensure_started()
+
+    def flush(self):
+        """모인 합계를 request_stat 에 더함. 반영한 엔드포인트 수 반환 (실패하면 되돌려 놓음)"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            now = datetime.now()
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as conn:
+                        stmt = insert(RequestStat)
+                        set_ = {key: getattr(RequestStat, key) + stmt.excluded[key] for key in SUM_FIELDS}
+                        set_.update({key: func.max(getattr(RequestStat, key), stmt.excluded[key]) for key in MAX_FIELDS})
+                        set_["updated_at"] = stmt.excluded.updated_at
+                        conn.execute(
+                            stmt.on_conflict_do_update(index_elements=["endpoint"], set_=set_),
+                            [dict(stat, endpoint=endpoint, updated_at=now) for endpoint, stat in pending.items()],
+                        )
+            except Exception:
+                with self._lock:
+                    for endpoint, stat in pending.items():
+                        _merge(self._pending, endpoint, stat)
+                raise
+            return len(pending)
+
+    def reset(self):
+        """이 워커에 모인 값과 request_stat 전체 삭제"""
+        with self._lock:
+            self._pending = {}
+        RequestStat.query.delete()
+        db.session.commit()
+
+
+profiler = RequestProfiler()
+
+
+def init_app(app):
+    profiler.init_app(app)
+
+
+def _start_profile():
+    if request.endpoint not in SKIP_ENDPOINTS:
+        g._profile = RequestProfile()
+
+
+def _current_profile():
+    # 백그라운드 스레드(조회수 반영 등)의 SQL 은 요청에 포함하지 않음
+    return g.get("_profile") if has_app_context() else None
+
+
+def _render_started(sender, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None:
+        profile._render_started.append(time.perf_counter())
+
+
+def _render_finished(sender, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None and profile._render_started:
+        profile.render_time += time.perf_counter() - profile._render_started.pop()
+
+
+# ✅ SQL 문마다 시간 측정 (요청 안에서 실행된 것만 기록)
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault("_profile_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("_profile_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    profile = _current_profile()
+    if profile is not None:
+        profile.add_statement(statement, elapsed, profiler.app.config["PROFILE_MAX_STATEMENTS"])
+
+
+# 🗂 관리자 화면용
+SORT_COLUMNS = {
+    "total": RequestStat.total_ms.desc(),
+    "avg": (RequestStat.total_ms / RequestStat.request_count).desc(),
+    "queries": (RequestStat.sql_count * 1.0 / RequestStat.request_count).desc(),
+    "max": RequestStat.max_ms.desc(),
+    "slow": RequestStat.slow_count.desc(),
+}
+
+
+def endpoint_stats(sort="total"):
+    """엔드포인트별 합계 (현재 워커의 미반영 값까지 먼저 반영)"""
+    profiler.flush()
+    return RequestStat.query.order_by(SORT_COLUMNS.get(sort, SORT_COLUMNS["total"])).all()
+
+
+def recent_slow_requests(limit=20):
+    """slow.log 끝부분에서 최근 느린 요청 limit 개 (최근 것부터)"""
+    path = profiler.app.config["PROFILE_SLOW_LOG"]
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - SLOW_LOG_TAIL_BYTES, 0))
+            lines = f.read().decode("utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    entries = deque(maxlen=limit)
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue  # 잘린 첫 줄 등
+    return list(reversed(entries))
@@ -0,0 +1,235 @@
+# 게시글 본문 일괄 치환 도구
+#
+# free_images.py / util.py / util_backup.py / utill2 처럼 이미지 경로를 고치던 일회성 스크립트를
+# 규칙 묶음(RULESETS)으로 모은 것.
+# - 글을 id 순으로 조금씩 읽어서 치환하고, 바뀐 글만 묶음 단위로 커밋 (DB 를 오래 잠그지 않음)
+# - --dry-run 으로 규칙별 적중 수만 확인
+# - 실제로 바꾼 글은 원래 내용을 rewrite_logs/*.jsonl 에 남겨 --undo 로 되돌릴 수 있음
+#
+# 사용 예:
+#   python rewrite_content.py --list
+#   python rewrite_content.py free_images --dry-run
+#   python rewrite_content.py unknown_to_restore --category 사진게시판
+#   python rewrite_content.py --undo rewrite_logs/20261018-120000-unknown_to_restore.jsonl
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlparse
+
+from sqlalchemy import select
+
+from models import db, Post
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rewrite_logs")
+CHUNK_SIZE = 200
+
+
+class Rule:
+    """정규식 치환 규칙. replacement 는 문자열 또는 (match, post) → 문자열 함수"""
+
+    def __init__(self, name, pattern, replacement, flags=0):
+        self.name = name
+        self.pattern = re.compile(pattern, flags)
+        self.replacement = replacement
+
+    def apply(self, content, post):
+        """(새 content, 적중 수). 치환 결과가 원래와 같은 매치는 세지 않음 (--dry-run 이 실제 변경만 보고)"""
+        hits = 0
+
+        def replace(match):
+            nonlocal hits
+            if callable(self.replacement):
+                new = self.replacement(match, post)
+            else:
+                new = match.expand(self.replacement)
+            hits += new != match.group(0)
+            return new
+
+        return self.pattern.sub(replace, content), hits
+
+
+class FunctionRule:
+    """정규식으로 표현하기 어려운 규칙. func(content, post) → 새 content"""
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+    def apply(self, content, post):
+        new_content = self.func(content, post)
+        return new_content, int(new_content != content)
+
+
+# 🖼 자유게시판 / 이야기게시판 이미지 경로를 업로드 폴더로 (구 free_images.py)
+def _upload_folder_src(match, post):
+    quote, src = match.group(1), match.group(2)
+    fname = os.path.basename(urlparse(src).path)
+    ext = os.path.splitext(fname)[1].lower()
+    if ext not in (".jpg", ".jpeg", ".png", ".gif", ".webp"):
+        return match.group(0)
+
+    category = (post.category or "").strip()
+    if category == "자유게시판":
+        return f'src={quote}/static/uploads/freeboard/{fname}{quote}'
+    if category == "이야기게시판":
+        return f'src={quote}/static/uploads/storyboard/{fname}{quote}'
+    return f'src={quote}/static/uploads/unknown/{fname}{quote}'
+
+
+RULESETS = {
+    "free_images": [
+        # 여는 따옴표와 같은 닫는 따옴표까지 매치해서 그대로 다시 씀
+        Rule("upload_folder_src", r'src=(["\'])([^"\'>]+)\1', _upload_folder_src),
+    ],
+    # 구 util.py: uploads/unknown → restore_images
+    "unknown_to_restore": [
+        Rule("unknown_to_restore", r'src=(["\']|&quot;)/static/uploads/unknown/([^"\'<>&]+)\1',
+             r'src=\1/static/restore_images/\2\1'),
+    ],
+    # 구 utill2: 위와 같지만 따옴표(&quot; 포함) 형태 유지
+    "unknown_to_restore_keep_quote": [
+        Rule("unknown_to_restore_keep_quote", r'(src=(&quot;|"))/static/uploads/unknown/([^"&]+)',
+             r'\1/static/restore_images/\3'),
+    ],
+    # 구 util_backup.py: 윈도우 절대 경로 → /static/restore_images
+    "absolute_restore_path": [
+        Rule("absolute_restore_path", r'(src=(&quot;|\"))D:/myboard/parsing/static/restore_images/([^"&]+)',
+             r'\1/static/restore_images/\3'),
+    ],
+}
+
+
+def _sha1(value):
+    return hashlib.sha1((value or "").encode("utf-8")).hexdigest()
+
+
+def _iter_chunks(category=None, chunk_size=CHUNK_SIZE):
+    """(id, category, content) 를 id 순으로 chunk_size 개씩"""
+    last_id = 0
+    while True:
+        query = select(Post.id, Post.category, Post.content).where(Post.id > last_id)
+        if category:
+            query = query.where(Post.category == category)
+        rows = db.session.execute(query.order_by(Post.id).limit(chunk_size)).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _save_contents(new_contents):
+    """ORM 으로 저장해서 목록 요약 / 검색 색인 훅이 같이 돌도록 함"""
+    for post in Post.query.filter(Post.id.in_(list(new_contents))):
+        post.content = new_contents[post.id]
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def rewrite_posts(rules, dry_run=False, category=None, chunk_size=CHUNK_SIZE, log_name="rewrite"):
+    """규칙을 차례로 적용. (규칙별 적중 수, 바뀐 글 수, 되돌리기 로그 경로) 반환"""
+    hits = Counter()
+    changed = 0
+    log_path = None
+    log_file = None
+    if not dry_run:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        log_path = os.path.join(LOG_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{log_name}.jsonl")
+        log_file = open(log_path, "a", encoding="utf-8")
+
+    try:
+        for rows in _iter_chunks(category, chunk_size):
+            new_contents = {}
+            for row in rows:
+                content = row.content or ""
+                for rule in rules:
+                    content, n = rule.apply(content, row)
+                    hits[rule.name] += n
+                if content != (row.content or ""):
+                    new_contents[row.id] = content
+                    if log_file:
+                        log_file.write(json.dumps(
+                            {"id": row.id, "before": row.content, "after_sha1": _sha1(content)},
+                            ensure_ascii=False,
+                        ) + "\n")
+            changed += len(new_contents)
+
+            if new_contents and not dry_run:
+                # 되돌리기 정보를 먼저 디스크에 남긴 뒤 커밋
+                log_file.flush()
+                os.fsync(log_file.fileno())
+                _save_contents(new_contents)
+            print(f"🔧 ~{rows[-1].id}번 글까지 확인, 누적 변경 {changed}개")
+    finally:
+        if log_file:
+            log_file.close()
+
+    if log_path and not changed:
+        os.remove(log_path)
+        log_path = None
+    return hits, changed, log_path
+
+
+def undo(log_path, chunk_size=CHUNK_SIZE):
+    """되돌리기 로그대로 원래 내용 복원. 그 뒤에 다시 수정된 글은 건너뜀"""
+    restored = conflicts = 0
+    with open(log_path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    for i in range(0, len(entries), chunk_size):
+        chunk = {e["id"]: e for e in entries[i:i + chunk_size]}
+        current = dict(db.session.execute(
+            select(Post.id, Post.content).where(Post.id.in_(list(chunk)))
+        ).all())
+        to_restore = {}
+        for post_id, entry in chunk.items():
+            if post_id in current and _sha1(current[post_id]) == entry["after_sha1"]:
+                to_restore[post_id] = entry["before"]
+            else:
+                conflicts += 1
+        if to_restore:
+            _save_contents(to_restore)
+        restored += len(to_restore)
+
+    return restored, conflicts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 본문 일괄 치환")
+    parser.add_argument("ruleset", nargs="?", choices=sorted(RULESETS), help="적용할 규칙 묶음")
+    parser.add_argument("--dry-run", action="store_true", help="DB 는 건드리지 않고 적중 수만 출력")
+    parser.add_argument("--category", help="이 게시판 글만")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--undo", metavar="LOG", help="되돌리기 로그(.jsonl)로 복원")
+    parser.add_argument("--list", action="store_true", help="규칙 묶음 목록")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, rules in sorted(RULESETS.items()):
+            print(f"{name}: {', '.join(r.name for r in rules)}")
+        raise SystemExit
+
+    from app import app
+
+    with app.app_context():
+        if args.undo:
+            restored, conflicts = undo(args.undo, args.chunk_size)
+            print(f"↩️ 복원 완료! 복원 {restored}개, 이후 수정돼서 건너뜀 {conflicts}개")
+        elif args.ruleset:
+            hits, changed, log_path = rewrite_posts(
+                RULESETS[args.ruleset], dry_run=args.dry_run, category=args.category,
+                chunk_size=args.chunk_size, log_name=args.ruleset,
+            )
+            for name, count in hits.items():
+                print(f"   {name}: {count}건")
+            if args.dry_run:
+                print(f"🧪 [dry-run] 바뀔 게시글 수: {changed}")
+            else:
+                print(f"✅ 본문 치환 완료! 수정된 게시글 수: {changed}")
+                print(f"   되돌리기: python rewrite_content.py --undo {log_path}")
+        else:
+            parser.error("규칙 묶음 이름, --undo 또는 --list 가 필요합니다.")
@@ -1,11 +1,20 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, flash
-from models import db, Post, Comment, Category
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, flash, abort, current_app
+from models import db, Post, Comment
+import admin_stats
+import archive
+import category_cache
+import comments
+import deletion
+import http_cache
+import post_html
+from search import search_posts
+from pagination import paginate_category
+import thumbnails
+import view_counter
+from uploads import save_upload, UploadError
 from datetime import datetime
-from werkzeug.utils import secure_filename
-import os
+from sqlalchemy import select
 from functools import wraps
-import html
-import re
 from base64 import b64decode
 
 # 블루프린트 정의
@@ -21,13 +30,6 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# 첫 번째 이미지 src 추출 함수
-def extract_first_img_src(html_content):
-    if not html_content:
-        return None
-    match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', html_content)
-    return match.group(1) if match else None
-
 # 홈 리디렉션: / → 자유게시판
 @post_bp.route("/")
 def home():
@@ -39,34 +41,32 @@ def home():
 @login_required
 def index(category="자유게시판", page=1):
     q = request.args.get("q", "")
+    cursor = request.args.get("cursor", type=int)
     per_page = 12
-    query = Post.query.filter_by(category=category)
 
-    if q:
-        search = f"%{q}%"
-        query = query.filter(
-            db.or_(
-                Post.title.like(search),
-                Post.author.like(search)
-            )
-        )
+    # 🏷 게시판 버전이 그대로면 템플릿 없이 304
+    cached = http_cache.not_modified("index", category, page, cursor, q, per_page,
+                                     *http_cache.category_versions(category))
+    if cached:
+        return cached
 
-    posts = query.order_by(Post.id.desc()).paginate(page=page, per_page=per_page)
+    if q:
+        # 🔍 FTS5 전문 검색 (제목/작성자/본문/댓글, 순위순 + 하이라이트)
+        posts = search_posts(category, q, page=page, per_page=per_page)
+    else:
+        # 📑 (category, id) 키셋 페이지네이션 (OFFSET / 매번 COUNT 없음)
+        posts = paginate_category(category, page=page, per_page=per_page, cursor=cursor)
+        if posts is None:
+            abort(404)
 
     # 🔍 범위 계산 (Jinja에서 max/min 못 쓰니까 여기서 처리!)
     start_page = max(page - 5, 1)
     end_page = min(page + 4, posts.pages)  # 총 10개까지 표시되도록
 
-    category_objects = {c.name: c for c in Category.query.all()}
-    category_type = category_objects.get(category).type if category in category_objects else "text"
-
-    category_obj = category_objects.get(category)
-    is_gallery_category = category_obj.type == "photo" if category_obj else False
-
-    for post in posts.items:
-        decoded_content = html.unescape(post.content or "")
-        match = re.search(r'<img[^>]+src=["\']?([^"\'>]+)["\']?', decoded_content)
-        post.first_img_src = match.group(1) if match else None
+    # 🗂 게시판 정보는 프로세스 캐시에서 (매 요청 전체 조회 없음)
+    category_objects = category_cache.categories_by_name()
+    category_type = category_cache.category_type(category)
+    is_gallery_category = category_cache.is_gallery(category)
 
     return render_template(
         "index.html",
@@ -81,27 +81,121 @@ def index(category="자유게시판", page=1):
     )
 
 
+# 📅 월별 보기: 연도 / 월 목록 (post_archive_month 요약만 읽음)
+@post_bp.route("/<category>/archive")
+@login_required
+def archive_index(category):
+    cached = http_cache.not_modified("archive", category, *http_cache.category_versions(category))
+    if cached:
+        return cached
+    return render_template(
+        "archive.html",
+        category=category,
+        years=archive.months(category),
+        is_gallery_category=category_cache.is_gallery(category),
+    )
+
+# 📅 월별 보기: 한 달 글 목록 (그 달 첫 ~ 마지막 id 범위만, ?cursor=<id> 로 다음 페이지)
+@post_bp.route("/<category>/archive/<int:year>/<int:month>")
+@login_required
+def archive_month(category, year, month):
+    cursor = request.args.get("cursor", type=int)
+    cached = http_cache.not_modified("archive_month", category, year, month, cursor,
+                                     *http_cache.category_versions(category))
+    if cached:
+        return cached
+    entry = archive.get_month(category, year, month)
+    if entry is None:
+        abort(404)
+    posts, next_cursor = archive.month_posts(entry, cursor)
+    return render_template(
+        "archive.html",
+        category=category,
+        entry=entry,
+        posts=posts,
+        next_cursor=next_cursor,
+        is_gallery_category=category_cache.is_gallery(category),
+    )
+
+
 # 게시글 상세 + 댓글 등록
 @post_bp.route("/<int:post_id>", methods=["GET", "POST"])
 @login_required
 def detail(post_id):
-    post = Post.query.get_or_404(post_id)
+    if request.method == "POST":
+        return add_comment(post_id)
 
-    # 갤러리 게시판 확인
-    category_obj = Category.query.filter_by(name=post.category).first()
-    is_gallery_category = category_obj.type == "photo" if category_obj else False
+    # 👀 조회수: 메모리에 모았다가 주기적으로 한꺼번에 반영
+    updated_at = db.session.execute(select(Post.updated_at).where(Post.id == post_id)).first()
+    if updated_at is None:
+        abort(404)
+    view_counter.record_view(post_id)
 
+    # 🏷 글 / 댓글이 그대로면 템플릿 없이 304
+    order = comments.parse_order(request.args.get("order"))
+    cached = http_cache.not_modified("detail", post_id, order, updated_at[0], category_cache.version())
+    if cached:
+        return cached
 
-    if request.method == "POST":
-        author = request.form["author"]
-        content = request.form["content"]
-        created_at = datetime.now().strftime("%Y-%m-%d %H:%M")
-        comment = Comment(author=author, content=content, created_at=created_at, post=post)
-        db.session.add(comment)
-        db.session.commit()
+    post = db.get_or_404(Post, post_id)
+
+    # 갤러리 게시판 확인
+    is_gallery_category = category_cache.is_gallery(post.category)
+
+    # 💬 댓글은 첫 페이지만 (나머지는 "더 보기" → post.comment_list), 댓글이 없으면 조회 생략
+    if post.comment_count:
+        comment_page = comments.comment_page(post_id, order)
+    else:
+        comment_page = comments.CommentPage([], order, None)
+    return render_template("detail.html", post=post, is_gallery_category=is_gallery_category,
+                           comments=comment_page,
+                           read_count=view_counter.read_count(post))
+
+
+# 💬 댓글 등록: fetch 요청이면 새 댓글 HTML 조각만, 아니면 상세 화면으로 리디렉션
+def add_comment(post_id):
+    if db.session.execute(select(Post.id).where(Post.id == post_id)).first() is None:
+        abort(404)
+    fragment = request.headers.get("X-Requested-With") == "XMLHttpRequest"
+    author = request.form.get("author", "").strip()
+    content = request.form.get("content", "").strip()
+    if not author or not content:
+        if fragment:
+            return jsonify({"error": "작성자와 내용을 입력하세요."}), 400
+        flash("작성자와 내용을 입력하세요.")
         return redirect(url_for("post.detail", post_id=post_id))
 
-    return render_template("detail.html", post=post, is_gallery_category=is_gallery_category)
+    comment = Comment(author=author, content=content, created_at=datetime.now(), post_id=post_id)
+    db.session.add(comment)
+    db.session.commit()
+    if fragment:
+        # 상세 화면 댓글 수 갱신용
+        count = db.session.execute(select(Post.comment_count).where(Post.id == post_id)).scalar()
+        return render_template("comment_items.html", comments=[comment]), 201, {"X-Comment-Count": str(count)}
+    return redirect(url_for("post.detail", post_id=post_id))
+
+
+# 💬 댓글 다음 페이지 (JSON: 댓글 HTML + 다음 페이지 주소)
+@post_bp.route("/<int:post_id>/comments")
+@login_required
+def comment_list(post_id):
+    updated_at = db.session.execute(select(Post.updated_at).where(Post.id == post_id)).first()
+    if updated_at is None:
+        abort(404)
+    order = comments.parse_order(request.args.get("order"))
+    cursor = request.args.get("cursor", type=int)
+    cached = http_cache.not_modified("comments", post_id, order, cursor, updated_at[0])
+    if cached:
+        return cached
+
+    page = comments.comment_page(post_id, order, cursor)
+    next_url = None
+    if page.next_cursor is not None:
+        next_url = url_for("post.comment_list", post_id=post_id, order=order, cursor=page.next_cursor)
+    return jsonify({
+        "html": render_template("comment_items.html", comments=page.items),
+        "next": next_url,
+    })
 
 # 새 글 작성
 @post_bp.route("/write", methods=["GET", "POST"])
@@ -109,9 +203,8 @@ def detail(post_id):
 def write():
     category = request.args.get("category", "자유게시판")
 
-    # ✅ 추가: category 객체 조회 + 타입 확인
-    category_obj = Category.query.filter_by(name=category).first()
-    is_gallery_category = category_obj.type == "photo" if category_obj else False
+    # ✅ 추가: 게시판 타입 확인
+    is_gallery_category = category_cache.is_gallery(category)
 
     if request.method == "POST":
         # 폼 데이터 확인
@@ -128,26 +221,28 @@ def write():
         # 이미지 업로드 처리
         image = request.files.get("image")
         if image and image.filename:
-            filename = secure_filename(image.filename)
-            image_path = os.path.join("static", "uploads", filename)
             try:
-                image.save(image_path)
-                content += f'<br><img src="/{image_path}" alt="첨부이미지">'
-            except Exception as e:
+                attachment = save_upload(image)  # 📦 내용 해시 기준 저장 (중복 업로드는 기존 파일 재사용)
+            except (UploadError, OSError) as e:
                 flash(f"이미지 업로드에 실패했습니다: {str(e)}", "error")
                 return render_template("write.html", category=category, is_gallery_category=is_gallery_category)
+            content += f'<br><img src="{attachment.url}" alt="첨부이미지">'
 
         # DB 저장
         post = Post(
             title=title,
             author=author,
             content=content,
-            date=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            date=datetime.now(),
             read_count=0,
             category=category
         )
         db.session.add(post)
+        db.session.flush()
+        post_id = post.id
         db.session.commit()
+        # 🖼 썸네일/중간 크기 변환본은 백그라운드에서 만들고, 다 되면 본문 HTML 을 다시 렌더링
+        post_html.render_when_ready(current_app._get_current_object(), post_id, content)
 
         flash("새 글이 성공적으로 등록되었습니다.", "success")
         return redirect(url_for("post.index", category=category, page=1))
@@ -162,8 +257,7 @@ def edit(post_id):
     post = Post.query.get_or_404(post_id)
 
     # 카테고리 정보 확인
-    category_obj = Category.query.filter_by(name=post.category).first()
-    is_gallery_category = category_obj.type == "photo" if category_obj else False
+    is_gallery_category = category_cache.is_gallery(post.category)
 
     if request.method == "POST":
         # 비밀번호 확인
@@ -177,16 +271,17 @@ def edit(post_id):
             # 이미지 업로드 처리
             image = request.files.get("image")
             if image and image.filename:
-                filename = secure_filename(image.filename)
-                image_path = os.path.join("static", "uploads", filename)
                 try:
-                    image.save(image_path)
-                    post.content += f'<br><img src="/{image_path}" alt="첨부이미지">'
-                except Exception as e:
+                    attachment = save_upload(image)
+                except (UploadError, OSError) as e:
+                    db.session.rollback()
                     flash(f"이미지 업로드 실패: {str(e)}", "error")
                     return redirect(request.url)
+                post.content += f'<br><img src="{attachment.url}" alt="첨부이미지">'
 
+            content = post.content
             db.session.commit()
+            post_html.render_when_ready(current_app._get_current_object(), post_id, content)
             flash("글이 수정되었습니다.", "success")
             return redirect(url_for("post.detail", post_id=post.id))
         else:
@@ -239,21 +334,29 @@ def delete_comment(comment_id):
 @post_bp.route("/admin")
 @login_required
 def admin():
-    posts = Post.query.order_by(Post.id.desc()).all()
-    comments = Comment.query.order_by(Comment.id.desc()).all()
-    return render_template("admin.html", posts=posts, comments=comments)
+    # 전체를 읽지 않고 글 / 댓글 각각 id 기준으로 한 페이지씩 (admin_stats.MAX_LIMIT 행까지)
+    category = request.args.get("category") or None
+    limit = admin_stats.clamp_limit(request.args.get("limit"))
+    posts = admin_stats.post_page(category, request.args.get("before"), limit)
+    comments = admin_stats.comment_page(category, request.args.get("comments_before"), limit)
+    return render_template(
+        "admin.html",
+        posts=posts,
+        comments=comments,
+        category=category,
+        categories=category_cache.all_categories(),
+        limit=limit,
+    )
 
 # 배치 삭제
 @post_bp.route("/admin/delete", methods=["POST"])
 @login_required
 def bulk_delete():
-    ids = request.form.getlist("post_ids")
-    for post_id in ids:
-        post = Post.query.get(post_id)
-        if post:
-            db.session.delete(post)
+    # 글 / 댓글 / 이미지 참조 / 색인을 청크마다 몇 개의 SQL 로 삭제
+    deleted = deletion.delete_posts(db.session.connection(), request.form.getlist("post_ids"))
     db.session.commit()
-    return redirect(url_for("post.admin"))
+    flash(f"게시글 {deleted}개를 삭제했습니다.", "success")
+    return redirect(request.referrer or url_for("post.admin"))
 
 # 이미지 업로드
 @post_bp.route('/upload-image', methods=['POST'])
@@ -264,26 +367,23 @@ def upload_image():
     if not file:
         return jsonify({"error": {"message": "파일이 첨부되지 않았습니다"}}), 400
 
-    # 파일명 안전하게 처리
-    filename = secure_filename(file.filename)
-    save_path = os.path.join('static', 'uploads', filename)
-    
     try:
-        file.save(save_path)
-        url = url_for('static', filename=f'uploads/{filename}', _external=False)
-        return jsonify({ "url": url })  # ✅ 반드시 이 형태여야 CKEditor가 성공 인식!
-
-    except Exception as e:
+        attachment = save_upload(file)  # 📦 내용 해시 기준 저장 (같은 파일은 한 번만)
+        db.session.commit()
+    except UploadError as e:
+        return jsonify({"error": {"message": str(e)}}), 400
+    except OSError as e:
         return jsonify({"error": {"message": str(e)}}), 500
 
+    thumbnails.schedule(attachment.path)  # 🖼 썸네일/중간 크기 변환본 (백그라운드)
+    url = url_for('static', filename=attachment.path, _external=False)
+    return jsonify({ "url": url })  # ✅ 반드시 이 형태여야 CKEditor가 성공 인식!
+
 # 댓글 배치 삭제
 @post_bp.route("/comment/bulk-delete", methods=["POST"])
 @login_required
 def bulk_delete_comment():
-    ids = request.form.getlist("comment_ids")
-    for comment_id in ids:
-        comment = Comment.query.get(comment_id)
-        if comment:
-            db.session.delete(comment)
+    deleted = deletion.delete_comments(db.session.connection(), request.form.getlist("comment_ids"))
     db.session.commit()
-    return redirect(url_for("post.admin"))
+    flash(f"댓글 {deleted}개를 삭제했습니다.", "success")
+    return redirect(request.referrer or url_for("post.admin"))
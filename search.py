@@ -0,0 +1,263 @@
+# 게시판 전문 검색 (SQLite FTS5 + trigram 토크나이저)
+#
+# - post_fts 가상 테이블에 제목 / 작성자 / 본문(HTML 제거) / 댓글을 색인
+# - 게시글·댓글이 flush 될 때마다 해당 글만 자동으로 다시 색인
+# - 테이블 생성 / 기존 글 색인은 마이그레이션(b4e9d1f3a208_post_fts)에서. 전체 재색인: `python search.py`
+# - post_fts 가 없으면 (FTS5 미지원 SQLite 등) LIKE 검색으로 대체하고 색인 갱신은 건너뜀
+
+import html
+import math
+import re
+
+from sqlalchemy import bindparam, event, inspect, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, defer
+
+from html_utils import strip_html
+from models import db, Post, Comment
+
+FTS_TABLE = "post_fts"
+FTS_COLUMNS = ("title", "author", "body", "comments")
+MIN_TERM_LEN = 3                         # trigram 은 3글자 이상부터 인덱스 검색 가능
+RANK_WEIGHTS = "10.0, 5.0, 1.0, 0.5"     # 제목, 작성자, 본문, 댓글 가중치
+MAX_TERMS = 8
+SNIPPET_CHARS = 60
+CHUNK_SIZE = 500
+
+_INDEXED_FIELDS = ("title", "author", "content", "category")
+
+_fts_ready = {}  # 엔진 URL → post_fts 테이블 존재 여부 (프로세스 단위 캐시)
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, author, body, comments, category UNINDEXED, "
+    "tokenize='trigram')"
+)
+
+
+def search_available(conn):
+    """post_fts 테이블이 있는지 (마이그레이션 전이거나 FTS5 미지원이면 False)"""
+    key = str(conn.engine.url)
+    if key not in _fts_ready:
+        _fts_ready[key] = conn.dialect.name == "sqlite" and conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first() is not None
+    return _fts_ready[key]
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _documents(conn, post_ids):
+    comments = {}
+    rows = conn.execute(
+        select(Comment.post_id, Comment.author, Comment.content)
+        .where(Comment.post_id.in_(post_ids))
+        .order_by(Comment.id)
+    )
+    for post_id, author, content in rows:
+        comments.setdefault(post_id, []).append(f"{author or ''} {content or ''}")
+
+    posts = conn.execute(
+        select(Post.id, Post.title, Post.author, Post.content, Post.category)
+        .where(Post.id.in_(post_ids))
+    )
+    for row in posts:
+        yield {
+            "rowid": row.id,
+            "title": row.title or "",
+            "author": row.author or "",
+            "body": strip_html(row.content),
+            "comments": " ".join(comments.get(row.id, [])),
+            "category": row.category,
+        }
+
+
+def reindex_posts(conn, post_ids):
+    """주어진 게시글들을 색인에서 지우고 현재 DB 내용으로 다시 색인"""
+    ids = sorted({i for i in post_ids if i is not None})
+    if not ids or not search_available(conn):
+        return
+
+    delete_stmt = text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    insert_stmt = text(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, author, body, comments, category) "
+        "VALUES (:rowid, :title, :author, :body, :comments, :category)"
+    )
+    for chunk in _chunks(ids, CHUNK_SIZE):
+        conn.execute(delete_stmt, {"ids": chunk})
+        docs = list(_documents(conn, chunk))
+        if docs:
+            conn.execute(insert_stmt, docs)
+
+
+def rebuild_index():
+    """색인 테이블을 새로 만들고 모든 게시글을 다시 색인"""
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        _fts_ready.pop(str(conn.engine.url), None)
+        try:
+            conn.exec_driver_sql(CREATE_TABLE_SQL)
+        except OperationalError:
+            print("⚠️ 이 SQLite 는 FTS5 trigram 을 지원하지 않습니다.")
+            return 0
+
+        ids = conn.execute(select(Post.id).order_by(Post.id)).scalars().all()
+        for done, chunk in enumerate(_chunks(ids, CHUNK_SIZE), start=1):
+            reindex_posts(conn, chunk)
+            print(f"🔍 {min(done * CHUNK_SIZE, len(ids))}/{len(ids)} 색인 중…")
+    return len(ids)
+
+
+# ✅ 게시글·댓글 변경 시 자동 재색인 (라우트, 임포터 공통)
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, flush_context):
+    post_ids = set()
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, Post):
+            if obj in session.dirty and not _changed(obj, _INDEXED_FIELDS):
+                continue
+            post_ids.add(obj.id)
+        elif isinstance(obj, Comment):
+            post_ids.add(obj.post_id)
+    if post_ids:
+        reindex_posts(session.connection(), post_ids)
+
+
+# 🔎 검색
+class SearchPage:
+    """검색 결과 한 페이지 (Flask-SQLAlchemy Pagination 과 같은 속성 제공)"""
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+
+    @property
+    def pages(self):
+        return math.ceil(self.total / self.per_page) if self.total else 0
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        return self.page < self.pages
+
+
+def _split_terms(q):
+    return [t for t in q.split() if t][:MAX_TERMS]
+
+
+def _fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _highlight(value, terms):
+    """terms 를 <mark> 로 감싼 이스케이프된 HTML 반환"""
+    escaped = html.escape(value or "")
+    if not terms:
+        return escaped
+    pattern = re.compile("|".join(re.escape(html.escape(t)) for t in terms), re.IGNORECASE)
+    return pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", escaped)
+
+
+def _snippet(texts, terms):
+    """검색어가 처음 나오는 곳 주변을 잘라 하이라이트 (본문 → 댓글 순으로 찾음)"""
+    for body in texts:
+        lowered = (body or "").lower()
+        hits = [i for i in (lowered.find(t.lower()) for t in terms) if i >= 0]
+        if hits:
+            break
+    else:
+        body, hits = texts[0] or "", []
+    if not body:
+        return ""
+    start = max(min(hits) - SNIPPET_CHARS // 3, 0) if hits else 0
+    piece = body[start:start + SNIPPET_CHARS]
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + SNIPPET_CHARS < len(body) else ""
+    return prefix + _highlight(piece, terms) + suffix
+
+
+def _like_search(category, terms, page, per_page):
+    query = Post.query.options(defer(Post.content, raiseload=True)).filter_by(category=category)
+    for term in terms:
+        search = f"%{term}%"
+        query = query.filter(
+            db.or_(
+                Post.title.like(search),
+                Post.author.like(search),
+                Post.content.like(search),
+            )
+        )
+    return query.order_by(Post.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
+
+
+def search_posts(category, q, page=1, per_page=12):
+    """카테고리 안에서 q 로 검색해 순위순 SearchPage 반환"""
+    terms = _split_terms(q)
+    conn = db.session.connection()
+    if not terms or not search_available(conn):
+        return _like_search(category, terms, page, per_page)
+
+    long_terms = [t for t in terms if len(t) >= MIN_TERM_LEN]
+    short_terms = [t for t in terms if len(t) < MIN_TERM_LEN]
+
+    where = ["category = :category"]
+    params = {"category": category}
+    if long_terms:
+        where.append(f"{FTS_TABLE} MATCH :match")
+        params["match"] = " AND ".join(_fts_phrase(t) for t in long_terms)
+    for i, term in enumerate(short_terms):
+        # 3글자 미만은 trigram 인덱스를 못 쓰므로 색인 테이블을 직접 훑음
+        params[f"short{i}"] = term.lower()
+        where.append("(" + " OR ".join(
+            f"instr(lower({col}), :short{i}) > 0" for col in FTS_COLUMNS
+        ) + ")")
+    where_sql = " AND ".join(where)
+    order_sql = f"bm25({FTS_TABLE}, {RANK_WEIGHTS}), rowid DESC" if long_terms else "rowid DESC"
+
+    total = conn.execute(
+        text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {where_sql}"), params
+    ).scalar()
+    rows = conn.execute(
+        text(
+            f"SELECT rowid, title, body, comments FROM {FTS_TABLE} WHERE {where_sql} "
+            f"ORDER BY {order_sql} LIMIT :limit OFFSET :offset"
+        ),
+        dict(params, limit=per_page, offset=(page - 1) * per_page),
+    ).all()
+
+    posts = {
+        p.id: p for p in Post.query.options(defer(Post.content, raiseload=True))
+        .filter(Post.id.in_([r.rowid for r in rows]))
+    }
+    items = []
+    for row in rows:
+        post = posts.get(row.rowid)
+        if post is None:
+            continue
+        post.title_html = _highlight(row.title, terms)
+        post.snippet_html = _snippet((row.body, row.comments), terms)
+        items.append(post)
+
+    return SearchPage(items, page, per_page, total)
+
+
+if __name__ == "__main__":
+    from app import app
+    with app.app_context():
+        count = rebuild_index()
+        print(f"✅ 검색 색인 재구축 완료! 색인된 게시글 수: {count}")
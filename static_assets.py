@@ -0,0 +1,104 @@
+# 정적 파일 / 배경음악 전송
+#
+# - url_for('static', ...) 에 내용 해시(?v=...)를 자동으로 붙이고, 해시가 맞는 요청은
+#   Cache-Control: immutable 로 1년 캐시 (파일이 바뀌면 URL 이 바뀜)
+# - 이름 자체가 내용 해시인 파일(uploads/ab/<sha256>.jpg 등)도 immutable
+# - 배경음악(music/)은 /music/<파일> 로 제공. Range 요청(206)을 지원해 탐색 시 전체를 받지 않음
+# - STATIC_SENDFILE=x-sendfile | x-accel 이면 실제 전송은 앞단 서버(Apache / nginx)에 넘김
+#   (gunicorn 워커가 수 MB 음악 파일을 직접 밀어내지 않도록)
+#
+# nginx 예 (STATIC_SENDFILE=x-accel, STATIC_ACCEL_PREFIX=/_files/):
+#   location /_files/static/ { internal; alias /srv/board/static/; }
+#   location /_files/music/  { internal; alias /srv/board/music/; }
+
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from urllib.parse import quote
+
+from flask import Response, abort, request, send_from_directory
+from werkzeug.security import safe_join
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MUSIC_DIR = os.path.join(BASE_DIR, "music")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+MUTABLE_MAX_AGE = 3600      # 해시 없는 정적 파일 (이름이 같아도 내용이 바뀔 수 있음)
+MUSIC_MAX_AGE = 86400
+
+# 파일 이름에 내용 해시가 들어 있는 경로 (업로드 / 수집 이미지 / 변환본)
+_CONTENT_ADDRESSED = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+(\.[a-z0-9]+)?$")
+
+_fingerprints = {}  # 절대 경로 → (mtime, size, 해시)
+_lock = threading.Lock()
+
+
+def fingerprint(path):
+    """파일 내용 해시 앞 10자리 (수정 시각 / 크기가 그대로면 다시 읽지 않음)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()[:10]
+    with _lock:
+        _fingerprints[path] = (stat.st_mtime, stat.st_size, value)
+    return value
+
+
+def _send(app, directory, name, filename, max_age, immutable):
+    """파일 응답. 앞단 서버 위임 설정이면 헤더만 보내고 본문은 앞단이 전송"""
+    mode = app.config.get("STATIC_SENDFILE")
+    if mode == "x-accel":
+        path = safe_join(directory, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+        prefix = app.config.get("STATIC_ACCEL_PREFIX", "/_files/")
+        response.headers["X-Accel-Redirect"] = quote(f"{prefix}{name}/{filename}")
+    else:
+        # x-sendfile 은 Flask 의 USE_X_SENDFILE 로 처리, 아니면 직접 전송 (Range / 조건부 요청 지원)
+        response = send_from_directory(directory, filename, max_age=max_age, conditional=True)
+    if immutable:
+        response.headers["Cache-Control"] = IMMUTABLE
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response
+
+
+def init_app(app):
+    app.config.setdefault("STATIC_SENDFILE", os.environ.get("STATIC_SENDFILE", ""))
+    app.config.setdefault("STATIC_ACCEL_PREFIX", os.environ.get("STATIC_ACCEL_PREFIX", "/_files/"))
+    if app.config["STATIC_SENDFILE"] == "x-sendfile":
+        app.config["USE_X_SENDFILE"] = True
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint == "static" and "filename" in values and "v" not in values:
+            path = safe_join(app.static_folder, values["filename"])
+            version = fingerprint(path) if path else None
+            if version:
+                values["v"] = version
+
+    def serve_static(filename):
+        path = safe_join(app.static_folder, filename)
+        version = request.args.get("v")
+        immutable = bool(_CONTENT_ADDRESSED.search(filename)) or (
+            version is not None and path is not None and version == fingerprint(path)
+        )
+        return _send(app, app.static_folder, "static", filename, MUTABLE_MAX_AGE, immutable)
+
+    app.view_functions["static"] = serve_static
+
+    @app.route("/music/<path:filename>")
+    def music(filename):
+        return _send(app, MUSIC_DIR, "music", filename, MUSIC_MAX_AGE, immutable=False)
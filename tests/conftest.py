@@ -0,0 +1,158 @@
+# 테스트 공통 준비: 임시 SQLite DB + 고정 데이터 + 관리자 로그인 클라이언트 + SQL 예산 측정
+#
+# app 을 불러오기 전에 환경 변수로 DB / 지표 폴더를 임시 경로로 돌려 운영 파일을 건드리지 않는다.
+
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_TMP = tempfile.mkdtemp(prefix="board-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_TMP, "test.db")
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(_TMP, "prometheus")
+os.environ["SQLITE_MAINTENANCE_INTERVAL"] = "0"
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app import app as flask_app  # noqa: E402
+import search  # noqa: E402
+from models import db, Category, Comment, Post, User  # noqa: E402
+
+LOCAL = {"REMOTE_ADDR": "127.0.0.1"}  # 관리자 화면 IP 제한 통과
+
+# 고정 데이터 규모 (예산 숫자가 이 값에 맞춰져 있음)
+TEXT_POSTS = 45      # 자유게시판: 12개씩 4페이지
+PHOTO_POSTS = 15     # 사진게시판
+BUSY_COMMENTS = 30   # 첫 글에 달린 댓글 (N+1 이면 바로 드러나도록)
+ACTIVE_USERS = 5
+PENDING_USERS = 3
+
+
+def _seed():
+    db.session.add_all([Category(name="자유게시판", type="text"), Category(name="사진게시판", type="photo")])
+    admin = User(username="admin", email="admin@example.com", is_admin=True, is_active=True)
+    admin.set_password("admin-password")
+    db.session.add(admin)
+    for i in range(ACTIVE_USERS + PENDING_USERS):
+        user = User(username=f"user{i}", email=f"user{i}@example.com", is_active=i < ACTIVE_USERS)
+        user.password_hash = admin.password_hash
+        db.session.add(user)
+
+    start = datetime(2024, 1, 1, 9, 0)
+    posts = []
+    for i in range(TEXT_POSTS + PHOTO_POSTS):
+        photo = i >= TEXT_POSTS
+        content = f"<p>본문 {i} 바다 여행 이야기</p>"
+        if photo:
+            content += f'<p><img src="/static/uploads/test_{i}.jpg"></p>'
+        posts.append(Post(
+            title=f"제목 {i} 여행", author="철수" if i % 2 else "영희", content=content,
+            date=start + timedelta(days=i * 3), read_count=0,
+            category="사진게시판" if photo else "자유게시판",
+        ))
+    db.session.add_all(posts)
+    db.session.flush()
+    for n in range(BUSY_COMMENTS):
+        db.session.add(Comment(author=f"손님{n}", content=f"댓글 {n}\n둘째 줄", post=posts[0],
+                               created_at=start + timedelta(hours=n + 1)))
+    for post in posts[1:6]:
+        db.session.add(Comment(author="민수", content="짧은 댓글", post=post, created_at=post.date))
+    db.session.commit()
+
+
+@pytest.fixture(scope="session")
+def app():
+    flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with flask_app.app_context():
+        db.create_all()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(search.CREATE_TABLE_SQL)  # 운영 DB 는 마이그레이션이 만듦
+        _seed()
+    yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    with app.app_context():
+        admin = User.query.filter_by(username="admin").one()
+    with client.session_transaction() as s:
+        s["user_id"] = admin.id
+        s["username"] = admin.username
+        s["is_admin"] = True
+    return client
+
+
+# 📏 SQL 문 수 / 읽은 행 수 측정
+class QueryRecorder:
+    """테스트 스레드에서 실행된 SQL 문과 문마다 읽은 행 수 (백그라운드 스레드는 제외)"""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.statements = []  # [문장, 읽은 행 수]
+        self.active = False
+
+    @property
+    def rows(self):
+        return sum(rows for _, rows in self.statements)
+
+    def report(self):
+        lines = [f"SQL {len(self.statements)}개, 읽은 행 {self.rows}개:"]
+        for i, (statement, rows) in enumerate(self.statements, start=1):
+            lines.append(f"  {i:>3}. [{rows}행] {' '.join(statement.split())}")
+        return "\n".join(lines)
+
+
+_recorder = None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    if _recorder is not None and _recorder.active and threading.get_ident() == _recorder.thread:
+        _recorder.statements.append([statement, 0])
+
+
+def _count_row(cursor, row):
+    # sqlite3 row_factory: 가져온 행마다 한 번씩 불림 (행은 그대로 돌려줌)
+    if _recorder is not None and _recorder.active and threading.get_ident() == _recorder.thread and _recorder.statements:
+        _recorder.statements[-1][1] += 1
+    return row
+
+
+@event.listens_for(Engine, "checkout")
+def _install_row_counter(dbapi_connection, connection_record, connection_proxy):
+    dbapi_connection.row_factory = _count_row
+
+
+@pytest.fixture
+def query_budget():
+    """with query_budget(statements=N, rows=M): 블록 안의 SQL 문 / 읽은 행 수가 예산을 넘으면 실패"""
+    global _recorder
+
+    @contextmanager
+    def budget(statements, rows):
+        global _recorder
+        recorder = _recorder = QueryRecorder()
+        recorder.active = True
+        try:
+            yield recorder
+        finally:
+            recorder.active = False
+        problems = []
+        if len(recorder.statements) > statements:
+            problems.append(f"SQL 문 {len(recorder.statements)}개 > 예산 {statements}개")
+        if recorder.rows > rows:
+            problems.append(f"읽은 행 {recorder.rows}개 > 예산 {rows}개")
+        if problems:
+            pytest.fail(" / ".join(problems) + "\n" + recorder.report(), pytrace=False)
+
+    yield budget
+    _recorder = None
@@ -0,0 +1,23 @@
+# 주기 작업 스레드: 프로세스당 하나, wake() 로 바로 실행, interval 0 이면 안 띄움
+
+import threading
+
+from background import PeriodicFlusher
+
+
+def test_starts_once_and_wakes(app):
+    ran = threading.Event()
+    flusher = PeriodicFlusher(ran.set, "test-flusher", "실패", flush_at_exit=False)
+    flusher.init_app(app, 60)
+    flusher.ensure_started()
+    flusher.ensure_started()
+    assert [t.name for t in threading.enumerate()].count("test-flusher") == 1
+    flusher.wake()
+    assert ran.wait(2)
+
+
+def test_disabled_interval_does_not_start(app):
+    flusher = PeriodicFlusher(lambda: None, "disabled-flusher", "실패", flush_at_exit=False)
+    flusher.init_app(app, 0)
+    flusher.ensure_started()
+    assert "disabled-flusher" not in [t.name for t in threading.enumerate()]
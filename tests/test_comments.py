@@ -0,0 +1,63 @@
+# 상세 화면 댓글: 첫 페이지 / "더 보기" JSON / fetch 로 등록하면 새 댓글 조각만
+
+import re
+
+from comments import PER_PAGE
+from conftest import BUSY_COMMENTS
+
+FETCH = {"X-Requested-With": "XMLHttpRequest"}
+
+
+def test_detail_shows_first_page_only(client):
+    html = client.get("/post/1").get_data(as_text=True)
+    assert html.count('class="comment"') == PER_PAGE
+    assert "/post/1/comments?order=oldest&amp;cursor=" in html
+
+
+def test_load_more_continues_after_cursor(client):
+    first = client.get(f"/post/1/comments?cursor={PER_PAGE}").get_json()
+    assert first["html"].count('class="comment"') == BUSY_COMMENTS - PER_PAGE
+    assert first["next"] is None
+    assert f"손님{PER_PAGE}<" in first["html"]
+
+
+def test_newest_order(client):
+    html = client.get("/post/1?order=newest").get_data(as_text=True)
+    assert html.index(f"손님{BUSY_COMMENTS - 1}<") < html.index(f"손님{BUSY_COMMENTS - 2}<")
+    assert "order=newest&amp;cursor=" in html
+
+
+def test_comment_post_returns_fragment(client):
+    response = client.post("/post/4", data={"author": "새손님", "content": "<script>x</script>\n둘째 줄"},
+                           headers=FETCH)
+    assert response.status_code == 201
+    html = response.get_data(as_text=True)
+    assert html.count('class="comment"') == 1
+    assert response.headers["X-Comment-Count"] == "2"
+    assert "&lt;script&gt;x&lt;/script&gt;" in html and "<script>x" not in html
+    assert "새손님" in client.get("/post/4").get_data(as_text=True)
+
+    # 다른 테스트의 SQL 예산이 고정 데이터 기준이므로 되돌려 놓음
+    comment_id = re.search(r'id="comment-(\d+)"', html).group(1)
+    assert client.post(f"/post/comment/delete/{comment_id}").status_code == 302
+
+
+def test_comment_post_requires_content(client):
+    response = client.post("/post/4", data={"author": "새손님", "content": " "}, headers=FETCH)
+    assert response.status_code == 400
+
+
+def test_comment_post_missing_post(client):
+    assert client.post("/post/9999", data={"author": "a", "content": "b"}).status_code == 404
+
+
+def test_detail_etag_expires_before_csrf_token(client, app, monkeypatch):
+    import http_cache
+
+    client.get("/post/2")  # 세션에 CSRF 토큰 생성
+    etag = client.get("/post/2").headers["ETag"]
+    assert client.get("/post/2", headers={"If-None-Match": etag}).status_code == 304
+
+    now = http_cache.time.time()
+    monkeypatch.setattr(http_cache.time, "time", lambda: now + app.config.get("WTF_CSRF_TIME_LIMIT", 3600))
+    assert client.get("/post/2", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,63 @@
+# 엔드포인트별 SQL 예산 (N+1 / 전체 읽기 회귀 방지)
+#
+# 각 화면을 한 번 미리 불러 프로세스 캐시(게시판 목록, 목록 앵커 등)를 채운 뒤,
+# 두 번째 요청에서 실행된 SQL 문 수와 읽은 행 수가 예산을 넘지 않는지 확인한다.
+# 넘으면 실행된 SQL 목록이 출력된다. 의도한 변경으로 늘어났다면 예산 숫자를 같이 고칠 것.
+
+import pytest
+
+from conftest import LOCAL
+
+# (이름, URL, SQL 문 예산, 읽은 행 예산)
+GET_BUDGETS = [
+    ("home", "/", 1, 1),
+    ("index", "/post/자유게시판", 3, 16),
+    ("index_deep", "/post/자유게시판/page/4", 3, 12),
+    ("index_cursor", "/post/자유게시판/page/2?cursor=30", 3, 16),
+    ("gallery", "/post/사진게시판", 3, 16),
+    ("search", "/post/자유게시판?q=여행", 5, 28),
+    ("archive", "/post/자유게시판/archive", 3, 8),
+    ("archive_month", "/post/자유게시판/archive/2024/2", 4, 13),
+    ("detail_busy", "/post/1", 4, 24),
+    ("detail_quiet", "/post/20", 3, 3),
+    ("comments_more", "/post/1/comments?cursor=20", 2, 11),
+    ("write_form", "/post/write?category=자유게시판", 1, 1),
+    ("edit_form", "/post/edit/2", 2, 2),
+    ("post_admin", "/post/admin", 3, 87),
+    ("admin_dashboard", "/admin/", 5, 3),
+    ("admin_posts", "/admin/section/posts", 1, 51),
+    ("admin_comments", "/admin/section/comments", 1, 35),
+    ("admin_users", "/admin/section/users", 1, 9),
+    ("admin_pending", "/admin/section/pending", 1, 3),
+]
+
+
+@pytest.mark.parametrize("url,statements,rows", [b[1:] for b in GET_BUDGETS], ids=[b[0] for b in GET_BUDGETS])
+def test_get_budget(client, query_budget, url, statements, rows):
+    assert client.get(url, environ_base=LOCAL).status_code == 200  # 캐시 채우기
+    with query_budget(statements=statements, rows=rows):
+        response = client.get(url, environ_base=LOCAL)
+    assert response.status_code == 200
+
+
+def test_detail_not_modified_budget(client, query_budget):
+    client.get("/post/1")  # 세션에 CSRF 토큰이 생긴 뒤의 ETag 사용
+    etag = client.get("/post/1").headers["ETag"]
+    with query_budget(statements=2, rows=2):
+        response = client.get("/post/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_comment_post_budget(client, query_budget):
+    client.get("/post/3")
+    with query_budget(statements=9, rows=5):
+        response = client.post("/post/3", data={"author": "테스트", "content": "새 댓글"})
+    assert response.status_code == 302
+
+
+def test_write_post_budget(client, query_budget):
+    client.get("/post/write?category=자유게시판")
+    with query_budget(statements=11, rows=4):
+        response = client.post("/post/write?category=자유게시판",
+                               data={"title": "새 글", "author": "테스트", "content": "<p>본문</p>"})
+    assert response.status_code == 302
@@ -0,0 +1,31 @@
+# 본문 일괄 치환 규칙: 따옴표 짝 유지 / 바뀌지 않는 매치는 적중으로 안 셈
+
+from types import SimpleNamespace
+
+from rewrite_content import RULESETS
+
+FREEBOARD = SimpleNamespace(category="자유게시판")
+
+
+def _apply(ruleset, content, post=FREEBOARD):
+    (rule,) = RULESETS[ruleset]
+    return rule.apply(content, post)
+
+
+def test_upload_folder_keeps_quotes():
+    assert _apply("free_images", '<img src="http://old.example/data/a.jpg" alt="x">') == \
+        ('<img src="/static/uploads/freeboard/a.jpg" alt="x">', 1)
+    assert _apply("free_images", "<img src='data/b.png'>") == \
+        ("<img src='/static/uploads/freeboard/b.png'>", 1)
+
+
+def test_unchanged_match_is_not_a_hit():
+    content = '<img src="/static/uploads/freeboard/a.jpg"><a src="file.txt">'
+    assert _apply("free_images", content) == (content, 0)
+
+
+def test_unknown_to_restore_keeps_quotes():
+    assert _apply("unknown_to_restore", '<img src="/static/uploads/unknown/a.jpg">') == \
+        ('<img src="/static/restore_images/a.jpg">', 1)
+    assert _apply("unknown_to_restore", "src=&quot;/static/uploads/unknown/a.jpg&quot;") == \
+        ("src=&quot;/static/restore_images/a.jpg&quot;", 1)
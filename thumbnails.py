@@ -0,0 +1,188 @@
+# 갤러리 이미지 썸네일 / 중간 크기 변환본 생성
+#
+# static/restore_images, static/restore_images1, static/uploads 아래 원본 이미지를
+# static/derived/<변환본>/<원본 상대경로>.webp / .jpg 로 줄여서 저장한다. 원본은 그대로 둔다.
+# - 업로드 직후: schedule() 로 백그라운드 스레드에서 생성
+# - 글 저장 직후: schedule_all() 로 본문 이미지 변환본을 만든 뒤 그 글만 다시 렌더링 (post_html.render_when_ready)
+# - 기존 파일 일괄 생성: `python thumbnails.py [--workers N] [--force]`
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import quote
+
+from html_utils import IMAGE_EXTENSIONS, STATIC_IMAGE_DIRS, static_image_rel
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 가 없으면 원본만 사용
+    Image = None
+
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+SOURCE_DIRS = STATIC_IMAGE_DIRS
+DERIVED_DIR = "derived"
+
+# 변환본 이름 → 최대 (가로, 세로)
+VARIANTS = {
+    "thumb": (480, 480),     # 갤러리 카드 (240px × 2배 밀도)
+    "medium": (1280, 1280),  # 상세 본문 / 확대 창
+}
+FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+_executor = None
+_pending = set()  # 백그라운드에서 생성 중인 원본 (같은 파일 중복 업로드 시 한 번만)
+_pending_lock = threading.Lock()
+
+
+def variant_rel(rel, variant, fmt):
+    return f"{DERIVED_DIR}/{variant}/{rel}.{fmt}"
+
+
+def variant_url(src, variant="thumb", fmt="jpg"):
+    """원본 src 에 대한 변환본 URL. 아직 만들어지지 않았으면 None"""
+    rel = static_image_rel(src)
+    if rel is None:
+        return None
+    out = variant_rel(rel, variant, fmt)
+    # 매번 stat 으로 확인 (이미지 GC 는 별도 프로세스에서 지우므로 워커 메모리에 기억해 두면 404 가 남)
+    if not os.path.isfile(os.path.join(STATIC_ROOT, out)):
+        return None
+    return "/static/" + quote(out)
+
+
+def generate_variants(rel, force=False):
+    """원본 하나(static 기준 상대경로)에 대한 모든 변환본 생성. 만든 개수 반환"""
+    if Image is None:
+        return 0
+    src_path = os.path.join(STATIC_ROOT, rel)
+    try:
+        src_mtime = os.path.getmtime(src_path)
+    except OSError:
+        return 0
+
+    targets = []
+    for variant in VARIANTS:
+        for fmt in FORMATS:
+            out_path = os.path.join(STATIC_ROOT, variant_rel(rel, variant, fmt))
+            if force or not os.path.exists(out_path) or os.path.getmtime(out_path) < src_mtime:
+                targets.append((variant, fmt, out_path))
+    if not targets:
+        return 0
+
+    try:
+        with Image.open(src_path) as im:
+            im = ImageOps.exif_transpose(im)
+            if im.mode not in ("RGB", "L"):
+                im = im.convert("RGB")
+            made = 0
+            for variant, fmt, out_path in targets:
+                copy = im.copy()
+                copy.thumbnail(VARIANTS[variant], Image.LANCZOS)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                copy.save(tmp_path, **FORMATS[fmt])
+                os.replace(tmp_path, out_path)
+                made += 1
+            return made
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        print(f"⚠️ 변환 실패: {rel} ({e})")
+        return 0
+
+
+def remove_variants(rel):
+    """원본을 지울 때 변환본도 같이 삭제"""
+    for variant in VARIANTS:
+        for fmt in FORMATS:
+            out = variant_rel(rel, variant, fmt)
+            try:
+                os.remove(os.path.join(STATIC_ROOT, out))
+            except FileNotFoundError:
+                pass
+
+
+def schedule(rel):
+    """업로드 직후 백그라운드에서 변환본 생성"""
+    global _executor
+    if Image is None or not rel:
+        return
+    with _pending_lock:
+        if rel in _pending:
+            return
+        _pending.add(rel)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumbnails")
+    _executor.submit(_generate_scheduled, rel)
+
+
+def schedule_all(rels, then=None):
+    """여러 원본의 변환본을 백그라운드에서 차례로 만들고 끝나면 then() 호출"""
+    global _executor
+    if Image is None or not rels:
+        return
+    with _pending_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumbnails")
+    _executor.submit(_generate_all_then, list(rels), then)
+
+
+def _generate_all_then(rels, then):
+    for rel in rels:
+        generate_variants(rel)
+    if then is not None:
+        try:
+            then()
+        except Exception as e:
+            print(f"⚠️ 변환본 생성 후 작업 실패: {e}")
+
+
+def _generate_scheduled(rel):
+    try:
+        generate_variants(rel)
+    finally:
+        with _pending_lock:
+            _pending.discard(rel)
+
+
+def iter_sources():
+    for folder in SOURCE_DIRS:
+        base = os.path.join(STATIC_ROOT, folder)
+        for dirpath, dirnames, filenames in os.walk(base):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS:
+                    path = os.path.join(dirpath, filename)
+                    yield os.path.relpath(path, STATIC_ROOT).replace(os.sep, "/")
+
+
+def _generate_forced(rel):
+    return generate_variants(rel, force=True)
+
+
+def generate_all(workers=None, force=False):
+    """기존 원본 전체에 대해 변환본 일괄 생성 (프로세스 풀)"""
+    if Image is None:
+        print("⚠️ Pillow 가 설치되어 있지 않아 변환본을 만들 수 없습니다.")
+        return 0
+    sources = list(iter_sources())
+    started = time.monotonic()
+    made = 0
+    job = _generate_forced if force else generate_variants
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, count in enumerate(pool.map(job, sources, chunksize=8), start=1):
+            made += count
+            if done % 50 == 0 or done == len(sources):
+                print(f"🖼 {done}/{len(sources)} 처리 ({time.monotonic() - started:.1f}초)")
+    return made
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="갤러리 이미지 썸네일 / 중간 크기 변환본 일괄 생성")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="이미 있는 변환본도 다시 생성")
+    args = parser.parse_args()
+    made = generate_all(workers=args.workers, force=args.force)
+    print(f"✅ 변환본 생성 완료! 새로 만든 파일 수: {made}")
@@ -0,0 +1,117 @@
+# 업로드 이미지 저장소 (내용 해시 기준)
+#
+# 업로드된 파일을 64KB 씩 임시 파일로 옮기면서 SHA-256 을 계산하고,
+# static/uploads/<해시 앞 2글자>/<해시><확장자> 로 이동한다.
+# - 같은 이름의 다른 파일이 서로 덮어쓰지 않음
+# - 같은 파일을 여러 번 올려도 디스크에는 한 번만 저장 (attachment 테이블로 확인)
+# - 파일 하나당 메모리는 청크 하나만 사용, 크기는 MAX_CONTENT_LENGTH 로 제한
+
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+import image_refs
+import metrics
+from models import db, Attachment
+
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+UPLOAD_DIR = "uploads"
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+# 파일 앞부분(매직 넘버) → 저장 확장자. 이름의 확장자는 믿지 않음
+_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+)
+_CONTENT_TYPES = {".jpg": "image/jpeg", ".png": "image/png", ".gif": "image/gif",
+                  ".bmp": "image/bmp", ".webp": "image/webp"}
+
+
+class UploadError(Exception):
+    """사용자에게 그대로 보여줄 수 있는 업로드 오류"""
+
+
+def _sniff_ext(head):
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    for signature, ext in _SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def _max_bytes():
+    return current_app.config.get("MAX_CONTENT_LENGTH") or DEFAULT_MAX_BYTES
+
+
+def _spool(stream, tmp_dir, max_bytes):
+    """스트림 → 임시 파일. (임시 경로, sha256, 크기, 앞부분) 반환"""
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    fd, tmp_path = tempfile.mkstemp(prefix="upload-", suffix=".part", dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError(f"파일이 너무 큽니다. (최대 {max_bytes / (1024 * 1024):g}MB)")
+                if len(head) < 16:
+                    head += chunk[:16 - len(head)]
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size, head
+
+
+def save_upload(file):
+    """werkzeug FileStorage 를 저장하고 Attachment 반환 (이미 있는 내용이면 기존 행)
+
+    호출한 쪽에서 db.session.commit() 해야 새 행이 확정된다.
+    """
+    tmp_dir = os.path.join(current_app.instance_path, "upload_tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path, sha, size, head = _spool(file.stream, tmp_dir, _max_bytes())
+    try:
+        if size == 0:
+            raise UploadError("빈 파일입니다.")
+        ext = _sniff_ext(head)
+        if ext is None:
+            raise UploadError("이미지 파일(jpg, png, gif, webp, bmp)만 올릴 수 있습니다.")
+
+        path = f"{UPLOAD_DIR}/{sha[:2]}/{sha}{ext}"
+        dst_path = os.path.join(STATIC_ROOT, *path.split("/"))
+        duplicate = os.path.exists(dst_path)
+        if duplicate:
+            os.remove(tmp_path)  # ♻️ 같은 내용이 이미 저장돼 있음
+        else:
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            os.replace(tmp_path, dst_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    metrics.record_upload(size, duplicate)
+
+    # 동시에 같은 파일이 올라와도 한 행만 생기도록 INSERT OR IGNORE
+    db.session.execute(
+        insert(Attachment)
+        .values(sha256=sha, path=path, size=size, content_type=_CONTENT_TYPES[ext],
+                original_name=(file.filename or "")[:255], created_at=datetime.now())
+        .on_conflict_do_nothing(index_elements=["sha256"])
+    )
+    # 글에 쓰이지 않은 채로 남으면 유예 기간 뒤 GC 대상
+    image_refs.queue_paths(db.session.connection(), [path])
+    return db.session.execute(select(Attachment).where(Attachment.sha256 == sha)).scalar_one()
@@ -0,0 +1,113 @@
+# 조회수 버퍼링
+#
+# 상세 페이지를 볼 때마다 UPDATE 를 하면 SQLite 에 쓰기 트랜잭션이 계속 생긴다.
+# - 워커 프로세스 메모리에 글별 조회수 증가분을 모아 두고
+# - 일정 시간(VIEW_COUNT_FLUSH_INTERVAL)마다 또는 쌓인 조회가 VIEW_COUNT_FLUSH_THRESHOLD 를 넘으면
+#   UPDATE post SET read_count = read_count + CASE id WHEN .. END 한 번으로 반영
+# - 정상 종료 시(atexit) 남은 증가분도 반영
+# - VIEW_COUNT_DEDUP_SECONDS 를 주면 같은 세션에서 그 시간 안에 다시 본 글은 세지 않음
+
+import threading
+import time
+
+from flask import session
+from sqlalchemy import case, func, update
+
+from background import PeriodicFlusher
+from models import db, Post
+
+CHUNK_SIZE = 500
+DEDUP_SESSION_KEY = "viewed_posts"
+DEDUP_MAX_ENTRIES = 50  # 세션 쿠키가 커지지 않도록 최근 본 글만 기억
+
+
+class ViewCounter:
+    def __init__(self, interval=10.0, threshold=200):
+        self.interval = interval
+        self.threshold = threshold
+        self.app = None
+        self._pending = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.flush, "view-counter", "조회수 반영 실패 (다음 주기에 다시 시도)")
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = app.config.setdefault("VIEW_COUNT_FLUSH_INTERVAL", self.interval)
+        self.threshold = app.config.setdefault("VIEW_COUNT_FLUSH_THRESHOLD", self.threshold)
+        app.config.setdefault("VIEW_COUNT_DEDUP_SECONDS", 0)
+        self._flusher.init_app(app, self.interval)
+
+    def record(self, post_id):
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + 1
+            self._pending_total += 1
+            full = self._pending_total >= self.threshold
+        self._flusher.ensure_started()
+        if full:
+            self._flusher.wake()
+
+    def pending(self, post_id):
+        """아직 DB 에 반영되지 않은 조회수"""
+        return self._pending.get(post_id, 0)
+
+    def flush(self):
+        """모인 증가분을 DB 에 반영. 반영한 글 수 반환 (실패하면 증가분을 되돌려 놓음)"""
+        with self._flush_lock:
+            with self._lock:
+                counts, self._pending, self._pending_total = self._pending, {}, 0
+            if not counts:
+                return 0
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as conn:
+                        items = sorted(counts.items())
+                        for i in range(0, len(items), CHUNK_SIZE):
+                            chunk = dict(items[i:i + CHUNK_SIZE])
+                            conn.execute(
+                                update(Post)
+                                .where(Post.id.in_(list(chunk)))
+                                .values(read_count=func.coalesce(Post.read_count, 0) + case(chunk, value=Post.id, else_=0))
+                            )
+            except Exception:
+                with self._lock:
+                    for post_id, n in counts.items():
+                        self._pending[post_id] = self._pending.get(post_id, 0) + n
+                        self._pending_total += n
+                raise
+            return len(counts)
+
+
+counter = ViewCounter()
+
+
+def init_app(app):
+    counter.init_app(app)
+
+
+def _seen_recently(post_id):
+    window = counter.app.config.get("VIEW_COUNT_DEDUP_SECONDS") or 0
+    if window <= 0:
+        return False
+    now = int(time.time())
+    viewed = {k: v for k, v in session.get(DEDUP_SESSION_KEY, {}).items() if now - v < window}
+    key = str(post_id)
+    if key in viewed:
+        return True
+    viewed[key] = now
+    if len(viewed) > DEDUP_MAX_ENTRIES:
+        viewed = dict(sorted(viewed.items(), key=lambda kv: kv[1])[-DEDUP_MAX_ENTRIES:])
+    session[DEDUP_SESSION_KEY] = viewed
+    return False
+
+
+def record_view(post_id):
+    """상세 페이지 조회 1회 기록 (세션 중복 제외 설정 시 최근 본 글은 무시)"""
+    if not _seen_recently(post_id):
+        counter.record(post_id)
+
+
+def read_count(post):
+    """화면에 보여줄 조회수 (DB 값 + 아직 반영 안 된 증가분)"""
+    return (post.read_count or 0) + counter.pending(post.id)
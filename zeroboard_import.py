@@ -0,0 +1,475 @@
+# 제로보드 XE 백업 XML 통합 임포터
+#
+# parse_and_store.py / parsingstory.py / happy.py / g1.py / g2.py 를 하나로 합친 것.
+# - iterparse + 처리한 <post> 요소 제거로 수 GB 파일도 메모리 사용량 일정
+# - Base64 / HTML 디코딩은 프로세스 풀에서 병렬 처리
+# - 글 / 댓글은 배치 단위 executemany INSERT, 배치마다 커밋
+# - 다시 돌려도 안전: 원본 문서 ID + 내용 해시로 바뀐 글만 갱신, 그대로인 글은 건너뜀
+# - 파일별 체크포인트 → 중간에 끊겨도 이어서 진행 (--restart 로 처음부터)
+#
+# 사용 예:
+#   python zeroboard_import.py module_freeboard.000001.xml --category 자유게시판
+#   python zeroboard_import.py g1 --pattern "module_g1.*.xml" --category 사진게시판 \
+#       --image-prefix /static/restore_images/ --unescape 2
+#   python zeroboard_import.py --preset g1
+#   python zeroboard_import.py --preset g1 --manifest static/restore_images1/manifest.json
+
+import argparse
+import base64
+import fnmatch
+import hashlib
+import itertools
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from html import unescape
+
+from sqlalchemy import delete, insert, select, update
+
+import archive
+import http_cache
+import image_refs
+import metrics
+import search
+from collect_images import ImageManifest
+from dates import parse_datetime
+from html_utils import list_meta
+from post_html import render_content
+from models import db, Post, Comment, ImportCheckpoint, CacheVersion
+
+# 기존 파싱 스크립트별 설정 (파일 / 게시판 / 이미지 경로 규칙)
+PRESETS = {
+    "freeboard": {"paths": ["module_freeboard.000001.xml"], "category": "자유게시판"},
+    "story": {"paths": ["module_story1.000001.xml"], "category": "이야기게시판"},
+    "happy": {
+        "paths": ["module_happy.000001.xml"], "category": "쭈야랑게시판",
+        "image_prefix": "/static/restore_images1/", "unescape": 2,
+    },
+    "g1": {
+        "paths": ["g1"], "pattern": "module_g1.*.xml", "category": "사진게시판",
+        "image_prefix": "/static/restore_images/", "unescape": 2,
+    },
+    "g2": {
+        "paths": ["g2"], "pattern": "module_g2.*.xml", "category": "습작게시판",
+        "image_prefix": "/static/restore_images1/", "unescape": 2,
+    },
+}
+
+POST_FIELDS = ("document_srl", "title", "nick_name", "user_id", "regdate", "readed_count", "content")
+COMMENT_FIELDS = ("nick_name", "user_id", "regdate", "content")
+HASH_FIELDS = ("title", "nick_name", "user_id", "regdate", "content")  # 조회수는 비교에서 제외
+
+_IMG_SRC = re.compile(r'(<img\b[^>]*?\bsrc=)(["\']?)([^"\'\s>]+)\2', re.IGNORECASE)
+
+
+# 🔤 디코딩 (프로세스 풀 워커에서 실행)
+def b64(text):
+    """Base64 디코딩 함수 (예외 처리 포함)"""
+    try:
+        return base64.b64decode(text or "").decode("utf-8")
+    except Exception:
+        return ""
+
+
+def parse_date(value):
+    """regdate → datetime (알 수 없는 형식이면 None, 원래 값은 경고로 남김)"""
+    parsed = parse_datetime(value)
+    if parsed is None and value.strip():
+        print(f"⚠️ 날짜 형식을 알 수 없음: {value!r}")
+    return parsed
+
+
+# collect_images.py 매니페스트 (워커 프로세스마다 한 번만 읽음)
+_manifest = None
+
+
+def _init_worker(manifest_path):
+    global _manifest
+    _manifest = ImageManifest.load(manifest_path) if manifest_path else None
+
+
+def rewrite_image_src(html, image_prefix, manifest=None):
+    """상대 경로 <img src> 바꾸기 (http, / 로 시작하면 그대로)
+
+    매니페스트에 있는 파일이면 저장된 경로로, 없으면 앞에 image_prefix 를 붙인다.
+    """
+    if not image_prefix and manifest is None:
+        return html
+
+    def replace(match):
+        prefix, quote, src = match.groups()
+        if src.startswith(("http", "/", "data:")):
+            return match.group(0)
+        stored = manifest.resolve(src) if manifest is not None else None
+        if stored:
+            return f'{prefix}"{stored}"'
+        if not image_prefix:
+            return match.group(0)
+        return f'{prefix}"{image_prefix}{src.strip()}"'
+
+    return _IMG_SRC.sub(replace, html)
+
+
+def decode_post(raw, image_prefix=None, unescape_times=1):
+    """XML 에서 꺼낸 Base64 필드 묶음 → Post / Comment 행 데이터"""
+    content = b64(raw["content"])
+    for _ in range(unescape_times):
+        content = unescape(content)
+    content = rewrite_image_src(content, image_prefix, _manifest).strip()
+
+    try:
+        read_count = int(b64(raw["readed_count"]) or 0)
+    except ValueError:
+        read_count = 0
+
+    comments = []
+    for c in raw["comments"]:
+        try:
+            comments.append({
+                "author": (b64(c["nick_name"]) or b64(c["user_id"])).strip(),
+                "content": b64(c["content"]).strip(),
+                "created_at": parse_date(b64(c["regdate"])),
+            })
+        except Exception as e:
+            print("⚠️ 댓글 처리 중 오류:", e)
+
+    post = {
+        "title": b64(raw["title"]).strip(),
+        "author": (b64(raw["nick_name"]) or b64(raw["user_id"])).strip(),
+        "content": content,
+        "date": parse_date(b64(raw["regdate"])),
+        "read_count": read_count,
+        "comment_count": len(comments),
+    }
+    post.update(list_meta(content))
+    post["rendered_content"] = render_content(content)
+    return post, comments
+
+
+# 📂 XML 스트리밍
+def iter_raw_posts(file_path):
+    """<post> 하나씩 원본(Base64) 필드만 뽑아내고, 처리한 요소는 트리에서 제거"""
+    stack = []
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != "post":
+            continue
+
+        raw = {field: elem.findtext(field, "") for field in POST_FIELDS}
+        raw["comments"] = [
+            {field: c.findtext(field, "") for field in COMMENT_FIELDS}
+            for c in elem.iterfind("comments/comment")
+        ]
+        yield raw
+
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def iter_batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def find_xml_files(paths, pattern="*.xml"):
+    for path in paths:
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                if fnmatch.fnmatch(filename, pattern):
+                    yield os.path.join(path, filename)
+        else:
+            yield path
+
+
+# 🔑 재임포트 비교용 키
+def source_key(raw):
+    """원본 문서 ID (document_srl, 없으면 작성일 + 작성자 + 제목 해시)"""
+    srl = b64(raw["document_srl"]).strip()
+    if not srl.isdigit():
+        srl = raw["document_srl"].strip()
+    if srl:
+        return srl
+    basis = "\x1f".join(raw[f] for f in ("regdate", "nick_name", "user_id", "title"))
+    return "h:" + hashlib.sha1(basis.encode("utf-8")).hexdigest()[:20]
+
+
+def content_hash(raw):
+    digest = hashlib.sha1()
+    for field in HASH_FIELDS:
+        digest.update(raw[field].encode("utf-8") + b"\x1f")
+    for c in raw["comments"]:
+        for field in COMMENT_FIELDS:
+            digest.update(c[field].encode("utf-8") + b"\x1e")
+    return digest.hexdigest()
+
+
+def plan_batch(raw_batch, category):
+    """배치를 새 글 / 바뀐 글(post_id, raw) / 그대로인 글 수로 나누기"""
+    by_key = {}
+    for raw in raw_batch:
+        raw["source_id"] = source_key(raw)
+        raw["source_hash"] = content_hash(raw)
+        by_key[raw["source_id"]] = raw  # 같은 배치 안 중복은 마지막 것만
+
+    existing = {
+        row.source_id: row for row in db.session.execute(
+            select(Post.id, Post.source_id, Post.source_hash)
+            .where(Post.category == category, Post.source_id.in_(list(by_key)))
+        )
+    }
+    inserts, updates = [], []
+    skipped = len(raw_batch) - len(by_key)
+    for key, raw in by_key.items():
+        row = existing.get(key)
+        if row is None:
+            inserts.append(raw)
+        elif row.source_hash == raw["source_hash"]:
+            skipped += 1
+        else:
+            updates.append((row.id, raw))
+    return inserts, updates, skipped
+
+
+def _minute(value):
+    # 예전 임포트는 작성일을 분 단위 문자열로 저장했으므로 분 단위로 비교
+    return value.replace(second=0, microsecond=0) if value else None
+
+
+def _adopt_legacy_posts(category, inserts):
+    """source_id 없이 예전에 임포트된 글 중 제목/작성일/작성자가 같은 글은 새로 넣지 않고 갱신"""
+    titles = list({post["title"] for _, post, _ in inserts})
+    if not titles:
+        return inserts, []
+    legacy = {}
+    for row in db.session.execute(
+        select(Post.id, Post.title, Post.date, Post.author)
+        .where(Post.category == category, Post.source_id.is_(None), Post.title.in_(titles))
+    ):
+        legacy.setdefault((row.title, _minute(row.date), row.author), row.id)
+
+    fresh, adopted = [], []
+    for raw, post, comments in inserts:
+        post_id = legacy.pop((post["title"], _minute(post["date"]), post["author"]), None)
+        if post_id is None:
+            fresh.append((raw, post, comments))
+        else:
+            adopted.append((post_id, raw, post, comments))
+    return fresh, adopted
+
+
+# 💾 DB 저장
+def apply_batch(category, inserts, updates, checkpoint, posts_done):
+    """디코딩된 새 글 / 바뀐 글을 저장하고 체크포인트와 함께 커밋. (새 글, 갱신, 댓글) 수 반환"""
+    inserts, adopted = _adopt_legacy_posts(category, inserts)
+    updates = updates + adopted
+
+    now = datetime.now()
+    inserted_ids = []
+    if inserts:
+        post_rows = [
+            dict(post, category=category, source_id=raw["source_id"], source_hash=raw["source_hash"],
+                 updated_at=now)
+            for raw, post, _ in inserts
+        ]
+        inserted_ids = db.session.execute(
+            insert(Post).returning(Post.id, sort_by_parameter_order=True), post_rows
+        ).scalars().all()
+
+    updated_ids = [post_id for post_id, _, _, _ in updates]
+    months = archive.months_for_posts(db.session.connection(), updated_ids)  # 작성일이 바뀌면 이전 달도
+    if updates:
+        # 바뀐 글: 본문 갱신 (로컬 조회수는 유지) + 댓글은 통째로 다시 넣기
+        db.session.execute(update(Post), [
+            dict({k: v for k, v in post.items() if k != "read_count"},
+                 id=post_id, source_id=raw["source_id"], source_hash=raw["source_hash"], updated_at=now)
+            for post_id, raw, post, _ in updates
+        ])
+        db.session.execute(delete(Comment).where(Comment.post_id.in_(updated_ids)))
+
+    comment_rows = [
+        dict(comment, post_id=post_id)
+        for post_id, (_, _, comments) in zip(inserted_ids, inserts)
+        for comment in comments
+    ] + [
+        dict(comment, post_id=post_id)
+        for post_id, _, _, comments in updates
+        for comment in comments
+    ]
+    if comment_rows:
+        db.session.execute(insert(Comment), comment_rows)
+
+    # executemany 는 flush 이벤트를 타지 않으므로 검색 색인 / 이미지 참조 / 월별 요약 / ETag 버전은 직접 갱신
+    search.reindex_posts(db.session.connection(), inserted_ids + updated_ids)
+    image_refs.sync_posts(db.session.connection(), inserted_ids + updated_ids)
+    archive.refresh_months(
+        db.session.connection(), months | archive.months_for_posts(db.session.connection(), inserted_ids + updated_ids)
+    )
+    if inserted_ids or updated_ids:
+        CacheVersion.bump(db.session.connection(), [http_cache.posts_version_name(category)])
+
+    checkpoint.posts_done = posts_done
+    checkpoint.updated_at = datetime.now()
+    db.session.commit()
+    return len(inserted_ids), len(updated_ids), len(comment_rows)
+
+
+def load_checkpoint(file_path, restart=False):
+    """파일 체크포인트. 파일 크기/수정 시각이 바뀌었거나 restart 면 처음부터"""
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    checkpoint = ImportCheckpoint.query.filter_by(file_path=path).first()
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint(file_path=path)
+        db.session.add(checkpoint)
+        restart = True
+    if restart or checkpoint.file_size != stat.st_size or checkpoint.file_mtime != stat.st_mtime:
+        checkpoint.file_size = stat.st_size
+        checkpoint.file_mtime = stat.st_mtime
+        checkpoint.posts_done = 0
+        checkpoint.completed = False
+    return checkpoint
+
+
+class ImportStats:
+    def __init__(self):
+        self.inserted = self.updated = self.skipped = self.comments = 0
+        self.started = time.monotonic()
+
+    def add(self, other):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.skipped += other.skipped
+        self.comments += other.comments
+
+    @property
+    def processed(self):
+        return self.inserted + self.updated + self.skipped
+
+    def report(self, prefix="   "):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        print(f"{prefix}📝 새 글 {self.inserted}개 / ♻️ 갱신 {self.updated}개 / ⏩ 그대로 {self.skipped}개 "
+              f"/ 💬 댓글 {self.comments}개 ({self.processed / elapsed:.1f} posts/sec)")
+
+
+def import_file(file_path, category, pool, image_prefix=None, unescape_times=1, batch_size=200,
+                restart=False):
+    stats = ImportStats()
+    checkpoint = load_checkpoint(file_path, restart)
+    if checkpoint.completed:
+        print(f"⏩ {file_path} 이미 완료됨 (건너뜀)")
+        db.session.commit()
+        return stats
+
+    start_at = checkpoint.posts_done
+    print(f"📂 {file_path} 처리 중…" + (f" ({start_at}번째 글부터 이어서)" if start_at else ""))
+    decode = partial(decode_post, image_prefix=image_prefix, unescape_times=unescape_times)
+    raw_posts = itertools.islice(iter_raw_posts(file_path), start_at, None)
+
+    def flush(job):
+        inserts, updates, skipped, decoded, posts_done = job
+        decoded = list(decoded)
+        inserted = [(raw, *d) for raw, d in zip(inserts, decoded)]
+        changed = [(post_id, raw, *d) for (post_id, raw), d in zip(updates, decoded[len(inserts):])]
+        i, u, c = apply_batch(category, inserted, changed, checkpoint, posts_done)
+        stats.inserted += i
+        stats.updated += u
+        stats.skipped += skipped
+        stats.comments += c
+        stats.report()
+        metrics.import_batch(category, posts_done, i, u, skipped, c)  # 📈 /metrics 진행 상황
+
+    # 워커가 한 배치를 디코딩하는 동안 다음 배치를 XML 에서 읽어오도록 겹쳐서 처리.
+    # 새 글 / 갱신 구분(plan_batch)은 앞 배치를 저장한 뒤에 해야
+    # 배치 경계에 걸친 같은 글이 두 번 INSERT 되지 않음 (디코딩만 겹침)
+    pending = None
+    posts_done = start_at
+    for raw_batch in iter_batches(raw_posts, batch_size):
+        if pending is not None:
+            flush(pending)
+        posts_done += len(raw_batch)
+        inserts, updates, skipped = plan_batch(raw_batch, category)
+        to_decode = inserts + [raw for _, raw in updates]
+        decoded = pool.map(decode, to_decode, chunksize=max(1, batch_size // 16))
+        pending = (inserts, updates, skipped, decoded, posts_done)
+    if pending is not None:
+        flush(pending)
+
+    checkpoint.posts_done = posts_done
+    checkpoint.completed = True
+    checkpoint.updated_at = datetime.now()
+    db.session.commit()
+    return stats
+
+
+def run_import(paths, category, pattern="*.xml", image_prefix=None, unescape_times=1,
+               batch_size=200, workers=None, restart=False, manifest_path=None):
+    total = ImportStats()
+    metrics.import_started(category)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(manifest_path,)) as pool:
+            for files_done, file_path in enumerate(find_xml_files(paths, pattern), start=1):
+                total.add(import_file(file_path, category, pool, image_prefix, unescape_times,
+                                      batch_size, restart))
+                metrics.import_file_done(category, files_done)
+    finally:
+        metrics.import_finished(category)
+    print(f"🎉 {category} 임포트 완료!")
+    total.report(prefix="")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="제로보드 XE 백업 XML → 게시판 DB 임포트")
+    parser.add_argument("paths", nargs="*", help="XML 파일 또는 XML 이 들어 있는 폴더")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="기존 파싱 스크립트 설정 그대로 사용")
+    parser.add_argument("--category", help="저장할 게시판 이름")
+    parser.add_argument("--pattern", help="폴더 안에서 읽을 파일 이름 패턴 (기본: *.xml)")
+    parser.add_argument("--image-prefix", help="상대 경로 이미지 src 앞에 붙일 경로 (예: /static/restore_images/)")
+    parser.add_argument("--manifest", help="collect_images.py 가 만든 manifest.json (이미지 src 를 저장 경로로 바꿈)")
+    parser.add_argument("--unescape", type=int, help="HTML 언이스케이프 횟수 (기본: 1)")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None, help="디코딩 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트 무시하고 파일 처음부터 (중복 글은 여전히 건너뜀)")
+    args = parser.parse_args(argv)
+
+    options = dict(PRESETS.get(args.preset, {}))
+    for key, value in (("paths", args.paths), ("category", args.category), ("pattern", args.pattern),
+                       ("image_prefix", args.image_prefix), ("unescape", args.unescape)):
+        if value not in (None, []):
+            options[key] = value
+    if not options.get("paths") or not options.get("category"):
+        parser.error("XML 경로와 --category (또는 --preset) 가 필요합니다.")
+
+    from app import app
+
+    with app.app_context():
+        db.create_all()
+        run_import(
+            options["paths"], options["category"],
+            pattern=options.get("pattern", "*.xml"),
+            image_prefix=options.get("image_prefix"),
+            unescape_times=options.get("unescape", 1),
+            batch_size=args.batch_size,
+            workers=args.workers,
+            restart=args.restart,
+            manifest_path=args.manifest,
+        )
+
+
+if __name__ == "__main__":
+    main()